@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 04:30:00 2026
+
+@author: Wellorzzon Novais
+"""
+
+"""
+Description
+--
+This code has the adaptive sweep: instead of a uniform grid (most of its points in flat regions), it starts with a
+coarse grid and refines only the cells where the cycle changes sharply:
+    - the phase of line 2, 5 or 8 changes between the corners of the cell
+    - the feasibility changes (e.g. no x_7 below x_1)
+    - an output (GRADIENT_OUTPUTS: COP and m_ponto_7, which blows up when x_7 approaches x_1 because of the
+      (x_inlet - x_low_outlet) denominator) changes between the corners more than "tol" times its range over all the
+      feasible points solved so far
+A refined cell is split in 2^d children (d: number of swept inputs), down to "levels" refinements. All the points are
+on the lattice of the equivalent uniform grid ((initial - 1) * 2^levels + 1 points per input), so points shared by
+neighbour cells are solved once; the new points of each level are solved together with the batch solver (or a
+process pool, processes > 1).
+The result has every solved point (BatchResult and records of result_store.py), the refinement history and the
+number of solves saved compared with the equivalent uniform grid.
+
+Running from the src folder:
+    python -m modules.adaptive_sweep --backend numpy --Temp_3 350 400 --Temp_6 253.15 273.15 --x_1 0.35 0.5 --levels 4
+"""
+
+"""
+Log
+
+--------------------------------------
+Version 0.0.1
+--
+Introduced the adaptive refinement of sweeps around phase changes, feasibility changes and steep gradients.
+
+--------------------------------------
+Version 0.0.2
+--
+With processes > 1 all the levels are solved in one sweep.SweepPool.
+
+--------------------------------------
+Version 0.0.3
+--
+The rows of the solved points are kept in a dictionary keyed by lattice point instead of an array of the whole uniform
+grid (8.6 GB for 3 inputs and 8 levels).
+
+--------------------------------------
+"""
+
+import itertools
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from modules.cycle_solver import CycleInputs
+
+
+# Lines (1 - 8) whose phase changes mark a cell for refinement
+PHASE_LINES = (2, 5, 8)
+
+# Outputs whose relative change between the corners of a cell marks it for refinement
+GRADIENT_OUTPUTS = ("COP", "m_ponto_7")
+DEFAULT_TOL = 0.1
+
+DEFAULT_RANGES = {
+    "Temp_3": (350.0, 400.0), # [K]
+    "Temp_6": (253.15, 273.15), # [K]
+    "x_1": (0.35, 0.50), # [-]
+}
+
+
+def gradient_outputs(batch):
+    # (n, GRADIENT_OUTPUTS) of a BatchResult
+    return np.stack([np.asarray(batch.COP, float), batch.m_ponto[:, 6]], axis=1)
+
+
+@dataclass
+class AdaptiveSweepResult:
+    names: tuple # swept inputs
+    ranges: dict # {input: (low, high)}
+    shape: tuple # points per input of the equivalent uniform grid
+    lattice: np.ndarray # (solves, d) lattice index of each solved point
+    batch: object # BatchResult of the solved points (same order as lattice)
+    history: list = field(default_factory=list) # one dictionary per level
+
+    @property
+    def solves(self):
+        return len(self.lattice)
+
+    @property
+    def uniform_solves(self):
+        return int(np.prod(self.shape))
+
+    @property
+    def saved(self):
+        return self.uniform_solves - self.solves
+
+    def values(self):
+        # (solves, d) values of the swept inputs
+        low = np.array([self.ranges[name][0] for name in self.names])
+        high = np.array([self.ranges[name][1] for name in self.names])
+        return low + self.lattice / (np.array(self.shape) - 1) * (high - low)
+
+    def to_records(self):
+        return self.batch.to_records()
+
+    def summary(self):
+        return (str(self.solves) + " solves; uniform grid " + " x ".join(map(str, self.shape)) + " = "
+                + str(self.uniform_solves) + " solves; saved " + str(self.saved) + " ("
+                + "{:.1%}".format(self.saved / self.uniform_solves) + ")")
+
+
+def _refine_flags(corner_rows, feasible, phase, outputs, tol):
+    # Reasons to refine each cell: (phase change, feasibility change, steep gradient), arrays (cells,)
+    cell_feasible = feasible[corner_rows]
+    feasibility = cell_feasible.any(axis=1) & ~cell_feasible.all(axis=1)
+
+    # Phases and outputs only between feasible corners (at least 2)
+    def spread(values):
+        mask = cell_feasible[:, :, None] & np.isfinite(values)
+        return (np.where(mask, values, -np.inf).max(axis=1) - np.where(mask, values, np.inf).min(axis=1),
+                mask.sum(axis=1) > 1)
+
+    with np.errstate(invalid='ignore'):
+        change, enough = spread(phase[corner_rows][:, :, [line - 1 for line in PHASE_LINES]].astype(float))
+        phase_change = np.any(enough & (change > 0), axis=1)
+        change, enough = spread(outputs[corner_rows])
+        valid = feasible[:, None] & np.isfinite(outputs)
+        value_range = np.where(valid, outputs, -np.inf).max(axis=0) - np.where(valid, outputs, np.inf).min(axis=0)
+        steep = np.any(enough & (change > tol * value_range), axis=1)
+    return phase_change, feasibility, steep
+
+
+def run_adaptive_sweep(ranges=None, base=None, initial=5, levels=4, tol=DEFAULT_TOL, backend=None, processes=1,
+                       cache_size=100000, chunksize=4096):
+    # Adaptive sweep of the inputs of "ranges" ({CycleInputs field: (low, high)}); the other inputs from "base"
+    from modules.batch_solver import concatenate_batches, solve_cycle_batch
+
+    ranges = dict(ranges or DEFAULT_RANGES)
+    base = base or CycleInputs()
+    names = tuple(ranges)
+    d = len(names)
+    low = np.array([ranges[name][0] for name in names], float)
+    high = np.array([ranges[name][1] for name in names], float)
+    shape = tuple([(initial - 1) * 2 ** levels + 1] * d)
+    if processes == 1:
+        from modules.property_backend import get_backend
+        from modules.property_cache import CachedBackend
+
+        backend = CachedBackend(get_backend(backend), maxsize=cache_size) if cache_size else get_backend(backend)
+        pool = None
+    else:
+        # One pool for all the levels: the workers keep their backends and property caches
+        from modules.sweep import SweepPool
+
+        pool = SweepPool(backend, processes, cache_size)
+
+    # Row of each solved lattice point ({lattice tuple: row}): only the solved points, not the whole uniform grid
+    row_of = {}
+    lattice, batches = [], []
+    feasible = np.empty(0, bool)
+    phase = np.empty((0, 8), np.int8)
+    outputs = np.empty((0, len(GRADIENT_OUTPUTS)))
+
+    def solve(points):
+        # Solves the lattice points (k, d) not solved yet
+        nonlocal feasible, phase, outputs
+        points = np.array([point for point in map(tuple, np.unique(points, axis=0).tolist()) if point not in row_of],
+                          int).reshape(-1, d)
+        if not len(points):
+            return 0
+        values = low + points / (np.array(shape) - 1) * (high - low)
+        if processes == 1:
+            inputs = {f: np.full(len(points), value) for f, value in vars(base).items()}
+            inputs.update({name: values[:, i] for i, name in enumerate(names)})
+            batch = solve_cycle_batch(inputs, backend=backend)
+        else:
+            from dataclasses import replace
+
+            from modules.sweep import run_batch_sweep
+
+            candidates = [replace(base, **dict(zip(names, map(float, row)))) for row in values]
+            batch = run_batch_sweep(candidates, chunksize=chunksize, pool=pool)
+        row_of.update(zip(map(tuple, points.tolist()), range(len(lattice), len(lattice) + len(points))))
+        lattice.extend(points)
+        batches.append(batch)
+        feasible = np.concatenate([feasible, batch.feasible])
+        phase = np.concatenate([phase, batch.phase])
+        with np.errstate(invalid='ignore', divide='ignore'):
+            outputs = np.concatenate([outputs, gradient_outputs(batch)])
+        return len(points)
+
+    try:
+        # Coarse grid and its cells (lower corner, step)
+        step = 2 ** levels
+        coarse = np.array(list(itertools.product(range(0, shape[0], step), repeat=d)))
+        history = [{"level": 0, "cells": int((initial - 1) ** d), "new_solves": solve(coarse)}]
+        offsets = np.array(list(itertools.product((0, 1), repeat=d))) # corners of a unit cell
+        cells = np.array(list(itertools.product(range(0, shape[0] - 1, step), repeat=d)))
+
+        for level in range(1, levels + 1):
+            corners = (cells[:, None, :] + offsets[None] * step).reshape(-1, d)
+            corner_rows = np.array([row_of[point] for point in map(tuple, corners.tolist())], int).reshape(len(cells), -1)
+            phase_change, feasibility, steep = _refine_flags(corner_rows, feasible, phase, outputs, tol)
+            refine = phase_change | feasibility | steep
+            step //= 2
+            cells = (cells[refine][:, None, :] + offsets[None] * step).reshape(-1, d)
+            new_points = (cells[:, None, :] + offsets[None] * step).reshape(-1, d)
+            history.append({"level": level, "cells": int(len(cells)), "refined": int(refine.sum()),
+                            "phase_change": int(phase_change.sum()), "feasibility_change": int(feasibility.sum()),
+                            "steep": int(steep.sum()), "new_solves": solve(new_points) if len(cells) else 0})
+            if not len(cells):
+                break
+    finally:
+        if pool is not None:
+            pool.close()
+
+    batch = concatenate_batches(batches)
+    return AdaptiveSweepResult(names, ranges, shape, np.array(lattice, int), batch, history)
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Adaptive sweep of the ARS cycle")
+    parser.add_argument("--backend", default=None, help="property backend (refprop, numpy or table:<file>)")
+    for name, (low, high) in DEFAULT_RANGES.items():
+        parser.add_argument("--" + name, type=float, nargs=2, default=(low, high), help="range")
+    parser.add_argument("--initial", type=int, default=5, help="points per input of the coarse grid")
+    parser.add_argument("--levels", type=int, default=4, help="refinement levels")
+    parser.add_argument("--tol", type=float, default=DEFAULT_TOL, help="relative change of the outputs in a cell")
+    parser.add_argument("--processes", type=int, default=1)
+    parser.add_argument("--output", default=None, help="results file (csv, npy, npz or parquet; see result_writer.py)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    result = run_adaptive_sweep({name: tuple(getattr(args, name)) for name in DEFAULT_RANGES}, initial=args.initial,
+                                levels=args.levels, tol=args.tol, backend=args.backend, processes=args.processes)
+    for step in result.history:
+        print("Level " + str(step["level"]) + ": " + str(step["cells"]) + " cells, " + str(step["new_solves"]) + " new solves"
+              + ("" if step["level"] == 0 else " (refined: " + str(step["refined"]) + "; phase change "
+                 + str(step["phase_change"]) + ", feasibility change " + str(step["feasibility_change"]) + ", steep "
+                 + str(step["steep"]) + ")"))
+    print(result.summary() + " in " + "{:.3g}".format(time.perf_counter() - start) + " s")
+    if args.output:
+        from modules.result_writer import ResultWriter
+
+        with ResultWriter(args.output) as writer:
+            writer.write(result.to_records())
+        print("Saved: " + args.output)
@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 12:30:00 2026
+
+@author: Wellorzzon Novais
+"""
+
+"""
+Description
+--
+This code has a simplified ammonia-water property model in pure NumPy, used as an offline stand-in for RefProp.
+All the functions are vectorized (NumPy arrays that broadcast together) and use SI mass base units.
+
+Model:
+    - Saturation pressure of the pure fluids: ln(P_sat) = A - B/T
+    - Liquid phase: Margules activity coefficients, ln(gamma_1) = L(T) * (1-x_m)^2 and ln(gamma_2) = L(T) * x_m^2,
+      with L(T) = a + b/T (x_m = molar fraction)
+    - Vapor phase: ideal gas mixture
+    - Constant specific heats, plus excess enthalpy and entropy of the liquid proportional to x*(1-x)
+
+The constants were fitted to the RefProp v10 points in notes/Most_Simple_model_-_Lines_*.csv, so the enthalpy and
+entropy references are the same ones of RefProp for "Ammonia * Water". It is a fast approximation (a few percent in
+enthalpy inside the cycle envelope), NOT a replacement of RefProp for final results.
+"""
+
+"""
+Log
+
+--------------------------------------
+Version 0.0.1
+--
+Introduced the model and the NumpyAmmoniaWaterBackend for the pairs TQ, PT, PQ, PH and PS.
+
+--------------------------------------
+Version 0.0.2
+--
+PT of pure water (x = 0) above the saturation temperature is superheated vapor (it was returned as liquid).
+
+--------------------------------------
+"""
+
+import numpy as np
+
+from modules.property_backend import FlashResult, PropertyBackend, PropertyError
+from modules.root_finding import solve_bracketed
+
+
+# ==========================================================================
+# Constants
+# ==========================================================================
+
+R = 8.314462618 # [J/(mol.K)]
+M_1 = 17.03052e-3 # [kg/mol] - Ammonia
+M_2 = 18.01528e-3 # [kg/mol] - Water
+
+# Saturation pressure, ln(P_sat [Pa]) = A - B/T
+A_1, B_1 = 23.0851, 2764.30 # Ammonia
+A_2, B_2 = 25.1929, 5100.06 # Water
+
+# Margules parameter L(T) = a + b/T
+MARGULES_A, MARGULES_B = 0.913587, -946.013
+
+# Liquid
+T_REF_1, T_REF_2 = 313.15, 273.16 # [K]
+H_L_1, S_L_1 = 531106.0, 2116.1 # [J/kg], [J/(kg.K)] - Ammonia liquid at T_REF_1 (without P*v)
+CP_L_1, CP_L_2 = 4750.0, 4186.0 # [J/(kg.K)]
+RHO_L_1, RHO_L_2 = 600.0, 1000.0 # [kg/m^3]
+V_EXCESS = 3.9e-4 # [m^3/kg] - v_L = x/rho_1 + (1-x)/rho_2 - x*(1-x)*V_EXCESS
+H_EXCESS = -964000.0 # [J/kg] - h_E = x*(1-x)*H_EXCESS
+S_EXCESS = -2088.0 # [J/(kg.K)] - s_E = x*(1-x)*S_EXCESS
+
+# Vapor (ideal gas)
+T_REF_V_1, P_REF_V_1 = 263.15, 290710.0 # [K], [Pa]
+H_V_1, S_V_1 = 1593900.0, 6228.5 # Ammonia vapor at T_REF_V_1, P_REF_V_1
+CP_V_1 = 2300.0
+T_REF_V_2, P_REF_V_2 = 273.16, 611.657
+H_V_2, S_V_2 = 2500900.0, 9155.5 # Water vapor at the triple point (IAPWS)
+CP_V_2 = 1900.0
+
+# Sentinel qualities for single phase states (same convention of RefProp)
+Q_SUBCOOLED = -998.0
+Q_SUPERHEATED = 998.0
+
+# ==========================================================================
+# Saturation and phase equilibrium
+# ==========================================================================
+
+def molar_fraction(x):
+    n_1 = x / M_1
+    return n_1 / (n_1 + (1 - x) / M_2)
+
+
+def mass_fraction(x_m):
+    m_1 = x_m * M_1
+    return m_1 / (m_1 + (1 - x_m) * M_2)
+
+
+def P_sat_1(T):
+    return np.exp(A_1 - B_1 / T)
+
+
+def P_sat_2(T):
+    return np.exp(A_2 - B_2 / T)
+
+
+def T_sat_1(P):
+    return B_1 / (A_1 - np.log(P))
+
+
+def T_sat_2(P):
+    return B_2 / (A_2 - np.log(P))
+
+
+def _partial_pressures(T, x):
+    # Partial pressures of ammonia and water over a liquid with mass fraction x (modified Raoult's law)
+    x_m = molar_fraction(x)
+    L = MARGULES_A + MARGULES_B / T
+    p_1 = x_m * np.exp(L * (1 - x_m) ** 2) * P_sat_1(T)
+    p_2 = (1 - x_m) * np.exp(L * x_m ** 2) * P_sat_2(T)
+    return p_1, p_2
+
+
+def bubble_P(T, x):
+    p_1, p_2 = _partial_pressures(T, x)
+    return p_1 + p_2
+
+
+def vapor_in_equilibrium(T, x):
+    # Ammonia mass fraction of the vapor in equilibrium with a liquid x at T
+    p_1, p_2 = _partial_pressures(T, x)
+    return mass_fraction(p_1 / (p_1 + p_2))
+
+
+def liquid_at_PT(P, T):
+    # Ammonia mass fraction of the saturated liquid at (P, T); 1 below the ammonia saturation temperature and 0 above
+    # the water saturation temperature.
+    P, T = np.broadcast_arrays(np.asarray(P, float), np.asarray(T, float))
+    return solve_bracketed(lambda x: bubble_P(T, x) - P, np.zeros(P.shape), np.ones(P.shape))
+
+
+def bubble_T(P, x):
+    P, x = np.broadcast_arrays(np.asarray(P, float), np.asarray(x, float))
+    T = solve_bracketed(lambda T: bubble_P(T, x) - P, T_sat_1(P), T_sat_2(P))
+    return np.where(x >= 1, T_sat_1(P), np.where(x <= 0, T_sat_2(P), T))
+
+
+def dew_T(P, y):
+    P, y = np.broadcast_arrays(np.asarray(P, float), np.asarray(y, float))
+    T = solve_bracketed(lambda T: y - vapor_in_equilibrium(T, liquid_at_PT(P, T)), T_sat_1(P), T_sat_2(P))
+    return np.where(y >= 1, T_sat_1(P), np.where(y <= 0, T_sat_2(P), T))
+
+
+# ==========================================================================
+# Enthalpy and entropy of each phase
+# ==========================================================================
+
+def _mixing_entropy(x):
+    # Ideal mixing entropy per kg of mixture
+    x_m = np.clip(molar_fraction(x), 0, 1)
+    M = x_m * M_1 + (1 - x_m) * M_2
+    with np.errstate(divide='ignore', invalid='ignore'):
+        terms = np.where(x_m > 0, x_m * np.log(x_m), 0.0) + np.where(x_m < 1, (1 - x_m) * np.log(1 - x_m), 0.0)
+    return -R / M * terms
+
+
+def v_liquid(x):
+    return x / RHO_L_1 + (1 - x) / RHO_L_2 - x * (1 - x) * V_EXCESS
+
+
+def cp_liquid(x):
+    return x * CP_L_1 + (1 - x) * CP_L_2
+
+
+def cp_vapor(y):
+    return y * CP_V_1 + (1 - y) * CP_V_2
+
+
+def h_liquid(T, P, x):
+    h_1 = H_L_1 + CP_L_1 * (T - T_REF_1)
+    h_2 = CP_L_2 * (T - T_REF_2)
+    return x * h_1 + (1 - x) * h_2 + x * (1 - x) * H_EXCESS + P * v_liquid(x)
+
+
+def s_liquid(T, x):
+    s_1 = S_L_1 + CP_L_1 * np.log(T / T_REF_1)
+    s_2 = CP_L_2 * np.log(T / T_REF_2)
+    return x * s_1 + (1 - x) * s_2 + x * (1 - x) * S_EXCESS + _mixing_entropy(x)
+
+
+def h_vapor(T, y):
+    h_1 = H_V_1 + CP_V_1 * (T - T_REF_V_1)
+    h_2 = H_V_2 + CP_V_2 * (T - T_REF_V_2)
+    return y * h_1 + (1 - y) * h_2
+
+
+def s_vapor(T, P, y):
+    s_1 = S_V_1 + CP_V_1 * np.log(T / T_REF_V_1) - R / M_1 * np.log(P / P_REF_V_1)
+    s_2 = S_V_2 + CP_V_2 * np.log(T / T_REF_V_2) - R / M_2 * np.log(P / P_REF_V_2)
+    return y * s_1 + (1 - y) * s_2 + _mixing_entropy(y)
+
+
+def _two_phase(T, P, x_L, y_V, Q):
+    # Lever rule between saturated liquid x_L and saturated vapor y_V
+    h = (1 - Q) * h_liquid(T, P, x_L) + Q * h_vapor(T, y_V)
+    s = (1 - Q) * s_liquid(T, x_L) + Q * s_vapor(T, P, y_V)
+    return h, s
+
+
+def _saturation(P, x):
+    # Bubble and dew states of the mixture x at pressure P: (T_bubble, h_bubble, s_bubble, T_dew, h_dew, s_dew)
+    T_b = bubble_T(P, x)
+    T_d = dew_T(P, x)
+    return T_b, h_liquid(T_b, P, x), s_liquid(T_b, x), T_d, h_vapor(T_d, x), s_vapor(T_d, P, x)
+
+
+# ==========================================================================
+# Flash functions (arrays in, FlashResult of arrays out)
+# ==========================================================================
+
+def flash_TQ(T, Q, x):
+    T, Q, x = np.broadcast_arrays(np.asarray(T, float), np.asarray(Q, float), np.asarray(x, float))
+    # Liquid x_L in equilibrium: (x - x_L) = Q * (y_V - x_L), with x_L = x at Q = 0 and y_V = x at Q = 1
+    x_L = solve_bracketed(lambda x_L: (x - x_L) - Q * (vapor_in_equilibrium(T, x_L) - x_L), np.zeros(T.shape), x)
+    x_L = np.where((Q <= 0) | (x >= 1), x, x_L)
+    y_V = vapor_in_equilibrium(T, x_L)
+    P = bubble_P(T, x_L)
+    h, s = _two_phase(T, P, x_L, y_V, Q)
+    return FlashResult(T, P, h, s, Q)
+
+
+def flash_PQ(P, Q, x):
+    P, Q, x = np.broadcast_arrays(np.asarray(P, float), np.asarray(Q, float), np.asarray(x, float))
+
+    def f(T):
+        x_L = liquid_at_PT(P, T)
+        return (x - x_L) - Q * (vapor_in_equilibrium(T, x_L) - x_L)
+
+    general = (Q > 0) & (x > 0) & (x < 1)
+    T = bubble_T(P, x)
+    if general.any():
+        T = np.where(general, solve_bracketed(f, T_sat_1(P), T_sat_2(P)), T)
+    x_L = np.where(general, liquid_at_PT(P, T), x)
+    y_V = vapor_in_equilibrium(T, x_L)
+    h, s = _two_phase(T, P, x_L, y_V, Q)
+    return FlashResult(T, P, h, s, Q)
+
+
+def flash_PT(P, T, x):
+    P, T, x = np.broadcast_arrays(np.asarray(P, float), np.asarray(T, float), np.asarray(x, float))
+    x_L = liquid_at_PT(P, T)
+    y_V = vapor_in_equilibrium(T, x_L)
+    # Pure fluids: liquid up to the saturation temperature, vapor above it
+    pure_1, pure_2 = x >= 1, x <= 0
+    liquid = np.where(pure_1, T <= T_sat_1(P), np.where(pure_2, T <= T_sat_2(P), x <= x_L))
+    vapor = ~liquid & ((pure_1 | pure_2) | (x >= y_V))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        Q = np.where(liquid, Q_SUBCOOLED, np.where(vapor, Q_SUPERHEATED, (x - x_L) / (y_V - x_L)))
+    h_2ph, s_2ph = _two_phase(T, P, x_L, y_V, np.clip(Q, 0, 1))
+    h = np.where(liquid, h_liquid(T, P, x), np.where(vapor, h_vapor(T, x), h_2ph))
+    s = np.where(liquid, s_liquid(T, x), np.where(vapor, s_vapor(T, P, x), s_2ph))
+    return FlashResult(T, P, h, s, Q)
+
+
+def _flash_P_property(P, value, x, prop):
+    # PH (prop = 0) and PS (prop = 1): liquid and vapor are explicit (constant cp), the two-phase region is iterative
+    P, value, x = np.broadcast_arrays(np.asarray(P, float), np.asarray(value, float), np.asarray(x, float))
+    T_b, h_b, s_b, T_d, h_d, s_d = _saturation(P, x)
+    bubble, dew = (h_b, h_d) if prop == 0 else (s_b, s_d)
+    liquid = value <= bubble
+    vapor = value >= dew
+    two_phase = ~liquid & ~vapor
+
+    if prop == 0:
+        T_liquid = T_b + (value - h_b) / cp_liquid(x)
+        T_vapor = T_d + (value - h_d) / cp_vapor(x)
+    else:
+        T_liquid = T_b * np.exp((value - s_b) / cp_liquid(x))
+        T_vapor = T_d * np.exp((value - s_d) / cp_vapor(x))
+
+    def f(T):
+        x_L = liquid_at_PT(P, T)
+        y_V = vapor_in_equilibrium(T, x_L)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            Q = np.clip((x - x_L) / (y_V - x_L), 0, 1)
+        return _two_phase(T, P, x_L, y_V, Q)[prop] - value
+
+    T = np.where(liquid, T_liquid, np.where(vapor, T_vapor, T_b))
+    Q = np.where(liquid, Q_SUBCOOLED, Q_SUPERHEATED)
+    # Pure fluid: constant temperature, quality from the lever rule
+    with np.errstate(divide='ignore', invalid='ignore'):
+        Q_lever = (value - bubble) / (dew - bubble)
+    narrow = two_phase & (T_d - T_b < 1e-9)
+    wide = two_phase & ~narrow
+    Q = np.where(narrow, Q_lever, Q)
+    if wide.any():
+        T_2ph = solve_bracketed(f, np.where(wide, T_b, T_b - 1), np.where(wide, T_d, T_b + 1))
+        x_L = liquid_at_PT(P, T_2ph)
+        y_V = vapor_in_equilibrium(T_2ph, x_L)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            Q_2ph = np.clip((x - x_L) / (y_V - x_L), 0, 1)
+        T = np.where(wide, T_2ph, T)
+        Q = np.where(wide, Q_2ph, Q)
+
+    h = np.where(liquid, h_liquid(T, P, x), np.where(vapor, h_vapor(T, x), 0.0))
+    s = np.where(liquid, s_liquid(T, x), np.where(vapor, s_vapor(T, P, x), 0.0))
+    if two_phase.any():
+        Q_2 = np.clip(Q, 0, 1)
+        T_2 = np.where(two_phase, T, T_b)
+        x_L = np.where(narrow, x, liquid_at_PT(P, T_2))
+        y_V = np.where(narrow, x, vapor_in_equilibrium(T_2, x_L))
+        h_2ph, s_2ph = _two_phase(T_2, P, x_L, y_V, Q_2)
+        h = np.where(two_phase, h_2ph, h)
+        s = np.where(two_phase, s_2ph, s)
+    if prop == 0:
+        h = np.where(two_phase, value, h)
+    else:
+        s = np.where(two_phase, value, s)
+    return FlashResult(T, P, h, s, Q)
+
+
+def flash_PH(P, h, x):
+    return _flash_P_property(P, h, x, 0)
+
+
+def flash_PS(P, s, x):
+    return _flash_P_property(P, s, x, 1)
+
+
+FLASH_FUNCTIONS = {"TQ": flash_TQ, "PT": flash_PT, "PQ": flash_PQ, "PH": flash_PH, "PS": flash_PS}
+
+
+# ==========================================================================
+# Backend
+# ==========================================================================
+
+class NumpyAmmoniaWaterBackend(PropertyBackend):
+    name = "numpy"
+    version = "0.0.2"
+
+    def fluid_hash(self):
+        # The "fluid file" of this model is this module (its constants)
+        import hashlib
+
+        with open(__file__, 'rb') as file:
+            return hashlib.sha256(file.read()).hexdigest()
+
+    def flash_many(self, pair, value_1, value_2, x):
+        self.check_pair(pair)
+        x = np.asarray(x, float)
+        with np.errstate(invalid='ignore', over='ignore', divide='ignore'):
+            result = FLASH_FUNCTIONS[pair](value_1, value_2, x)
+        # NaN where the state has no physical meaning in this model
+        invalid = (x < 0) | (x > 1) | (np.asarray(value_1) <= 0)
+        if pair[1] == "Q":
+            invalid = invalid | (np.asarray(value_2) < 0) | (np.asarray(value_2) > 1)
+        if np.any(invalid):
+            result = FlashResult(*(np.where(invalid, np.nan, column) for column in result))
+        return result
+
+    def flash(self, pair, value_1, value_2, x):
+        result = self.flash_many(pair, value_1, value_2, x)
+        if not np.isfinite(result).all():
+            raise PropertyError("State out of range of the NumPy ammonia-water model: " + pair + " = (" + str(value_1) + ", " + str(value_2) + "), x = " + str(x))
+        return FlashResult(*(float(column) for column in result))
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 18:30:00 2026
+
+@author: Wellorzzon Novais
+"""
+
+"""
+Description
+--
+This code has the batch (vectorized) version of the "Most Simple" cycle solver: the inputs are NumPy arrays with one
+value per operating point, and the same steps of solve_cycle (modules/cycle_solver.py) are done for all the points at
+once, with one "flash_many" backend call per line.
+
+The results are columns (BatchResult): arrays of shape (number of points, 8) for the properties of the 8 lines, and
+arrays of shape (number of points,) for the heat exchange rates. Points that can not be solved (property failure,
+no x_7 in the bracket, negative mass flow rate) are flagged in "feasible" instead of failing.
+"""
+
+"""
+Log
+
+--------------------------------------
+Version 0.0.1
+--
+Introduced solve_cycle_batch and the vectorized search of x_7 (bracketed between X_7_MIN and x_1).
+
+--------------------------------------
+Version 0.0.2
+--
+Introduced concatenate_batches (used by the parallel sweeps).
+
+--------------------------------------
+Version 0.0.3
+--
+Introduced BatchResult.to_records (structured array of modules/result_store.py).
+
+--------------------------------------
+Version 0.0.4
+--
+Direct x_7 from the saturation envelope of the backend, when it has one (solve_x_7_batch).
+
+--------------------------------------
+Version 0.0.5
+--
+Bracket of x_7 clamped to the x_range of the backend.
+
+--------------------------------------
+"""
+
+from dataclasses import dataclass, field, fields
+
+import numpy as np
+
+import modules.mass_and_energy_balance as meb
+from modules.cycle_solver import CycleInputs
+from modules.property_backend import get_backend
+from modules.root_finding import solve_bracketed
+from modules.state_point import FlashCounter, phase_code_array
+
+
+# Lower bound of the search of x_7 (pure water)
+X_7_MIN = 0.0
+
+# Tolerance of x_7 and maximum number of iterations
+X_7_TOL = 1e-10
+X_7_MAXITER = 100
+
+INPUT_NAMES = tuple(f.name for f in fields(CycleInputs))
+
+
+@dataclass
+class BatchResult:
+    inputs: dict # {name of CycleInputs field: array (n,)}
+    P: np.ndarray # (n, 8) [Pa]
+    T: np.ndarray # (n, 8) [K]
+    x: np.ndarray # (n, 8) [-]
+    Q: np.ndarray # (n, 8) [-]
+    h: np.ndarray # (n, 8) [J/kg]
+    s: np.ndarray # (n, 8) [J/(kg.K)]
+    m_ponto: np.ndarray # (n, 8) [kg/s]
+    phase: np.ndarray # (n, 8) phase codes of state_point.py (-1 if not solved)
+    Q_gen: np.ndarray # (n,) [W]
+    Q_con: np.ndarray # (n,) [W]
+    Q_abs: np.ndarray # (n,) [W]
+    feasible: np.ndarray # (n,) bool
+    flash_counts: FlashCounter = field(default_factory=FlashCounter)
+
+    def __len__(self):
+        return len(self.feasible)
+
+    @property
+    def x_7(self):
+        return self.x[:, 6]
+
+    @property
+    def COP(self):
+        return self.inputs["Q_eva"] / self.Q_gen
+
+    def to_records(self):
+        # One contiguous structured array (result_store.CYCLE_DTYPE)
+        from modules.result_store import records_from_batch
+
+        return records_from_batch(self)
+
+
+def _broadcast_inputs(inputs):
+    # Arrays (n,) of all the fields of CycleInputs; missing fields take the CycleInputs default
+    defaults = CycleInputs()
+    values = [np.asarray(inputs.get(name, getattr(defaults, name)), float) for name in INPUT_NAMES]
+    values = np.broadcast_arrays(*[np.atleast_1d(value) for value in values])
+    return {name: value.ravel().copy() for name, value in zip(INPUT_NAMES, values)}
+
+
+def inputs_from_list(inputs_list):
+    # Columns of a list of CycleInputs (for solve_cycle_batch)
+    return {name: np.array([getattr(inputs, name) for inputs in inputs_list], float) for name in INPUT_NAMES}
+
+
+def solve_x_7_batch(backend, P_7, Temp_3, Qu_7, x_1, counter=None, lo=None, hi=None, envelope=True):
+    # x_7 such as the bubble temperature (PQ, Qu_7) at P_7 is Temp_3, for all the points.
+    # The bracket is [X_7_MIN, x_1] (the weak solution has less ammonia than the strong one) unless given, clamped to
+    # the x_range of the backend. Returns (x_7, converged)
+    x_min, x_max = getattr(backend, "x_range", (0.0, 1.0))
+    lo = np.maximum(np.full(P_7.shape, X_7_MIN) if lo is None else lo, x_min)
+    hi = np.minimum(x_1 if hi is None else hi, x_max)
+
+    # Inverted bubble curve of the backend (saturation_envelope.py); the bracketed solve only for the other points
+    invert = getattr(backend, "saturation_composition", None) if envelope else None
+    if invert is not None:
+        x_7 = np.asarray(invert(P_7, Qu_7, Temp_3), float)
+        with np.errstate(invalid='ignore'):
+            direct = (x_7 > lo) & (x_7 < hi)
+        if not direct.all():
+            rest = ~direct
+            x_7[rest], _ = solve_x_7_batch(backend, P_7[rest], Temp_3[rest], Qu_7[rest], x_1[rest], counter, lo[rest],
+                                           hi[rest], envelope=False)
+        converged = np.isfinite(x_7) & (x_7 > lo) & (x_7 < hi)
+        return x_7, converged
+
+    def f(x, mask):
+        residual = np.zeros(x.shape)
+        if counter is not None:
+            counter.add("PQ", int(mask.sum()))
+        residual[mask] = backend.flash_many("PQ", P_7[mask], Qu_7[mask], x[mask]).T - Temp_3[mask]
+        return residual
+
+    with np.errstate(invalid='ignore'):
+        x_7 = solve_bracketed(f, lo, hi, xtol=X_7_TOL, maxiter=X_7_MAXITER, masked=True)
+    converged = np.isfinite(x_7) & (x_7 > lo) & (x_7 < hi)
+    return x_7, converged
+
+
+def solve_cycle_batch(inputs=None, backend=None, **columns):
+    # Solves the cycle for arrays of operating points.
+    # "inputs" is a dictionary of arrays (or a list of CycleInputs); the fields can also be given as keywords:
+    #   solve_cycle_batch(Temp_3=np.linspace(360, 390, 100), x_1=0.43, backend="numpy")
+    if isinstance(inputs, (list, tuple)):
+        inputs = inputs_from_list(inputs)
+    inputs = _broadcast_inputs(dict(inputs or {}, **columns))
+    backend = get_backend(backend)
+    counter = FlashCounter()
+
+    def flash(pair, value_1, value_2, x):
+        counter.add(pair, value_1.size)
+        return backend.flash_many(pair, value_1, value_2, x)
+
+    Temp_3, Q_eva, x_1 = inputs["Temp_3"], inputs["Q_eva"], inputs["x_1"]
+    n = len(Temp_3)
+    ones = np.ones(n)
+
+    with np.errstate(invalid='ignore', divide='ignore', over='ignore'):
+        # 2. Lines 4 and 6
+        line_4 = flash("TQ", inputs["Temp_4"], inputs["Qu_4"], ones)
+        line_6 = flash("TQ", inputs["Temp_6"], inputs["Qu_6"], ones)
+
+        # 3. Pressure equality
+        P_high, P_low = line_4.P, line_6.P
+
+        # 4. Lines 3 and 1, and 4.1 line 5 (h_5 = h_4)
+        line_3 = flash("PT", P_high, Temp_3, ones)
+        line_1 = flash("PQ", P_low, inputs["Qu_1"], x_1)
+        line_5 = flash("PH", P_low, line_4.h, ones)
+
+        # 5. Line 7 (Temp_7 = Temp_3)
+        x_7, x_7_converged = solve_x_7_batch(backend, P_high, Temp_3, inputs["Qu_7"], x_1, counter)
+        line_7 = flash("PQ", P_high, inputs["Qu_7"], x_7)
+
+        # 6. Line 2 (s_2 = s_1) and 7. line 8 (x_8 = x_7, h_8 = h_7)
+        line_2 = flash("PS", P_high, line_1.s, x_1)
+        line_8 = flash("PH", P_low, line_7.h, x_7)
+
+        # 8. - 13. Mass balances
+        m_ponto_6 = meb.m_ponto_calc_eva(Q_eva, line_5.h, line_6.h)
+        m_ponto_3 = m_ponto_6
+        m_ponto_7 = meb.m_ponto_low_outlet_calc_gen(m_ponto_3, x_1, ones, x_7)
+        m_ponto_2 = meb.m_ponto_inlet_calc_gen(m_ponto_3, m_ponto_7)
+
+        # 14. Heat exchange rates
+        Q_gen = meb.Q_gen_calc(m_ponto_3, line_3.h, m_ponto_7, line_7.h, m_ponto_2, line_2.h)
+        Q_con = meb.Q_con_calc(m_ponto_3, line_3.h, line_4.h)
+        Q_abs = meb.Q_abs_calc(m_ponto_2, line_1.h, m_ponto_6, line_6.h, m_ponto_7, line_8.h)
+
+    lines = (line_1, line_2, line_3, line_4, line_5, line_6, line_7, line_8)
+    x = np.stack([x_1, x_1, ones, ones, ones, ones, x_7, x_7], axis=1)
+    m_ponto = np.stack([m_ponto_2, m_ponto_2, m_ponto_3, m_ponto_3, m_ponto_3, m_ponto_6, m_ponto_7, m_ponto_7], axis=1)
+    T = np.stack([line.T for line in lines], axis=1)
+    Q = np.stack([line.Q for line in lines], axis=1)
+    phase = phase_code_array(Q)
+    # Qualities given as inputs (saturated lines) are kept as given, as in solve_cycle
+    for column, name in ((0, "Qu_1"), (3, "Qu_4"), (5, "Qu_6"), (6, "Qu_7")):
+        Q[:, column] = np.where(np.isfinite(Q[:, column]), inputs[name], np.nan)
+
+    result = BatchResult(
+        inputs=inputs,
+        P=np.stack([P_low, P_high, P_high, P_high, P_low, P_low, P_high, P_low], axis=1),
+        T=T, x=x, Q=Q,
+        h=np.stack([line.h for line in lines], axis=1),
+        s=np.stack([line.s for line in lines], axis=1),
+        m_ponto=m_ponto, phase=phase,
+        Q_gen=Q_gen, Q_con=Q_con, Q_abs=Q_abs,
+        feasible=np.zeros(n, bool), flash_counts=counter)
+    result.feasible = (x_7_converged & np.all(np.isfinite(T), axis=1) & np.all(np.isfinite(result.h), axis=1)
+                       & np.all(np.isfinite(m_ponto), axis=1) & np.all(m_ponto > 0, axis=1) & np.isfinite(Q_gen))
+    return result
+
+
+def concatenate_batches(batches):
+    # One BatchResult with the points of all the batches, in the same order
+    batches = list(batches)
+    counter = FlashCounter()
+    for batch in batches:
+        counter.update(batch.flash_counts)
+    columns = {}
+    for f in fields(BatchResult):
+        if f.name == "inputs":
+            columns["inputs"] = {name: np.concatenate([batch.inputs[name] for batch in batches]) for name in INPUT_NAMES}
+        elif f.name != "flash_counts":
+            columns[f.name] = np.concatenate([getattr(batch, f.name) for batch in batches])
+    return BatchResult(flash_counts=counter, **columns)
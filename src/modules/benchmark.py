@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 22:30:00 2026
+
+@author: Wellorzzon Novais
+"""
+
+"""
+Description
+--
+This code is the benchmark suite of the cycle solver. It times, with the offline property backend ("numpy" by default):
+    - cycle_solve: one full solve (the 14 steps of solve_cycle)
+    - flash_<pair>: one property call of each input pair (TQ, PT, PQ, PH, PS) at the default operating point
+    - x_7_solve: the root solve of x_7 (cold start)
+    - batch_sweep_<n>: sweeps of n points with the vectorized batch solver, in this process
+    - parallel_sweep_<n>: the same sweeps spread over a process pool (run_batch_sweep in one sweep.SweepPool, started
+      before the timing and without property cache, as the callers that keep their pool)
+and reports the wall time (best of the repeats), flashes per solve, peak memory (tracemalloc, separate run) and points
+per second of each benchmark.
+The peak memory is the one of the Python allocations of this process only: the workers of the parallel sweeps are not
+measured, so those benchmarks report almost only the memory of the results gathered in this process.
+The results are saved as JSON baselines; "compare" fails (exit code 1) when the points per second of a benchmark are
+lower than the baseline by more than the threshold, or when a benchmark of the baseline is missing from the current
+results.
+
+Running from the src folder:
+    python -m modules.benchmark run --output baseline.json
+    python -m modules.benchmark run --output current.json --compare baseline.json --threshold 0.1
+    python -m modules.benchmark compare baseline.json current.json
+"""
+
+"""
+Log
+
+--------------------------------------
+Version 0.0.1
+--
+Introduced the benchmark suite, JSON baselines and compare.
+
+--------------------------------------
+Version 0.0.2
+--
+The parallel sweeps get the backend spec (not the backend name) and run in one sweep.SweepPool; "compare" reports
+the benchmarks missing from the current results as regressions.
+
+--------------------------------------
+"""
+
+import json
+import os
+import platform
+import time
+import tracemalloc
+
+from modules.cycle_solver import CycleInputs, solve_cycle
+from modules.property_backend import get_backend
+from modules.state_point import PAIRS
+from modules.x_7_solver import solve_x_7
+
+
+FILE_VERSION = 1
+DEFAULT_SIZES = (1000, 10000, 100000)
+DEFAULT_THRESHOLD = 0.1 # maximum loss of points per second [-]
+
+
+def measure(function, points=1, repeat=5, number=1):
+    # Best wall time of "repeat" runs of "number" calls and peak memory of one more call.
+    # "function" returns the number of flashes of one call (or None).
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            flashes = function()
+        times.append((time.perf_counter() - start) / number)
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    wall_time = min(times)
+    return {
+        "wall_time": wall_time, # [s]
+        "mean_time": sum(times) / len(times), # [s]
+        "points": points,
+        "points_per_s": points / wall_time,
+        "flashes_per_solve": None if flashes is None else flashes / points,
+        "peak_memory": peak, # [bytes]
+    }
+
+
+def sweep_definition(n):
+    # Grid of about n points over the generator and evaporator temperatures
+    n_6 = 10 if n >= 10 else 1
+    return {"Temp_3": {"start": 360.0, "stop": 400.0, "num": n // n_6}, "Temp_6": {"start": 258.15, "stop": 268.15, "num": n_6}}
+
+
+def run_benchmarks(backend="numpy", sizes=DEFAULT_SIZES, repeat=5, processes=None, only=None):
+    # Returns {"meta": {...}, "results": {benchmark name: measure(...)}}
+    from modules.sweep import SweepPool, expand_sweep, run_batch_sweep
+
+    # The workers of the parallel sweeps create their backend from its spec ("numpy", "table:<file>", ...)
+    spec = backend if isinstance(backend, str) else backend.name
+    backend = get_backend(backend)
+    backend.load()
+    inputs = CycleInputs()
+    reference = solve_cycle(inputs, backend=backend)
+    P_high, P_low = reference.points[4].P, reference.points[6].P
+    benchmarks = {}
+
+    def cycle_solve():
+        return solve_cycle(inputs, backend=backend).flash_counts.total_flashes
+    benchmarks["cycle_solve"] = (cycle_solve, 1, 50)
+
+    # Inputs of each pair as in the cycle (lines 4, 3, 1, 5 and 2)
+    pair_inputs = {"TQ": (inputs.Temp_4, inputs.Qu_4, 1.0), "PT": (P_high, inputs.Temp_3, 1.0),
+                   "PQ": (P_low, inputs.Qu_1, inputs.x_1), "PH": (P_low, reference.points[4].h, 1.0),
+                   "PS": (P_high, reference.points[1].s, inputs.x_1)}
+    for pair in PAIRS:
+        def flash(pair=pair):
+            backend.flash(pair, *pair_inputs[pair])
+            return 1
+        benchmarks["flash_" + pair] = (flash, 1, 200)
+
+    def x_7_solve():
+        return solve_x_7(backend, P_high, inputs.Temp_3, inputs.Qu_7, inputs.x_1).flashes
+    benchmarks["x_7_solve"] = (x_7_solve, 1, 50)
+
+    pools = [] # one pool for all the parallel sweeps, started by the first one (before its timing)
+    for n in sizes:
+        points = expand_sweep(sweep_definition(n))
+
+        def batch_sweep(points=points):
+            return run_batch_sweep(points, backend, processes=1).flash_counts.total_flashes
+
+        def parallel_sweep(points=points):
+            return run_batch_sweep(points, chunksize=max(len(points) // (4 * pools[0].processes), 256), pool=pools[0]).flash_counts.total_flashes
+        benchmarks["batch_sweep_" + str(n)] = (batch_sweep, len(points), 1)
+        benchmarks["parallel_sweep_" + str(n)] = (parallel_sweep, len(points), 1)
+
+    results = {}
+    try:
+        for name, (function, points, number) in benchmarks.items():
+            if only is None or any(name.startswith(prefix) for prefix in only):
+                if name.startswith("parallel_sweep_") and not pools:
+                    pools.append(SweepPool(spec, processes, cache_size=0))
+                results[name] = measure(function, points, repeat, number)
+    finally:
+        for pool in pools:
+            pool.close()
+
+    import numpy
+
+    meta = {"file_version": FILE_VERSION, "backend": backend.name, "backend_version": str(backend.version),
+            "python": platform.python_version(), "numpy": numpy.__version__, "platform": platform.platform(),
+            "cpu_count": os.cpu_count(), "processes": processes or os.cpu_count(), "repeat": repeat,
+            "date": time.strftime("%Y-%m-%d %H:%M:%S")}
+    return {"meta": meta, "results": results}
+
+
+def save_results(results, path):
+    with open(path, "w") as file:
+        json.dump(results, file, indent=2)
+
+
+def load_results(path):
+    with open(path) as file:
+        return json.load(file)
+
+
+def compare(baseline, current, threshold=DEFAULT_THRESHOLD):
+    # Rows (name, baseline points/s, current points/s, relative change, regressed) of the benchmarks of the baseline;
+    # a benchmark missing from the current results is a regression (current points/s and change None)
+    rows = []
+    for name, base in baseline["results"].items():
+        if name not in current["results"]:
+            rows.append((name, base["points_per_s"], None, None, True))
+            continue
+        new = current["results"][name]
+        change = new["points_per_s"] / base["points_per_s"] - 1
+        rows.append((name, base["points_per_s"], new["points_per_s"], change, change < -threshold))
+    return rows
+
+
+def format_results(results):
+    lines = []
+    for name, r in results["results"].items():
+        flashes = "-" if r["flashes_per_solve"] is None else "{:.3g}".format(r["flashes_per_solve"])
+        lines.append(name.ljust(22) + " " + "{:.4g}".format(r["wall_time"]).rjust(10) + " s  " + "{:.4g}".format(r["points_per_s"]).rjust(10)
+                     + " points/s  " + flashes.rjust(6) + " flashes/solve  " + "{:.3g}".format(r["peak_memory"] / 2 ** 20).rjust(8) + " MiB")
+    return "\n".join(lines)
+
+
+def format_comparison(rows, threshold=DEFAULT_THRESHOLD):
+    lines = []
+    for name, base, new, change, regressed in rows:
+        if new is None:
+            lines.append(name.ljust(22) + " " + "{:.4g}".format(base).rjust(10) + " -> " + "missing".rjust(10) + "  REGRESSION (not in the current results)")
+            continue
+        lines.append(name.ljust(22) + " " + "{:.4g}".format(base).rjust(10) + " -> " + "{:.4g}".format(new).rjust(10)
+                     + " points/s  " + "{:+.1%}".format(change).rjust(8) + ("  REGRESSION (> " + "{:.0%}".format(threshold) + ")" if regressed else ""))
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="Benchmark suite of the ARS cycle solver")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    run_parser = subparsers.add_parser("run")
+    run_parser.add_argument("--backend", default="numpy", help="property backend (numpy, refprop or table:<file>)")
+    run_parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="points of the sweeps")
+    run_parser.add_argument("--repeat", type=int, default=5)
+    run_parser.add_argument("--processes", type=int, default=None)
+    run_parser.add_argument("--only", nargs="+", default=None, help="prefixes of the benchmarks to run")
+    run_parser.add_argument("--output", default=None, help="JSON file of the results (baseline)")
+    run_parser.add_argument("--compare", default=None, help="baseline JSON file to compare with")
+    run_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    compare_parser = subparsers.add_parser("compare")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args()
+
+    if args.command == "run":
+        current = run_benchmarks(args.backend, args.sizes, args.repeat, args.processes, args.only)
+        print(format_results(current))
+        if args.output:
+            save_results(current, args.output)
+        baseline_path = args.compare
+    else:
+        current = load_results(args.current)
+        baseline_path = args.baseline
+    if baseline_path:
+        rows = compare(load_results(baseline_path), current, args.threshold)
+        print(format_comparison(rows, args.threshold))
+        if any(row[4] for row in rows):
+            sys.exit(1)
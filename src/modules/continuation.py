@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 21:00:00 2026
+
+@author: Wellorzzon Novais
+"""
+
+"""
+Description
+--
+This code has the continuation mode of the sweeps: neighbour operating points have almost the same solution, so the
+points are solved along a path and each solve is seeded with the converged values of the previous point.
+    - serpentine_order: path over a grid sweep (modules/sweep.py) where each step changes only one input by one grid
+      step (the inner inputs go forward and backward, as a snake)
+    - run_continuation: solves the points along the path with x_7_guess = x_7 of the previous point (x_7 is the only
+      iterative step of solve_cycle; the other lines are direct flashes). With processes > 1 the path is split in
+      contiguous segments, one per worker.
+    - with compare_cold=True the same points are also solved from a cold start, and the iterations and flashes saved
+      are reported
+"""
+
+"""
+Log
+
+--------------------------------------
+Version 0.0.1
+--
+Introduced serpentine ordering and warm-started continuation.
+
+--------------------------------------
+Version 0.0.2
+--
+The path and the cold solves share one sweep.SweepPool.
+
+--------------------------------------
+"""
+
+import os
+from dataclasses import dataclass
+
+import modules.sweep as sweep
+from modules.cycle_solver import solve_cycle
+
+
+def serpentine_order(shape):
+    # Flat indices (same order of sweep.expand_sweep, i.e. itertools.product) visited as a snake over the grid
+    order = [()]
+    for size in shape:
+        new_order = []
+        for i, prefix in enumerate(order):
+            # The direction of the new axis alternates with the position on the path so far
+            values = range(size) if i % 2 == 0 else range(size - 1, -1, -1)
+            new_order.extend(prefix + (value,) for value in values)
+        order = new_order
+    flat = []
+    for index in order:
+        position = 0
+        for value, size in zip(index, shape):
+            position = position * size + value
+        flat.append(position)
+    return flat
+
+
+def grid_shape(definition):
+    return tuple(len(sweep.field_values(spec)) for spec in definition.values())
+
+
+@dataclass
+class ContinuationResult:
+    sweep_result: sweep.SweepResult # results in the input order
+    order: list # path (indices of the points)
+    iterations: int # x_7 iterations of all the solves
+    flashes: int # property calls of all the solves
+    cold_iterations: int = None
+    cold_flashes: int = None
+
+    def savings(self):
+        if self.cold_flashes is None:
+            return {}
+        return {
+            "iterations_saved": self.cold_iterations - self.iterations,
+            "flashes_saved": self.cold_flashes - self.flashes,
+            "iterations_ratio": self.iterations / max(self.cold_iterations, 1),
+            "flashes_ratio": self.flashes / max(self.cold_flashes, 1),
+        }
+
+
+def _totals(results):
+    iterations = sum(result.x_7_solution.iterations for result in results if result is not None)
+    flashes = sum(result.flash_counts.total_flashes for result in results if result is not None)
+    return iterations, flashes
+
+
+def _solve_path(segment):
+    # segment: list of (index, CycleInputs) along the path; each solve starts from the previous x_7
+    out = []
+    x_7_guess = None
+    for index, inputs in segment:
+        try:
+            result = solve_cycle(inputs, backend=sweep._WORKER_BACKEND, x_7_guess=x_7_guess)
+            x_7_guess = result.x_7
+            out.append((index, result, None))
+        except sweep.POINT_ERRORS as error:
+            # The next point starts cold again
+            x_7_guess = None
+            out.append((index, None, type(error).__name__ + ": " + str(error)))
+    return out
+
+
+def run_continuation(points, backend=None, order=None, processes=1, cache_size=0, compare_cold=False):
+    # points: sweep definition (the path is serpentine_order of its grid) or list of CycleInputs (path = order, or
+    # the list order). cache_size=0 by default so the flashes saved are the ones of the warm start only.
+    if isinstance(points, dict):
+        if order is None:
+            order = serpentine_order(grid_shape(points))
+        points = sweep.expand_sweep(points)
+    points = list(points)
+    if order is None:
+        order = list(range(len(points)))
+    processes = processes or os.cpu_count()
+
+    # Contiguous segments of the path, one per worker
+    n_segments = min(processes, len(order)) or 1
+    size = -(-len(order) // n_segments)
+    segments = [[(index, points[index]) for index in order[i:i + size]] for i in range(0, len(order), size)]
+
+    results, errors = [None] * len(points), [None] * len(points)
+    # One pool for the path and the cold solves
+    with sweep.SweepPool(backend, processes, cache_size) as pool:
+        for segment in pool.map(_solve_path, segments):
+            for index, result, error in segment:
+                results[index], errors[index] = result, error
+
+        iterations, flashes = _totals(results)
+        result = ContinuationResult(sweep.SweepResult(points, results, errors, {"processes": processes, "segments": len(segments)}),
+                                    order, iterations, flashes)
+        if compare_cold:
+            cold = sweep.run_sweep(points, pool=pool)
+            result.cold_iterations, result.cold_flashes = _totals(cold.results)
+    return result
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Warm-started continuation along a sweep of the ARS cycle")
+    parser.add_argument("sweep", help="sweep definition (JSON)")
+    parser.add_argument("--backend", default=None, help="property backend (refprop, numpy or table:<file>)")
+    parser.add_argument("--processes", type=int, default=1)
+    args = parser.parse_args()
+
+    result = run_continuation(sweep.load_sweep_definition(args.sweep), args.backend, processes=args.processes, compare_cold=True)
+    print("Points: " + str(len(result.order)) + "; failed: " + str(result.sweep_result.n_failed))
+    print("x_7 iterations: " + str(result.iterations) + " (cold: " + str(result.cold_iterations) + ")")
+    print("Flashes: " + str(result.flashes) + " (cold: " + str(result.cold_flashes) + ")")
+    print(result.savings())
@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 10:00:00 2026
+
+@author: Wellorzzon Novais
+"""
+
+"""
+Description
+--
+This code has the importable version of the "Most Simple" absorption refrigeration cycle solver, which includes:
+    - 1 condenser
+    - 1 generator
+    - 1 evaporator
+    - 1 absorber
+    - 1 pump
+    - 2 expansion valves
+The steps are the same ones from ARS_simple_solver.py, but they run inside "solve_cycle" and nothing is called on import.
+RefProp (ctREFPROP) and tabulate are only imported the first time they are needed, and the property backend is
+instantiated only once per process.
+"""
+
+"""
+Log
+
+--------------------------------------
+Version 0.0.1
+--
+Moved the steps of ARS_simple_solver.py v0.0.4 into "solve_cycle(inputs) -> CycleResult".
+Lazy import of ctREFPROP, scipy.optimize and tabulate.
+
+--------------------------------------
+Version 0.0.2
+--
+One REFPROPdll call per line ("evaluate_state_point"): T, P, H, S and the quality come together and the phase is taken
+from the quality, instead of a second identical call just for "PHASE".
+Each solve counts its calls per input pair in CycleResult.flash_counts.
+
+--------------------------------------
+Version 0.0.3
+--
+The properties come from a property backend (modules/property_backend.py), RefProp or the NumPy stand-in:
+solve_cycle(inputs, backend="numpy") runs without the RefProp DLL.
+
+--------------------------------------
+Version 0.0.4
+--
+x_7 is found with a bracketed Brent solve (modules/x_7_solver.py) instead of "fsolve", with optional warm start
+(x_7_guess) and its iterations and flashes in CycleResult.x_7_solution. scipy is not needed anymore.
+The flash of the last x_7 evaluation is used for line 7.
+
+--------------------------------------
+Version 0.0.5
+--
+Optional per-step trace (modules/trace.py): solve_cycle(..., trace=SolveTrace()).
+
+--------------------------------------
+Version 0.0.6
+--
+An x_7 solve that does not converge (X7Solution.converged) raises InfeasibleCycleError instead of giving a cycle.
+
+--------------------------------------
+"""
+
+from dataclasses import dataclass, field
+
+import modules.mass_and_energy_balance as meb
+from modules.property_backend import get_backend
+from modules.state_point import FlashCounter, StatePoint, phase_from_quality
+from modules.x_7_solver import InfeasibleCycleError, X7Solution, solve_x_7
+
+
+# ==========================================================================
+# Inputs and results
+# ==========================================================================
+
+@dataclass(frozen=True)
+class CycleInputs:
+    # ===== Input datas =====
+    # Temperature in generator high outlet or condenser inlet
+    Temp_3: float = 373.15 # [K]
+
+    # Temperature in condenser outlet or EV1 inlet
+    Temp_4: float = 313.15 # [K]
+
+    # Temperature in evaporator outlet or absorber inlet
+    Temp_6: float = 263.15 # [K]
+
+    # Cooling load in evaporator
+    Q_eva: float = 5000 # [W]
+
+    # Thermodynamic pump efficiency
+    eff_p: float = 0.85 # [-]
+
+    # Ammonia mass fraction in absorber outlet, pump and generator inlet
+    x_1: float = 0.43 # [-]
+
+    # Vapor quality in absorber outlet or pump inlet
+    Qu_1: float = 0 # [-]
+
+    # Vapor quality in condenser outlet or EV1 inlet
+    Qu_4: float = 0 # [-]
+
+    # Vapor quality in evaporator outlet or absorber inlet
+    Qu_6: float = 1 # [-]
+
+    # Vapor quality in generator low outlet or EV2 inlet
+    Qu_7: float = 0 # [-]
+
+
+@dataclass
+class CycleResult:
+    inputs: CycleInputs
+    points: dict = field(default_factory=dict) # {1: StatePoint, ..., 8: StatePoint}
+    Q_gen: float = float('nan') # [W]
+    Q_con: float = float('nan') # [W]
+    Q_abs: float = float('nan') # [W]
+    flash_counts: FlashCounter = field(default_factory=FlashCounter)
+    x_7_solution: X7Solution = None
+
+    @property
+    def x_7(self):
+        return self.points[7].x
+
+    @property
+    def m_ponto(self):
+        return {i: point.m_ponto for i, point in self.points.items()}
+
+    def table(self):
+        # Same table printed by ARS_simple_solver.py
+        from tabulate import tabulate
+
+        table = [['Point', 'Pressure', 'Temperature', 'Ammonia mass \nfraction', 'Vapor \nquality', 'Specific \nenthalpy', 'Specific \nentropy', 'Mass \nflow rate', 'Phase']]
+        for i in sorted(self.points):
+            p = self.points[i]
+            table.append([str(i), ('%.9g ' if i == 3 else '%.4g ') % p.P, '%.4g' % p.T, '%.4g' % p.x, '%.4g' % p.Q, '%.4g' % p.h, '%.4g' % p.s, '%.4g' % p.m_ponto, p.phase])
+        return tabulate(table, headers='firstrow')
+
+
+# ==========================================================================
+# Solving the cycle
+# ==========================================================================
+
+def _fmt(value):
+    return "{:.4g}".format(value)
+
+
+def check_x_7_solution(x_7_solution):
+    # A cycle is only given for a converged x_7
+    if not x_7_solution.converged:
+        raise InfeasibleCycleError("x_7 did not converge in " + str(x_7_solution.iterations) + " iterations (last x_7 = "
+                                   + _fmt(x_7_solution.x_7) + ")")
+    return x_7_solution
+
+
+def state_point_from_flash(flash, pair, value_2, x):
+    T, P, h, s, Q = flash
+    phase = phase_from_quality(Q)
+    if pair[1] == "Q":
+        Q = value_2
+    return StatePoint(P, T, x, Q, h, s, phase=phase)
+
+
+def evaluate_state_point(backend, pair, value_1, value_2, x, counter=None):
+    # All the properties of a line (T, P, h, s, quality and phase) from a single backend call.
+    # "pair" is one of TQ, PT, PQ, PH or PS and (value_1, value_2) follow the same order.
+    if counter is not None:
+        counter.add(pair)
+    return state_point_from_flash(backend.flash(pair, value_1, value_2, x), pair, value_2, x)
+
+
+def solve_cycle(inputs=None, verbose=False, backend=None, x_7_guess=None, trace=None):
+    # Solves the 14 steps of the "Most Simple" cycle and returns a CycleResult.
+    # "backend" is a PropertyBackend or its name (default from ARS_PROPERTY_BACKEND, see property_backend.py).
+    # "x_7_guess" is an optional warm start of step 5 (e.g. x_7 of a neighbour operating point).
+    # InfeasibleCycleError is raised when there is no x_7 for the inputs, or when its solve does not converge.
+    # With verbose=True the same step prints of ARS_simple_solver.py are shown.
+    # "trace" is an optional trace.SolveTrace that records the time, flashes and cache use of each step.
+    if inputs is None:
+        inputs = CycleInputs()
+    backend = get_backend(backend)
+
+    def log(*text):
+        if verbose:
+            print(*text)
+
+    counter = FlashCounter()
+
+    def begin(step):
+        log("Step " + str(step) + ":")
+        if trace is not None:
+            trace.step(step, counter, backend)
+
+    # ===== Mass fraction equality =====
+    x_1 = x_2 = inputs.x_1
+    x_3 = x_4 = x_5 = x_6 = 1
+
+    Temp_3 = inputs.Temp_3
+
+    # 2. Taking the thermodynamic properties from the backend (REFPROP v10) at lines 4 and 6:
+    step = 2
+    begin(step)
+
+    point_4 = evaluate_state_point(backend, "TQ", inputs.Temp_4, inputs.Qu_4, x_4, counter)
+    log("P_4 = " + _fmt(point_4.P) + "; h_4 = " + _fmt(point_4.h) + "; s_4 = " + _fmt(point_4.s) + "; Phase_4 = " + point_4.phase)
+
+    point_6 = evaluate_state_point(backend, "TQ", inputs.Temp_6, inputs.Qu_6, x_6, counter)
+    log("P_6 = " + _fmt(point_6.P) + "; h_6 = " + _fmt(point_6.h) + "; s_6 = " + _fmt(point_6.s) + "; Phase_6 = " + point_6.phase)
+    log()
+
+    # 3. Apply pressure equality at lines 1, 2, 3, 5, 7, 8 with P_4 and P_6:
+    step += 1
+    begin(step)
+
+    P_2 = P_3 = P_7 = point_4.P
+    P_1 = P_5 = P_8 = point_6.P
+    log("P_2 = P_3 = P_7 = " + _fmt(P_2))
+    log("P_1 = P_5 = P_8 = " + _fmt(P_1))
+    log()
+
+    # 4. Solve lines 1 and 3, that now have three properties:
+    step += 1
+    begin(step)
+
+    point_3 = evaluate_state_point(backend, "PT", P_3, Temp_3, x_3, counter)
+    log("Qu_3 = " + _fmt(point_3.Q) + "; h_3 = " + _fmt(point_3.h) + "; s_3 = " + _fmt(point_3.s) + "; Phase_3 = " + point_3.phase)
+
+    point_1 = evaluate_state_point(backend, "PQ", P_1, inputs.Qu_1, x_1, counter)
+    log("Temp_1 = " + _fmt(point_1.T) + "; h_1 = " + _fmt(point_1.h) + "; s_1 = " + _fmt(point_1.s) + "; Phase_1 = " + point_1.phase)
+    log()
+
+    # 4.1. Apply isenthalpic expansion valve condition for line 5 (h_5 = h_4):
+    begin(step + 0.1)
+
+    point_5 = evaluate_state_point(backend, "PH", P_5, point_4.h, x_5, counter)
+    log("Temp_5 = " + _fmt(point_5.T) + "; Qu_5 = " + _fmt(point_5.Q) + "; s_5 = " + _fmt(point_5.s) + "; Phase_5 = " + point_5.phase)
+    log()
+
+    # 5. Solve line 7, based on P_7, Q_7 and Temp_7. RefProp does not allow to use those three properties as input,
+    # so x_7 is found with Brent's method between 0 and x_1 (We are trying to reach Temp_7 == Temp_3).
+    step += 1
+    begin(step)
+
+    x_7_solution = solve_x_7(backend, P_7, Temp_3, inputs.Qu_7, x_1, x_7_guess, counter)
+    check_x_7_solution(x_7_solution)
+    x_7 = x_7_solution.x_7
+    point_7 = state_point_from_flash(x_7_solution.line_7, "PQ", inputs.Qu_7, x_7)
+    log("Temp_7 = " + _fmt(point_7.T) + "; x_7 = " + _fmt(x_7) + "; Qu_7 = " + _fmt(point_7.Q) + "; s_7 = " + _fmt(point_7.s) + "; Phase_7 = " + point_7.phase)
+    log("(x_7 found in " + str(x_7_solution.iterations) + " iterations and " + str(x_7_solution.flashes) + " flashes)")
+    log()
+
+    # 6. Apply isentropic pump condition for line 2 (s_2 = s_1):
+    step += 1
+    begin(step)
+
+    point_2 = evaluate_state_point(backend, "PS", P_2, point_1.s, x_2, counter)
+    log("Temp_2 = " + _fmt(point_2.T) + "; Qu_2 = " + _fmt(point_2.Q) + "; h_2 = " + _fmt(point_2.h) + "; Phase_2 = " + point_2.phase)
+    log()
+
+    # 7. Apply isenthalpic expansion valve condition for line 8 (x_8 = x_7, h_8 = h_7):
+    step += 1
+    begin(step)
+
+    x_8 = x_7
+    point_8 = evaluate_state_point(backend, "PH", P_8, point_7.h, x_8, counter)
+    log("Temp_8 = " + _fmt(point_8.T) + "; Qu_8 = " + _fmt(point_8.Q) + "; s_8 = " + _fmt(point_8.s) + "; Phase_8 = " + point_8.phase)
+    log()
+
+    # 8. Solving energy balance at evaporator with Q_eva, h_5 and h_6:
+    step += 1
+    begin(step)
+
+    m_ponto_6 = meb.m_ponto_calc_eva(inputs.Q_eva, point_5.h, point_6.h)
+    log("m_ponto_6 = " + _fmt(m_ponto_6))
+    log()
+
+    # 9. Apply mass flow rate equality at lines 3, 4 and 5 based on m_ponto_6:
+    step += 1
+    begin(step)
+
+    m_ponto_3 = m_ponto_4 = m_ponto_5 = m_ponto_6
+    log("m_ponto_3 = m_ponto_4 = m_ponto_5 = " + _fmt(m_ponto_6))
+    log()
+
+    # 10. Apply mass balance in generator with lines 2, 3 and 7:
+    step += 1
+    begin(step)
+
+    m_ponto_7 = meb.m_ponto_low_outlet_calc_gen(m_ponto_3, x_2, x_3, x_7)
+    log("m_ponto_7 = " + _fmt(m_ponto_7))
+    log()
+
+    # 11. Apply mass flow rate equality at line 8:
+    step += 1
+    begin(step)
+
+    m_ponto_8 = m_ponto_7
+    log("m_ponto_8 = " + _fmt(m_ponto_8))
+    log()
+
+    # 12. Apply mass balance at generator to solve line 2:
+    step += 1
+    begin(step)
+
+    m_ponto_2 = meb.m_ponto_inlet_calc_gen(m_ponto_3, m_ponto_7)
+    log("m_ponto_2 = " + _fmt(m_ponto_2))
+    log()
+
+    # 13. Apply mass flow rate equality at line 1:
+    step += 1
+    begin(step)
+
+    m_ponto_1 = m_ponto_2
+    log("m_ponto_1 = " + _fmt(m_ponto_1))
+    log()
+
+    # 14. Calculating heat exchange rate at generator, condenser and absorber:
+    step += 1
+    begin(step)
+
+    Q_gen = meb.Q_gen_calc(m_ponto_3, point_3.h, m_ponto_7, point_7.h, m_ponto_2, point_2.h)
+    Q_con = meb.Q_con_calc(m_ponto_3, point_3.h, point_4.h)
+    Q_abs = meb.Q_abs_calc(m_ponto_1, point_1.h, m_ponto_6, point_6.h, m_ponto_8, point_8.h)
+    log("Q_gen = " + _fmt(Q_gen))
+    log("Q_con = " + _fmt(Q_con))
+    log("Q_abs = " + _fmt(Q_abs))
+    log()
+
+    points = {1: point_1, 2: point_2, 3: point_3, 4: point_4, 5: point_5, 6: point_6, 7: point_7, 8: point_8}
+    m_ponto = {1: m_ponto_1, 2: m_ponto_2, 3: m_ponto_3, 4: m_ponto_4, 5: m_ponto_5, 6: m_ponto_6, 7: m_ponto_7, 8: m_ponto_8}
+    for i, point in points.items():
+        point.m_ponto = m_ponto[i]
+    if trace is not None:
+        trace.finish(counter, backend, x_7_solution)
+    return CycleResult(inputs, points, Q_gen, Q_con, Q_abs, counter, x_7_solution)
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 15:30:00 2026
+
+@author: Wellorzzon Novais
+"""
+
+"""
+Description
+--
+This code has a persistent (sqlite) cache of property results, shared by runs and by processes.
+    - Each row is one flash: (signature, pair, value_1, value_2, x) -> (T, P, h, s, Q)
+    - The signature is made of the backend name, version and fluid-file hash (PropertyBackend.fluid_hash), so rows of
+      another backend, RefProp version or fluid file are never used (they can be removed with "purge")
+    - The database uses WAL journal mode: many worker processes can read at the same time while one writes
+    - New results are written in groups ("flush_every") to keep the writes cheap
+    - flash_many (batch solver) looks up all its states with one query (through a temporary table of the keys) and
+      writes the states it had to solve with one insert
+
+Warm-up from a sweep definition (see modules/sweep.py), running from the src folder:
+    python -m modules.disk_cache warm sweep.json --db properties.sqlite --backend numpy
+"""
+
+"""
+Log
+
+--------------------------------------
+Version 0.0.1
+--
+Introduced DiskCache, PersistentCachedBackend and the warm-up command.
+
+--------------------------------------
+Version 0.0.2
+--
+The warm-up skips every point error of the sweeps (sweep.POINT_ERRORS), including infeasible points.
+
+--------------------------------------
+Version 0.0.3
+--
+PersistentCachedBackend.flash_many: one query for all the states (DiskCache.get_many) and one insert of the solved ones.
+
+--------------------------------------
+"""
+
+import os
+import sqlite3
+
+from modules.property_backend import FlashResult, PropertyBackend, get_backend
+
+
+DEFAULT_PATH = "ars_properties.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS flashes (
+    signature TEXT NOT NULL,
+    pair TEXT NOT NULL,
+    value_1 REAL NOT NULL,
+    value_2 REAL NOT NULL,
+    x REAL NOT NULL,
+    T REAL, P REAL, h REAL, s REAL, Q REAL,
+    PRIMARY KEY (signature, pair, value_1, value_2, x)
+) WITHOUT ROWID
+"""
+
+
+def backend_signature(backend):
+    backend.load()
+    return backend.name + "|" + str(backend.version) + "|" + backend.fluid + "|" + backend.fluid_hash()
+
+
+class DiskCache:
+
+    def __init__(self, path=DEFAULT_PATH, timeout=60.0):
+        self.path = path
+        self.timeout = timeout
+        self._connection = None
+        self._pid = None
+
+    @property
+    def connection(self):
+        # One connection per process (a connection must not be used after a fork)
+        if self._connection is None or self._pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=self.timeout)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(SCHEMA)
+            connection.commit()
+            self._connection, self._pid = connection, os.getpid()
+        return self._connection
+
+    def get(self, signature, pair, value_1, value_2, x):
+        row = self.connection.execute(
+            "SELECT T, P, h, s, Q FROM flashes WHERE signature=? AND pair=? AND value_1=? AND value_2=? AND x=?",
+            (signature, pair, value_1, value_2, x)).fetchone()
+        return None if row is None else FlashResult(*row)
+
+    def get_many(self, signature, pair, keys):
+        # {position in keys: FlashResult} of the keys (value_1, value_2, x) found, with one query: the keys go to a
+        # temporary table joined with the primary key of "flashes"
+        connection = self.connection
+        connection.execute("CREATE TEMP TABLE IF NOT EXISTS lookup (k INTEGER PRIMARY KEY, value_1 REAL, value_2 REAL, x REAL)")
+        try:
+            connection.executemany("INSERT INTO lookup VALUES (?, ?, ?, ?)", ((k,) + tuple(key) for k, key in enumerate(keys)))
+            rows = connection.execute(
+                "SELECT lookup.k, f.T, f.P, f.h, f.s, f.Q FROM lookup JOIN flashes AS f ON f.signature=? AND f.pair=? "
+                "AND f.value_1=lookup.value_1 AND f.value_2=lookup.value_2 AND f.x=lookup.x", (signature, pair)).fetchall()
+        finally:
+            connection.execute("DELETE FROM lookup")
+            connection.commit()
+        return {row[0]: FlashResult(*row[1:]) for row in rows}
+
+    def put_many(self, rows):
+        # rows: (signature, pair, value_1, value_2, x, T, P, h, s, Q)
+        with self.connection:
+            self.connection.executemany("INSERT OR IGNORE INTO flashes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+    def count(self, signature=None):
+        if signature is None:
+            return self.connection.execute("SELECT COUNT(*) FROM flashes").fetchone()[0]
+        return self.connection.execute("SELECT COUNT(*) FROM flashes WHERE signature=?", (signature,)).fetchone()[0]
+
+    def purge(self, keep_signature):
+        # Removes the rows of other backends/versions/fluid files
+        with self.connection:
+            return self.connection.execute("DELETE FROM flashes WHERE signature<>?", (keep_signature,)).rowcount
+
+    def close(self):
+        if self._connection is not None and self._pid == os.getpid():
+            self._connection.close()
+        self._connection = None
+
+
+class PersistentCachedBackend(PropertyBackend):
+    # Property backend that reads from / writes to a DiskCache before calling the real backend.
+    # It can be combined with the in-memory cache: CachedBackend(PersistentCachedBackend(...)).
+
+    def __init__(self, backend=None, path=DEFAULT_PATH, flush_every=1000):
+        self.backend = get_backend(backend)
+        self.cache = path if isinstance(path, DiskCache) else DiskCache(path)
+        self.flush_every = flush_every
+        self.pending = []
+        self.hits = self.misses = 0
+        self._signature = None
+
+    @property
+    def name(self):
+        return self.backend.name
+
+    @property
+    def version(self):
+        return self.backend.version
+
+    @property
+    def fluid(self):
+        return self.backend.fluid
+
+    @property
+    def x_range(self):
+        return self.backend.x_range
+
+    @property
+    def signature(self):
+        if self._signature is None:
+            self._signature = backend_signature(self.backend)
+        return self._signature
+
+    def load(self):
+        return self.backend.load()
+
+    def fluid_hash(self):
+        return self.backend.fluid_hash()
+
+    def flash(self, pair, value_1, value_2, x):
+        value_1, value_2, x = float(value_1), float(value_2), float(x)
+        result = self.cache.get(self.signature, pair, value_1, value_2, x)
+        if result is not None:
+            self.hits += 1
+            return result
+        self.misses += 1
+        result = self.backend.flash(pair, value_1, value_2, x)
+        self.pending.append((self.signature, pair, value_1, value_2, x) + tuple(float(value) for value in result))
+        if len(self.pending) >= self.flush_every:
+            self.flush()
+        return result
+
+    def flash_many(self, pair, value_1, value_2, x):
+        # One query for the unique states, one call to the backend and one insert for the missing ones
+        import numpy as np
+
+        value_1, value_2, x = np.broadcast_arrays(np.asarray(value_1, float), np.asarray(value_2, float), np.asarray(x, float))
+        keys, inverse = np.unique(np.stack([value_1.ravel(), value_2.ravel(), x.ravel()], axis=1), axis=0, return_inverse=True)
+        out = np.empty((len(keys), 5))
+        found = self.cache.get_many(self.signature, pair, keys.tolist())
+        for k, result in found.items():
+            out[k] = result
+        missing = np.setdiff1d(np.arange(len(keys)), list(found))
+        self.hits += len(found)
+        self.misses += len(missing)
+        if len(missing):
+            solved = np.stack(self.backend.flash_many(pair, *keys[missing].T), axis=1)
+            out[missing] = solved
+            # Unsolved states (NaN) are not stored
+            stored = np.all(np.isfinite(solved), axis=1)
+            self.flush()
+            self.cache.put_many([(self.signature, pair) + tuple(key) + tuple(result)
+                                 for key, result in zip(keys[missing][stored].tolist(), solved[stored].tolist())])
+        return FlashResult(*out[inverse.ravel()].T.reshape((5,) + x.shape))
+
+    def flush(self):
+        if self.pending:
+            self.cache.put_many(self.pending)
+            self.pending = []
+
+    def close(self):
+        self.flush()
+        self.cache.close()
+
+
+def warm(definition, path=DEFAULT_PATH, backend=None):
+    # Fills the persistent cache with all the flashes of the cycle solves of a sweep definition.
+    # Returns (number of points solved, number of failed points).
+    from modules.cycle_solver import solve_cycle
+    from modules.sweep import POINT_ERRORS, expand_sweep
+
+    persistent = PersistentCachedBackend(backend, path)
+    solved = failed = 0
+    try:
+        for inputs in expand_sweep(definition):
+            try:
+                solve_cycle(inputs, backend=persistent)
+                solved += 1
+            except POINT_ERRORS: # including infeasible points (InfeasibleCycleError)
+                failed += 1
+    finally:
+        persistent.close()
+    return solved, failed
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from modules.sweep import load_sweep_definition
+
+    parser = argparse.ArgumentParser(description="Persistent property cache of the ARS cycle")
+    parser.add_argument("command", choices=["warm", "info", "purge"])
+    parser.add_argument("sweep", nargs="?", help="sweep definition (JSON), for 'warm'")
+    parser.add_argument("--db", default=DEFAULT_PATH)
+    parser.add_argument("--backend", default=None, help="property backend (refprop or numpy)")
+    args = parser.parse_args()
+
+    if args.command == "warm":
+        if args.sweep is None:
+            parser.error("'warm' needs a sweep definition")
+        solved, failed = warm(load_sweep_definition(args.sweep), args.db, args.backend)
+        print("Points solved: " + str(solved) + "; failed: " + str(failed) + "; rows in cache: " + str(DiskCache(args.db).count()))
+    elif args.command == "info":
+        print("Rows in cache: " + str(DiskCache(args.db).count()))
+    else:
+        signature = backend_signature(get_backend(args.backend))
+        print("Rows removed: " + str(DiskCache(args.db).purge(signature)))
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 04:00:00 2026
+
+@author: Wellorzzon Novais
+"""
+
+"""
+Description
+--
+This code has the fault analysis mode of the cycle: fault signatures are perturbations (offsets) of the inputs, e.g.
+    - Temp_6 sensor drift: Temp_6 + (-3 ... 3) K
+    - condenser fouling: Temp_4 + (1 ... 8) K
+    - wrong strong solution concentration: x_1 + (-0.03 ... 0.03)
+and the result is the residual signature of each scenario: faulty - expected values of Q_gen, Q_abs, m_ponto_2 and
+Temp_1, where "expected" is the healthy cycle at the same operating point. The residuals (features) and the fault
+names (labels) are the training data of a fault classifier.
+    - scenario matrix: every base operating point x every fault x "levels" severities (offset from the low to the
+      high value of the fault), plus one healthy scenario per base point (label "healthy")
+    - the scenarios are deduplicated (the healthy scenarios are the base states, solved once and shared by all the
+      faults of their base point) and solved together with the batch solver (or a process pool, processes > 1)
+    - the property backend is cached, so the lines a fault does not change (e.g. lines 4, 3 and 7 when Temp_6
+      drifts) are not evaluated again
+    - optional measurement noise (normal, standard deviation per output) on the faulty values
+
+Running from the src folder:
+    python -m modules.fault_analysis --backend numpy --bases 200 --levels 20 --output faults.npz
+"""
+
+"""
+Log
+
+--------------------------------------
+Version 0.0.1
+--
+Introduced the fault scenario matrix and the residual signatures.
+
+--------------------------------------
+Version 0.0.2
+--
+Argument "pool" (sweep.SweepPool kept by the caller).
+
+--------------------------------------
+"""
+
+from dataclasses import dataclass, field, fields
+
+import numpy as np
+
+from modules.cycle_solver import CycleInputs
+
+
+INPUT_NAMES = tuple(f.name for f in fields(CycleInputs))
+RESIDUAL_OUTPUTS = ("Q_gen", "Q_abs", "m_ponto_2", "Temp_1")
+HEALTHY = "healthy"
+
+# Fault signatures: {fault: {input: (low, high) offset}}
+DEFAULT_FAULTS = {
+    "Temp_6_sensor_drift": {"Temp_6": (-3.0, 3.0)}, # [K]
+    "condenser_fouling": {"Temp_4": (1.0, 8.0)}, # [K]
+    "x_1_error": {"x_1": (-0.03, 0.03)}, # [-]
+}
+
+# Range of the base operating points sampled by the command line (Latin hypercube)
+DEFAULT_OPERATING_RANGES = {
+    "Temp_3": (365.0, 385.0), # [K]
+    "Q_eva": (3000.0, 7000.0), # [W]
+}
+
+
+def batch_outputs(batch):
+    # (n, RESIDUAL_OUTPUTS) of a BatchResult
+    return np.stack([batch.Q_gen, batch.Q_abs, batch.m_ponto[:, 1], batch.T[:, 0]], axis=1)
+
+
+def base_columns(bases):
+    # Columns {input: array} of the base points (a CycleInputs, a list of them or a dictionary of columns)
+    from modules.batch_solver import _broadcast_inputs, inputs_from_list
+
+    if bases is None or isinstance(bases, CycleInputs):
+        bases = [bases or CycleInputs()]
+    if isinstance(bases, dict):
+        return _broadcast_inputs(dict(bases))
+    return inputs_from_list(list(bases))
+
+
+def build_scenarios(bases=None, faults=None, levels=10, healthy=True):
+    # Scenario matrix: {"base": (n,) index of the base point, "fault": (n,) index in fault_names, "severity": (n,)
+    # 0 - 1 and the inputs columns}, and fault_names (HEALTHY first when healthy=True)
+    faults = DEFAULT_FAULTS if faults is None else faults
+    unknown = {name for signature in faults.values() for name in signature} - set(INPUT_NAMES)
+    if unknown:
+        raise ValueError("Unknown inputs in fault signatures: " + ", ".join(sorted(unknown)))
+    columns = base_columns(bases)
+    n_bases = len(columns["Temp_3"])
+    fault_names = ([HEALTHY] if healthy else []) + list(faults)
+    severity = np.linspace(0, 1, levels)
+
+    base, fault, severities = [], [], []
+    for k, name in enumerate(fault_names):
+        count = 1 if name == HEALTHY else levels
+        base.append(np.repeat(np.arange(n_bases), count))
+        fault.append(np.full(n_bases * count, k))
+        severities.append(np.tile(severity[:count] if name != HEALTHY else [0.0], n_bases))
+    scenarios = {"base": np.concatenate(base), "fault": np.concatenate(fault), "severity": np.concatenate(severities)}
+    for name in INPUT_NAMES:
+        scenarios[name] = columns[name][scenarios["base"]].copy()
+    for k, fault_name in enumerate(fault_names):
+        if fault_name == HEALTHY:
+            continue
+        rows = scenarios["fault"] == k
+        for name, (low, high) in faults[fault_name].items():
+            scenarios[name][rows] += low + scenarios["severity"][rows] * (high - low)
+    return scenarios, fault_names
+
+
+@dataclass
+class FaultAnalysisResult:
+    fault_names: list
+    scenarios: dict # scenario matrix (build_scenarios)
+    expected: np.ndarray # (n, RESIDUAL_OUTPUTS) healthy values at the base point of each scenario
+    faulty: np.ndarray # (n, RESIDUAL_OUTPUTS) values of the scenario
+    feasible: np.ndarray # (n,) both solves feasible
+    solves: int # cycle solves (unique operating points)
+    stats: dict = field(default_factory=dict)
+
+    @property
+    def residuals(self):
+        with np.errstate(invalid='ignore'):
+            return self.faulty - self.expected
+
+    def training_data(self, relative=False):
+        # (features, labels) of the feasible scenarios: residuals (relative to the expected values if "relative")
+        # and fault names
+        with np.errstate(invalid='ignore', divide='ignore'):
+            residuals = self.residuals / np.abs(self.expected) if relative else self.residuals
+        labels = np.array(self.fault_names)[self.scenarios["fault"]]
+        return residuals[self.feasible], labels[self.feasible]
+
+    def table(self):
+        # Mean residual of each fault at its largest severity
+        from tabulate import tabulate
+
+        rows = []
+        for k, name in enumerate(self.fault_names):
+            rows_k = self.feasible & (self.scenarios["fault"] == k)
+            if name != HEALTHY:
+                rows_k &= self.scenarios["severity"] == 1
+            means = self.residuals[rows_k].mean(axis=0) if rows_k.any() else np.full(len(RESIDUAL_OUTPUTS), np.nan)
+            rows.append([name, int(rows_k.sum())] + ['%.4g' % value for value in means])
+        return tabulate(rows, headers=["Fault (max severity)", "Scenarios"] + ["d" + name for name in RESIDUAL_OUTPUTS])
+
+    def save(self, path):
+        np.savez(path, fault_names=np.array(self.fault_names), outputs=np.array(RESIDUAL_OUTPUTS), expected=self.expected,
+                 faulty=self.faulty, residuals=self.residuals, feasible=self.feasible,
+                 **{"scenario_" + name: column for name, column in self.scenarios.items()})
+
+
+def analyze_faults(bases=None, faults=None, levels=10, backend=None, processes=1, cache_size=100000, noise=None,
+                   healthy=True, chunksize=4096, seed=0, pool=None):
+    # Residual signatures of the scenario matrix. "noise": {output: standard deviation} added to the faulty values.
+    # processes > 1 needs the backend name (each worker has its own backend and cache); "pool": sweep.SweepPool kept
+    # by the caller for many analyses (backend, processes and cache_size are then the ones of the pool).
+    import time
+
+    from modules.batch_solver import solve_cycle_batch
+
+    start = time.perf_counter()
+    scenarios, fault_names = build_scenarios(bases, faults, levels, healthy)
+    n = len(scenarios["base"])
+
+    # Unique operating points: the base points and every faulty point, solved once
+    n_bases = int(scenarios["base"].max()) + 1 if n else 0
+    base_inputs = base_columns(bases)
+    stacked = np.concatenate([np.stack([base_inputs[name] for name in INPUT_NAMES], axis=1),
+                              np.stack([scenarios[name] for name in INPUT_NAMES], axis=1)])
+    unique, inverse = np.unique(stacked, axis=0, return_inverse=True)
+    inverse = inverse.ravel()
+    if processes == 1 and pool is None:
+        from modules.property_backend import get_backend
+        from modules.property_cache import CachedBackend
+
+        backend = CachedBackend(get_backend(backend), maxsize=cache_size) if cache_size else get_backend(backend)
+        batch = solve_cycle_batch(dict(zip(INPUT_NAMES, unique.T)), backend=backend)
+    else:
+        from modules.sweep import run_batch_sweep
+
+        points = [CycleInputs(**dict(zip(INPUT_NAMES, map(float, row)))) for row in unique]
+        batch = run_batch_sweep(points, backend, processes, chunksize=chunksize, cache_size=cache_size, pool=pool)
+    values = batch_outputs(batch)
+
+    base_rows, scenario_rows = inverse[:n_bases], inverse[n_bases:]
+    expected = values[base_rows][scenarios["base"]]
+    faulty = values[scenario_rows].copy()
+    feasible = batch.feasible[base_rows][scenarios["base"]] & batch.feasible[scenario_rows]
+    if noise:
+        rng = np.random.default_rng(seed)
+        for k, name in enumerate(RESIDUAL_OUTPUTS):
+            if noise.get(name):
+                faulty[:, k] += rng.normal(0, noise[name], n)
+    stats = {"scenarios": n, "solves": len(unique), "seconds": time.perf_counter() - start}
+    if hasattr(backend, "cache_info"):
+        stats["cache"] = backend.cache_info()._asdict()
+    return FaultAnalysisResult(fault_names, scenarios, expected, faulty, feasible, len(unique), stats)
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Fault scenario analysis of the ARS cycle")
+    parser.add_argument("--faults", default=None, help="JSON file {fault: {input: [low, high]}} (default: DEFAULT_FAULTS)")
+    parser.add_argument("--backend", default=None, help="property backend (refprop, numpy or table:<file>)")
+    parser.add_argument("--bases", type=int, default=100, help="base operating points (Latin hypercube of Temp_3 and Q_eva)")
+    parser.add_argument("--levels", type=int, default=10, help="severities of each fault")
+    parser.add_argument("--processes", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help=".npz file of the scenarios and residuals")
+    args = parser.parse_args()
+
+    from modules.uncertainty import sample_inputs
+
+    faults = None
+    if args.faults:
+        with open(args.faults) as file:
+            faults = {name: {key: tuple(value) for key, value in signature.items()} for name, signature in json.load(file).items()}
+    distributions = {name: {"dist": "uniform", "low": low, "high": high} for name, (low, high) in DEFAULT_OPERATING_RANGES.items()}
+    bases = sample_inputs(distributions, args.bases, "lhs", args.seed)
+    result = analyze_faults(bases, faults, args.levels, args.backend, args.processes, seed=args.seed)
+    print(result.table())
+    stats = result.stats
+    print(str(stats["scenarios"]) + " scenarios, " + str(stats["solves"]) + " solves, " + "{:.3g}".format(stats["seconds"])
+          + " s (" + "{:.0f}".format(stats["scenarios"] / stats["seconds"] * 60) + " scenarios per minute); "
+          + str(int((~result.feasible).sum())) + " infeasible")
+    if args.output:
+        result.save(args.output)
+        print("Saved: " + args.output)
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 23:30:00 2026
+
+@author: Wellorzzon Novais
+"""
+
+"""
+Description
+--
+This code has the incremental version of solve_cycle: the steps of the cycle are nodes of a dependency graph and the
+last solution is kept, so when some inputs change only the nodes that depend on them are solved again.
+    - Temp_4, Qu_4 -> line 4 (P_high = P_2 = P_3 = P_4 = P_7) -> lines 3, 2, 5 and 7 (x_7) and what comes after them
+    - Temp_6, Qu_6 -> line 6 (P_low = P_1 = P_5 = P_6 = P_8) -> lines 1, 5, 8 and what comes after them
+    - Temp_3 -> lines 3 and 7 (x_7) -> line 8
+    - x_1 -> lines 1, 2 and 7 (x_7)
+    - Q_eva -> only the mass flow rates and heat exchange rates (steps 8 - 14), never a flash
+    - eff_p -> nothing (it is not used by the cycle yet)
+A node that is solved again but gives the same value as before does not make its dependents be solved again.
+The x_7 solve is warm started with the last x_7.
+
+    solver = IncrementalSolver(backend="numpy")
+    result = solver.solve(CycleInputs(Temp_3=373.15))
+    result = solver.solve(CycleInputs(Temp_3=373.15, Q_eva=6000)) # no flash
+    solver.last_solved # nodes solved in the last call
+"""
+
+"""
+Log
+
+--------------------------------------
+Version 0.0.1
+--
+Introduced the dependency graph of the cycle steps and IncrementalSolver.
+
+--------------------------------------
+Version 0.0.2
+--
+An x_7 solve that does not converge raises InfeasibleCycleError, as in solve_cycle.
+
+--------------------------------------
+"""
+
+from dataclasses import fields, replace
+
+import modules.mass_and_energy_balance as meb
+from modules.cycle_solver import CycleInputs, CycleResult, check_x_7_solution, evaluate_state_point, state_point_from_flash
+from modules.property_backend import get_backend
+from modules.state_point import FlashCounter
+from modules.x_7_solver import solve_x_7
+
+
+INPUT_NAMES = tuple(f.name for f in fields(CycleInputs))
+
+
+# ==========================================================================
+# Nodes: name -> (dependencies, function(values, backend, counter, last value))
+# The names are CycleInputs fields or other nodes; the nodes are in the order of the steps of solve_cycle.
+# ==========================================================================
+
+def _point_4(v, backend, counter, last):
+    return evaluate_state_point(backend, "TQ", v["Temp_4"], v["Qu_4"], 1, counter)
+
+
+def _point_6(v, backend, counter, last):
+    return evaluate_state_point(backend, "TQ", v["Temp_6"], v["Qu_6"], 1, counter)
+
+
+def _point_3(v, backend, counter, last):
+    return evaluate_state_point(backend, "PT", v["point_4"].P, v["Temp_3"], 1, counter)
+
+
+def _point_1(v, backend, counter, last):
+    return evaluate_state_point(backend, "PQ", v["point_6"].P, v["Qu_1"], v["x_1"], counter)
+
+
+def _point_5(v, backend, counter, last):
+    return evaluate_state_point(backend, "PH", v["point_6"].P, v["point_4"].h, 1, counter)
+
+
+def _x_7_solution(v, backend, counter, last):
+    guess = last.x_7 if last is not None else None
+    return check_x_7_solution(solve_x_7(backend, v["point_4"].P, v["Temp_3"], v["Qu_7"], v["x_1"], guess, counter))
+
+
+def _point_7(v, backend, counter, last):
+    solution = v["x_7_solution"]
+    return state_point_from_flash(solution.line_7, "PQ", v["Qu_7"], solution.x_7)
+
+
+def _point_2(v, backend, counter, last):
+    return evaluate_state_point(backend, "PS", v["point_4"].P, v["point_1"].s, v["x_1"], counter)
+
+
+def _point_8(v, backend, counter, last):
+    return evaluate_state_point(backend, "PH", v["point_6"].P, v["point_7"].h, v["point_7"].x, counter)
+
+
+def _balances(v, backend, counter, last):
+    # Steps 8 - 14: mass flow rates {line: m_ponto} and heat exchange rates
+    h = {i: v["point_" + str(i)].h for i in range(1, 9)}
+    m_ponto_6 = meb.m_ponto_calc_eva(v["Q_eva"], h[5], h[6])
+    m_ponto_3 = m_ponto_6
+    m_ponto_7 = meb.m_ponto_low_outlet_calc_gen(m_ponto_3, v["x_1"], 1, v["point_7"].x)
+    m_ponto_2 = meb.m_ponto_inlet_calc_gen(m_ponto_3, m_ponto_7)
+    m_ponto = {1: m_ponto_2, 2: m_ponto_2, 3: m_ponto_3, 4: m_ponto_3, 5: m_ponto_3, 6: m_ponto_6, 7: m_ponto_7, 8: m_ponto_7}
+    Q_gen = meb.Q_gen_calc(m_ponto_3, h[3], m_ponto_7, h[7], m_ponto_2, h[2])
+    Q_con = meb.Q_con_calc(m_ponto_3, h[3], h[4])
+    Q_abs = meb.Q_abs_calc(m_ponto_2, h[1], m_ponto_6, h[6], m_ponto_7, h[8])
+    return m_ponto, Q_gen, Q_con, Q_abs
+
+
+NODES = {
+    "point_4": (("Temp_4", "Qu_4"), _point_4),
+    "point_6": (("Temp_6", "Qu_6"), _point_6),
+    "point_3": (("point_4", "Temp_3"), _point_3),
+    "point_1": (("point_6", "Qu_1", "x_1"), _point_1),
+    "point_5": (("point_6", "point_4"), _point_5),
+    "x_7_solution": (("point_4", "Temp_3", "Qu_7", "x_1"), _x_7_solution),
+    "point_7": (("x_7_solution", "Qu_7"), _point_7),
+    "point_2": (("point_4", "point_1", "x_1"), _point_2),
+    "point_8": (("point_6", "point_7"), _point_8),
+    "balances": (("Q_eva", "x_1") + tuple("point_" + str(i) for i in range(1, 9)), _balances),
+}
+
+
+def dependents(names):
+    # All the nodes that depend (directly or not) on the inputs or nodes "names"
+    affected = set(names)
+    for node, (dependencies, _) in NODES.items():
+        if affected.intersection(dependencies):
+            affected.add(node)
+    return [node for node in NODES if node in affected]
+
+
+class IncrementalSolver:
+
+    def __init__(self, backend=None):
+        self.backend = get_backend(backend)
+        self.values = {} # last inputs and node values
+        self.last_solved = []
+
+    def reset(self):
+        self.values = {}
+        self.last_solved = []
+
+    def _same(self, node, old, new):
+        # Same value as the last solve (the mass flow rate of the points is not compared, it is NaN until the balances)
+        if old is None:
+            return False
+        if node == "x_7_solution":
+            return old.x_7 == new.x_7
+        if node.startswith("point_"):
+            return (old.P, old.T, old.x, old.Q, old.h, old.s, old.phase) == (new.P, new.T, new.x, new.Q, new.h, new.s, new.phase)
+        return False
+
+    def solve(self, inputs=None):
+        # CycleResult of the inputs, solving only the nodes affected by the inputs that changed since the last call.
+        # flash_counts has only the flashes of this call.
+        if inputs is None:
+            inputs = CycleInputs()
+        counter = FlashCounter()
+        changed = {name for name in INPUT_NAMES if self.values.get(name) != getattr(inputs, name)}
+        values = dict(self.values, **{name: getattr(inputs, name) for name in INPUT_NAMES})
+        solved = []
+        for node, (dependencies, function) in NODES.items():
+            if node in values and not changed.intersection(dependencies):
+                continue
+            old = values.get(node)
+            values[node] = function(values, self.backend, counter, old)
+            solved.append(node)
+            if not self._same(node, old, values[node]):
+                changed.add(node)
+        # Only kept when the solve succeeds (a failed solve keeps the last solution)
+        self.values = values
+        self.last_solved = solved
+
+        m_ponto, Q_gen, Q_con, Q_abs = values["balances"]
+        points = {i: replace(values["point_" + str(i)], m_ponto=m_ponto[i]) for i in range(1, 9)}
+        return CycleResult(inputs, points, Q_gen, Q_con, Q_abs, counter, values["x_7_solution"])
@@ -29,6 +29,17 @@ Introduced simple equations for generator, absorber and evaporator.
 TO DO:
     - I;
 
+--------------------------------------
+Version 0.0.2
+--
+The equations also work with NumPy arrays (one value per operating point), as used by the batch solver.
+Introduced the heat exchange rates at generator, condenser and absorber (step 14 of the solver).
+
+--------------------------------------
+Version 0.0.3
+--
+Introduced the balances as residuals (zero when satisfied), used by the network solver (modules/network.py).
+
 --------------------------------------
 """
 
@@ -70,7 +81,40 @@ def m_ponto_inlet_calc_gen(m_ponto_high_outlet, m_ponto_low_outlet):
     return m_ponto_inlet_gen
 
 
+def Q_gen_calc(m_ponto_high_outlet, h_high_outlet, m_ponto_low_outlet, h_low_outlet, m_ponto_inlet, h_inlet):
+    # (source)
+    # Q_gen = (m_ponto_3 * h_3) + (m_ponto_7 * h_7) - (m_ponto_2 * h_2)
+    Q_gen = (m_ponto_high_outlet * h_high_outlet) + (m_ponto_low_outlet * h_low_outlet) - (m_ponto_inlet * h_inlet)
+    return Q_gen
+
+
+def Q_con_calc(m_ponto_con, h_inlet, h_outlet):
+    # (source)
+    # Q_con = (m_ponto_3 * h_3) - (m_ponto_4 * h_4)
+    Q_con = m_ponto_con * (h_inlet - h_outlet)
+    return Q_con
+
 
+def Q_abs_calc(m_ponto_outlet, h_outlet, m_ponto_vapor_inlet, h_vapor_inlet, m_ponto_liquid_inlet, h_liquid_inlet):
+    # (source)
+    # Q_abs = (m_ponto_1 * h_1) - (m_ponto_6 * h_6) - (m_ponto_8 * h_8)
+    Q_abs = (m_ponto_outlet * h_outlet) - (m_ponto_vapor_inlet * h_vapor_inlet) - (m_ponto_liquid_inlet * h_liquid_inlet)
+    return Q_abs
 
 
+def mass_balance_residual(m_ponto_inlets, m_ponto_outlets):
+    # (source)
+    # sum(m_ponto_inlets) - sum(m_ponto_outlets) = 0
+    return sum(m_ponto_inlets) - sum(m_ponto_outlets)
+
 
+def ammonia_balance_residual(m_ponto_inlets, x_inlets, m_ponto_outlets, x_outlets):
+    # (source)
+    # sum(m_ponto_inlets * x_inlets) - sum(m_ponto_outlets * x_outlets) = 0
+    return sum(m * x for m, x in zip(m_ponto_inlets, x_inlets)) - sum(m * x for m, x in zip(m_ponto_outlets, x_outlets))
+
+
+def energy_balance_residual(Q, m_ponto_inlets, h_inlets, m_ponto_outlets, h_outlets):
+    # (source)
+    # Q + sum(m_ponto_inlets * h_inlets) - sum(m_ponto_outlets * h_outlets) = 0 (Q > 0 is heat into the device)
+    return Q + sum(m * h for m, h in zip(m_ponto_inlets, h_inlets)) - sum(m * h for m, h in zip(m_ponto_outlets, h_outlets))
@@ -0,0 +1,509 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 00:00:00 2026
+
+@author: Wellorzzon Novais
+"""
+
+"""
+Description
+--
+This code has the equation-oriented (network) version of the cycle solver. Instead of the hand-ordered steps of
+solve_cycle, the cycle is a network of components connected by streams, and all the unknowns are solved at once:
+    - each stream has 4 unknowns: mass flow rate m_ponto [kg/s], ammonia mass fraction x [-], pressure P [Pa] and
+      specific enthalpy h [J/kg] (T, s and the quality come from the property backend)
+    - each component adds its equations (residuals), built on the balances of mass_and_energy_balance.py:
+        Pump, Valve, Pipe (pressure drop and heat loss), HeatExchanger (evaporator, condenser), Generator, Absorber
+      and the specifications: Fixed, Quality, SaturationTemperature and Temperature
+    - the system is solved by Newton's method with a sparse Jacobian (scipy.sparse): each equation only depends on the
+      variables of its own streams, so the structure of the Jacobian is known from the components. The derivatives of
+      the balances are analytic; the derivatives of the equations with properties are finite differences of those few
+      variables only.
+New components (heat exchangers between streams, a second generator, ...) only add equations, so larger cycles do not
+need more sequential code.
+
+"simple_cycle" builds the "Most Simple" cycle of solve_cycle (same results), optionally with pipes between the
+components (heat losses and pressure drops of the TO DO of ARS_simple_solver.py):
+    network, guess = simple_cycle(CycleInputs(), backend="numpy", pipes={4: {"dP": 2000, "Q_loss": 20}})
+    solution = network.solve(guess)
+    solution.to_cycle_result(CycleInputs()).table()
+"""
+
+"""
+Log
+
+--------------------------------------
+Version 0.0.1
+--
+Introduced the network model, its components and the sparse Newton solver.
+
+--------------------------------------
+"""
+
+from dataclasses import dataclass, field
+
+import numpy as np
+
+import modules.mass_and_energy_balance as meb
+from modules.property_backend import PropertyError, get_backend
+from modules.state_point import FlashCounter
+from modules.cycle_solver import CycleInputs, CycleResult, state_point_from_flash
+
+
+# Unknowns of each stream
+KINDS = ("m", "x", "P", "h")
+
+# Typical magnitude of the variables and of the residuals of each kind (used to scale the Newton system)
+SCALES = {"m": 1e-2, "x": 1.0, "P": 1e6, "h": 1e6, "T": 100.0, "Q": 1e3}
+
+# Relative step of the finite differences
+FD_STEP = 1e-7
+
+
+class Equation:
+    __slots__ = ("name", "variables", "function", "gradient", "scale")
+
+    def __init__(self, name, variables, function, gradient=None, scale=1.0):
+        self.name = name
+        self.variables = variables # indices of the unknowns
+        self.function = function # f(values of the variables) -> residual
+        self.gradient = gradient # g(values of the variables) -> partial derivatives, or None (finite differences)
+        self.scale = scale
+
+
+def _equal(name, a, b, kind):
+    return Equation(name, (a, b), lambda v: v[0] - v[1], lambda v: (1.0, -1.0), SCALES[kind])
+
+
+# ==========================================================================
+# Components
+# ==========================================================================
+
+class Component:
+    streams = ()
+
+    def equations(self, network):
+        return []
+
+    def duty(self, network, values):
+        # Heat (or work) into the component [W], or None
+        return None
+
+
+class Fixed(Component):
+
+    def __init__(self, stream, kind, value):
+        self.streams = (stream,)
+        self.kind, self.value = kind, value
+
+    def equations(self, network):
+        i = network.var(self.streams[0], self.kind)
+        return [Equation(self.kind + "_" + self.streams[0], (i,), lambda v: v[0] - self.value, lambda v: (1.0,), SCALES[self.kind])]
+
+
+class Quality(Component):
+    # Saturated stream: h = h(P, Q, x)
+
+    def __init__(self, stream, Q):
+        self.streams = (stream,)
+        self.Q = Q
+
+    def equations(self, network):
+        stream = self.streams[0]
+        variables = tuple(network.var(stream, kind) for kind in ("P", "x", "h"))
+        return [Equation("Qu_" + stream, variables, lambda v: v[2] - network.flash("PQ", v[0], self.Q, v[1]).h, scale=SCALES["h"])]
+
+
+class SaturationTemperature(Component):
+    # Saturated stream at the temperature T: T(P, Q, x) = T
+
+    def __init__(self, stream, T, Q):
+        self.streams = (stream,)
+        self.T, self.Q = T, Q
+
+    def equations(self, network):
+        stream = self.streams[0]
+        variables = tuple(network.var(stream, kind) for kind in ("P", "x"))
+        return [Equation("Temp_" + stream, variables, lambda v: network.flash("PQ", v[0], self.Q, v[1]).T - self.T, scale=SCALES["T"])]
+
+
+class Temperature(Component):
+    # Single phase stream at the temperature T: h = h(P, T, x)
+
+    def __init__(self, stream, T):
+        self.streams = (stream,)
+        self.T = T
+
+    def equations(self, network):
+        stream = self.streams[0]
+        variables = tuple(network.var(stream, kind) for kind in ("P", "x", "h"))
+        return [Equation("Temp_" + stream, variables, lambda v: v[2] - network.flash("PT", v[0], self.T, v[1]).h, scale=SCALES["h"])]
+
+
+class _TwoPort(Component):
+
+    def __init__(self, inlet, outlet):
+        self.streams = (inlet, outlet)
+
+    def _same(self, network, kinds):
+        inlet, outlet = self.streams
+        return [_equal(kind + "_" + outlet, network.var(outlet, kind), network.var(inlet, kind), kind) for kind in kinds]
+
+    def duty(self, network, values):
+        m_in, h_in = network.value(values, self.streams[0], "m", "h")
+        m_out, h_out = network.value(values, self.streams[1], "m", "h")
+        return -meb.energy_balance_residual(0.0, [m_in], [h_in], [m_out], [h_out])
+
+
+class Pump(_TwoPort):
+    # h_out = h_in + (h_out,s - h_in) / eff, with h_out,s = h(P_out, s_in, x) (eff = 1: isentropic, as solve_cycle)
+    # The outlet pressure comes from the component after the pump.
+
+    def __init__(self, inlet, outlet, eff=1.0):
+        super().__init__(inlet, outlet)
+        self.eff = eff
+
+    def equations(self, network):
+        inlet, outlet = self.streams
+
+        def f(v):
+            P_in, x, h_in, P_out, h_out = v
+            s_in = network.flash("PH", P_in, h_in, x).s
+            h_out_s = network.flash("PS", P_out, s_in, x).h
+            return h_out - h_in - (h_out_s - h_in) / self.eff
+
+        variables = (network.var(inlet, "P"), network.var(inlet, "x"), network.var(inlet, "h"), network.var(outlet, "P"), network.var(outlet, "h"))
+        return self._same(network, ("m", "x")) + [Equation("h_" + outlet, variables, f, scale=SCALES["h"])]
+
+
+class Valve(_TwoPort):
+    # Isenthalpic expansion (the outlet pressure comes from the component after the valve)
+
+    def equations(self, network):
+        return self._same(network, ("m", "x", "h"))
+
+
+class Pipe(_TwoPort):
+    # Pressure drop dP [Pa] and heat loss Q_loss [W] between two components
+
+    def __init__(self, inlet, outlet, dP=0.0, Q_loss=0.0):
+        super().__init__(inlet, outlet)
+        self.dP, self.Q_loss = dP, Q_loss
+
+    def equations(self, network):
+        inlet, outlet = self.streams
+        P = Equation("P_" + outlet, (network.var(outlet, "P"), network.var(inlet, "P")), lambda v: v[0] - v[1] + self.dP, lambda v: (1.0, -1.0), SCALES["P"])
+        energy = Equation("h_" + outlet, tuple(network.var(stream, kind) for stream in (inlet, outlet) for kind in ("m", "h")),
+                          lambda v: meb.energy_balance_residual(-self.Q_loss, [v[0]], [v[1]], [v[2]], [v[3]]),
+                          lambda v: (v[1], v[0], -v[3], -v[2]), SCALES["Q"])
+        return self._same(network, ("m", "x")) + [P, energy]
+
+
+class HeatExchanger(_TwoPort):
+    # Evaporator or condenser: same m_ponto, x and P; with Q [W] given, the energy balance is an equation
+
+    def __init__(self, inlet, outlet, Q=None):
+        super().__init__(inlet, outlet)
+        self.Q = Q
+
+    def equations(self, network):
+        inlet, outlet = self.streams
+        equations = self._same(network, ("m", "x", "P"))
+        if self.Q is not None:
+            equations.append(Equation("Q_" + outlet, tuple(network.var(stream, kind) for stream in (inlet, outlet) for kind in ("m", "h")),
+                                      lambda v: meb.energy_balance_residual(self.Q, [v[0]], [v[1]], [v[2]], [v[3]]),
+                                      lambda v: (v[1], v[0], -v[3], -v[2]), SCALES["Q"]))
+        return equations
+
+
+def _mass_balance(name, network, inlets, outlets):
+    variables = tuple(network.var(stream, "m") for stream in inlets + outlets)
+    n = len(inlets)
+    return Equation(name, variables, lambda v: meb.mass_balance_residual(v[:n], v[n:]),
+                    lambda v: (1.0,) * n + (-1.0,) * (len(v) - n), SCALES["m"])
+
+
+def _ammonia_balance(name, network, inlets, outlets):
+    variables = tuple(network.var(stream, kind) for stream in inlets + outlets for kind in ("m", "x"))
+    n = 2 * len(inlets)
+
+    def gradient(v):
+        g = np.empty(len(v))
+        g[0::2], g[1::2] = v[1::2], v[0::2]
+        g[n:] *= -1
+        return g
+
+    return Equation(name, variables, lambda v: meb.ammonia_balance_residual(v[0:n:2], v[1:n:2], v[n::2], v[n + 1::2]), gradient, SCALES["m"])
+
+
+class Generator(Component):
+    # Inlet (strong solution) -> vapor (high outlet) and liquid (weak solution, low outlet), all at the same pressure
+
+    def __init__(self, inlet, vapor, liquid):
+        self.streams = (inlet, vapor, liquid)
+
+    def equations(self, network):
+        inlet, vapor, liquid = self.streams
+        return [_mass_balance("m_gen", network, [inlet], [vapor, liquid]),
+                _ammonia_balance("x_gen", network, [inlet], [vapor, liquid]),
+                _equal("P_" + vapor, network.var(vapor, "P"), network.var(inlet, "P"), "P"),
+                _equal("P_" + liquid, network.var(liquid, "P"), network.var(inlet, "P"), "P")]
+
+    def duty(self, network, values):
+        inlet, vapor, liquid = (network.value(values, stream, "m", "h") for stream in self.streams)
+        return meb.Q_gen_calc(vapor[0], vapor[1], liquid[0], liquid[1], inlet[0], inlet[1])
+
+
+class Absorber(Component):
+    # Vapor and liquid inlets -> outlet (strong solution), all at the same pressure.
+    # In a closed cycle the mass and ammonia balances of one component follow from all the others (the total mass and
+    # the total ammonia of the cycle are free), so balances=False for that component.
+
+    def __init__(self, vapor, liquid, outlet, balances=True):
+        self.streams = (vapor, liquid, outlet)
+        self.balances = balances
+
+    def equations(self, network):
+        vapor, liquid, outlet = self.streams
+        equations = [_equal("P_" + vapor, network.var(vapor, "P"), network.var(outlet, "P"), "P"),
+                     _equal("P_" + liquid, network.var(liquid, "P"), network.var(outlet, "P"), "P")]
+        if self.balances:
+            equations += [_mass_balance("m_abs", network, [vapor, liquid], [outlet]),
+                          _ammonia_balance("x_abs", network, [vapor, liquid], [outlet])]
+        return equations
+
+    def duty(self, network, values):
+        vapor, liquid, outlet = (network.value(values, stream, "m", "h") for stream in self.streams)
+        return meb.Q_abs_calc(outlet[0], outlet[1], vapor[0], vapor[1], liquid[0], liquid[1])
+
+
+# ==========================================================================
+# Network and Newton solver
+# ==========================================================================
+
+@dataclass
+class NetworkSolution:
+    values: np.ndarray
+    streams: dict # {stream name: StatePoint}
+    duties: dict # {component name: heat or work into the component [W]}
+    iterations: int
+    residual: float # largest scaled residual
+    converged: bool
+    flash_counts: FlashCounter = field(default_factory=FlashCounter)
+
+    def to_cycle_result(self, inputs=None):
+        # CycleResult of the lines 1 - 8 (outlets of the components) of simple_cycle
+        points = {i: self.streams[str(i)] for i in range(1, 9)}
+        return CycleResult(inputs or CycleInputs(), points, self.duties["generator"], -self.duties["condenser"],
+                           self.duties["absorber"], self.flash_counts)
+
+
+class Network:
+
+    def __init__(self, backend=None):
+        self.backend = get_backend(backend)
+        self.streams = {} # {name: index}
+        self.components = {} # {name: Component}
+        self.counter = FlashCounter()
+        self._flashes = {}
+
+    def add(self, name, component):
+        self.components[name] = component
+        for stream in component.streams:
+            self.streams.setdefault(stream, len(self.streams))
+        return component
+
+    def var(self, stream, kind):
+        return 4 * self.streams[stream] + KINDS.index(kind)
+
+    def value(self, values, stream, *kinds):
+        return tuple(float(values[self.var(stream, kind)]) for kind in kinds)
+
+    @property
+    def size(self):
+        return 4 * len(self.streams)
+
+    def flash(self, pair, value_1, value_2, x):
+        # Backend flash, kept during one Newton iteration (the same state is used by several equations)
+        key = (pair, float(value_1), float(value_2), float(x))
+        if key not in self._flashes:
+            self.counter.add(pair)
+            self._flashes[key] = self.backend.flash(pair, *key[1:])
+        return self._flashes[key]
+
+    def equations(self):
+        equations = [equation for component in self.components.values() for equation in component.equations(self)]
+        if len(equations) != self.size:
+            raise ValueError("The network has " + str(len(equations)) + " equations for " + str(self.size) + " unknowns")
+        return equations
+
+    def residuals(self, values, equations):
+        return np.array([equation.function(values[list(equation.variables)]) / equation.scale for equation in equations])
+
+    def jacobian(self, values, equations):
+        # Sparse Jacobian of the scaled residuals: analytic gradients, or forward differences of the variables of the
+        # equation only
+        from scipy.sparse import csc_matrix
+
+        rows, columns, data = [], [], []
+        for row, equation in enumerate(equations):
+            variables = list(equation.variables)
+            v = values[variables]
+            if equation.gradient is not None:
+                gradient = np.asarray(equation.gradient(v), float)
+            else:
+                f_0 = equation.function(v)
+                gradient = np.empty(len(v))
+                for k, i in enumerate(variables):
+                    kind = KINDS[i % 4]
+                    step = FD_STEP * max(abs(v[k]), SCALES[kind])
+                    if kind == "x" and v[k] + step > 1:
+                        step = -step
+                    perturbed = v.copy()
+                    perturbed[k] += step
+                    gradient[k] = (equation.function(perturbed) - f_0) / step
+            rows.extend([row] * len(variables))
+            columns.extend(variables)
+            data.extend(gradient / equation.scale)
+        return csc_matrix((data, (rows, columns)), shape=(len(equations), self.size))
+
+    def _clip(self, values):
+        values = values.copy()
+        values[1::4] = np.clip(values[1::4], 0.0, 1.0) # x
+        values[2::4] = np.maximum(values[2::4], 1.0) # P
+        return values
+
+    def solve(self, guess, tol=1e-9, maxiter=50):
+        # Newton's method from "guess" ({stream: (m_ponto, x, P, h)} or array of the unknowns) with backtracking.
+        # Returns a NetworkSolution.
+        from scipy.sparse import diags
+        from scipy.sparse.linalg import spsolve
+
+        self.counter = FlashCounter()
+        equations = self.equations()
+        if isinstance(guess, dict):
+            values = np.empty(self.size)
+            for stream, stream_values in guess.items():
+                for kind, value in zip(KINDS, stream_values):
+                    values[self.var(stream, kind)] = value
+        else:
+            values = np.array(guess, float)
+        column_scale = diags(np.tile([SCALES[kind] for kind in KINDS], len(self.streams)))
+
+        self._flashes = {}
+        r = self.residuals(values, equations)
+        norm = np.max(np.abs(r))
+        iteration = 0
+        while not norm < tol and iteration < maxiter:
+            iteration += 1
+            J = self.jacobian(values, equations) @ column_scale
+            step = column_scale @ spsolve(J.tocsc(), -r)
+            if not np.all(np.isfinite(step)):
+                break
+            # Backtracking: the step is cut in half until the residual decreases
+            t = 1.0
+            while t > 1e-3:
+                trial = self._clip(values + t * step)
+                self._flashes = {}
+                try:
+                    r_trial = self.residuals(trial, equations)
+                except (PropertyError, ArithmeticError):
+                    r_trial = np.array([np.inf])
+                if np.max(np.abs(r_trial)) < norm:
+                    break
+                t /= 2
+            else:
+                break
+            values, r, norm = trial, r_trial, np.max(np.abs(r_trial))
+
+        duties = {name: component.duty(self, values) for name, component in self.components.items()}
+        return NetworkSolution(values, self.stream_points(values), {name: duty for name, duty in duties.items() if duty is not None},
+                               iteration, float(norm), bool(norm < tol), self.counter)
+
+    def stream_points(self, values):
+        # StatePoint of each stream; the saturated streams (Quality) keep the given quality and its phase
+        qualities = {c.streams[0]: c.Q for c in self.components.values() if isinstance(c, Quality)}
+        points = {}
+        for stream in self.streams:
+            m, x, P, h = self.value(values, stream, *KINDS)
+            if stream in qualities:
+                point = state_point_from_flash(self.flash("PQ", P, qualities[stream], x), "PQ", qualities[stream], x)
+                point.h = h
+            else:
+                point = state_point_from_flash(self.flash("PH", P, h, x), "PH", h, x)
+            point.m_ponto = m
+            points[stream] = point
+        return points
+
+
+# ==========================================================================
+# "Most Simple" cycle
+# ==========================================================================
+
+# Component after each line of the cycle (where a pipe goes)
+LINE_DESTINATIONS = {1: "pump", 2: "generator", 3: "condenser", 4: "valve_1", 5: "evaporator", 6: "absorber", 7: "valve_2", 8: "absorber"}
+
+
+def simple_cycle(inputs=None, backend=None, pipes=None):
+    # Network of the "Most Simple" cycle and an initial guess.
+    # pipes: {line: {"dP": [Pa], "Q_loss": [W]}} puts a pipe after the component outlet of that line (stream "<line>")
+    # and before the next component (stream "<line>p").
+    if inputs is None:
+        inputs = CycleInputs()
+    pipes = pipes or {}
+    network = Network(backend)
+
+    def inlet(line):
+        return str(line) + "p" if line in pipes else str(line)
+
+    network.add("pump", Pump(inlet(1), "2"))
+    network.add("generator", Generator(inlet(2), "3", "7"))
+    network.add("condenser", HeatExchanger(inlet(3), "4"))
+    network.add("valve_1", Valve(inlet(4), "5"))
+    network.add("evaporator", HeatExchanger(inlet(5), "6", Q=inputs.Q_eva))
+    network.add("valve_2", Valve(inlet(7), "8"))
+    network.add("absorber", Absorber(inlet(6), inlet(8), "1", balances=False))
+    for line, pipe in sorted(pipes.items()):
+        network.add("pipe_" + str(line), Pipe(str(line), inlet(line), pipe.get("dP", 0.0), pipe.get("Q_loss", 0.0)))
+
+    # Specifications (same inputs of solve_cycle)
+    network.add("x_3", Fixed("3", "x", 1.0))
+    network.add("Temp_3", Temperature("3", inputs.Temp_3))
+    network.add("Qu_4", Quality("4", inputs.Qu_4))
+    network.add("Temp_4", SaturationTemperature("4", inputs.Temp_4, inputs.Qu_4))
+    network.add("Qu_6", Quality("6", inputs.Qu_6))
+    network.add("Temp_6", SaturationTemperature("6", inputs.Temp_6, inputs.Qu_6))
+    network.add("Qu_1", Quality("1", inputs.Qu_1))
+    network.add("x_1", Fixed("1", "x", inputs.x_1))
+    network.add("Qu_7", Quality("7", inputs.Qu_7))
+    network.add("Temp_7", SaturationTemperature("7", inputs.Temp_3, inputs.Qu_7))
+
+    return network, simple_cycle_guess(inputs, network.backend, pipes)
+
+
+def simple_cycle_guess(inputs, backend, pipes=()):
+    # Initial guess {stream: (m_ponto, x, P, h)} from the saturated lines 4 and 6 and a rough x_7
+    backend = get_backend(backend)
+    line_4 = backend.flash("TQ", inputs.Temp_4, inputs.Qu_4, 1.0)
+    line_6 = backend.flash("TQ", inputs.Temp_6, inputs.Qu_6, 1.0)
+    P_high, P_low = line_4.P, line_6.P
+    x_1, x_7 = inputs.x_1, 0.7 * inputs.x_1
+    h_3 = backend.flash("PT", P_high, inputs.Temp_3, 1.0).h
+    h_1 = backend.flash("PQ", P_low, inputs.Qu_1, x_1).h
+    h_7 = backend.flash("PQ", P_high, inputs.Qu_7, x_7).h
+    m_3 = inputs.Q_eva / (line_6.h - line_4.h)
+    m_7 = meb.m_ponto_low_outlet_calc_gen(m_3, x_1, 1.0, x_7)
+    m_2 = meb.m_ponto_inlet_calc_gen(m_3, m_7)
+    guess = {"1": (m_2, x_1, P_low, h_1), "2": (m_2, x_1, P_high, h_1), "3": (m_3, 1.0, P_high, h_3),
+             "4": (m_3, 1.0, P_high, line_4.h), "5": (m_3, 1.0, P_low, line_4.h), "6": (m_3, 1.0, P_low, line_6.h),
+             "7": (m_7, x_7, P_high, h_7), "8": (m_7, x_7, P_low, h_7)}
+    for line in pipes:
+        guess[str(line) + "p"] = guess[str(line)]
+    return guess
+
+
+def solve_network_cycle(inputs=None, backend=None, pipes=None, tol=1e-9, maxiter=50):
+    # NetworkSolution of the "Most Simple" cycle (solution.to_cycle_result(inputs) for the same table of solve_cycle)
+    network, guess = simple_cycle(inputs, backend, pipes)
+    return network.solve(guess, tol, maxiter)
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 00:30:00 2026
+
+@author: Wellorzzon Novais
+"""
+
+"""
+Description
+--
+This code has the optimization mode of the cycle: it finds the inputs (by default Temp_3 and x_1, inside bounds)
+with the largest COP = Q_eva / Q_gen, the other inputs being fixed.
+The search is a bounded, batched grid (pattern) search:
+    - each iteration solves a grid of "points" x "points" candidates around the best point so far, all at once with
+      the batch solver (or with a process pool, processes > 1)
+    - the grid moves to the best feasible candidate and shrinks by "shrink" at every iteration, until its half width
+      is smaller than "tol" (relative to the bounds)
+    - candidates already solved are not solved again, and the property backend is cached between iterations
+      (lines 4 and 6 never change, lines 1, 2 and 3 repeat with x_1 and Temp_3); with processes > 1 the workers of
+      one process pool, each with its cached backend, solve all the iterations
+The result has the best operating point, its CycleResult, the history of the iterations and the number of solves.
+
+Running from the src folder:
+    python -m modules.optimizer --backend numpy --Temp_3 340 410 --x_1 0.3 0.6
+"""
+
+"""
+Log
+
+--------------------------------------
+Version 0.0.1
+--
+Introduced the batched grid search of the maximum COP.
+
+--------------------------------------
+Version 0.0.2
+--
+With processes > 1 all the iterations are solved in one sweep.SweepPool with the property cache (cache_size).
+
+--------------------------------------
+"""
+
+from dataclasses import dataclass, field, replace
+
+import numpy as np
+
+from modules.cycle_solver import CycleInputs, CycleResult, solve_cycle
+
+
+# Physical limits of the optimization variables
+DEFAULT_BOUNDS = {
+    "Temp_3": (340.0, 410.0), # [K]
+    "x_1": (0.30, 0.60), # [-]
+}
+
+
+@dataclass
+class OptimizationResult:
+    inputs: CycleInputs # best operating point
+    COP: float
+    result: CycleResult
+    history: list = field(default_factory=list) # one dictionary per iteration
+    solves: int = 0 # cycle solves (candidates)
+    iterations: int = 0
+    converged: bool = False
+    cache_info: tuple = None
+
+
+def evaluate_cop(candidates, backend, pool=None):
+    # COP of each candidate (list of CycleInputs); -inf where the cycle is not feasible.
+    # pool: sweep.SweepPool of the parallel evaluations (kept by the caller), else solved in this process.
+    from modules.batch_solver import inputs_from_list, solve_cycle_batch
+
+    if pool is None:
+        batch = solve_cycle_batch(inputs_from_list(candidates), backend=backend)
+    else:
+        from modules.sweep import run_batch_sweep
+
+        batch = run_batch_sweep(candidates, chunksize=max(len(candidates) // pool.processes, 1), pool=pool)
+    COP = np.asarray(batch.COP, float)
+    return np.where(batch.feasible & np.isfinite(COP) & (batch.Q_gen > 0), COP, -np.inf)
+
+
+def optimize_cop(base=None, bounds=None, backend=None, points=5, shrink=0.5, tol=1e-4, maxiter=50, processes=1,
+                 cache_size=100000):
+    # Maximum COP over the variables of "bounds" ({CycleInputs field: (lower, upper)}), the other inputs from "base".
+    # processes > 1 needs the backend name: all the iterations are solved in one sweep.SweepPool, whose workers keep
+    # their backend and property cache (cache_size) between the iterations.
+    from modules.property_backend import get_backend
+    from modules.property_cache import CachedBackend
+
+    base = base or CycleInputs()
+    bounds = dict(bounds or DEFAULT_BOUNDS)
+    names = list(bounds)
+    lower = np.array([bounds[name][0] for name in names], float)
+    upper = np.array([bounds[name][1] for name in names], float)
+    pool = None
+    if processes == 1:
+        backend = CachedBackend(get_backend(backend), maxsize=cache_size) if cache_size else get_backend(backend)
+    else:
+        from modules.sweep import SweepPool
+
+        pool = SweepPool(backend, processes, cache_size)
+
+    center = (lower + upper) / 2
+    half_width = (upper - lower) / 2
+    evaluated = {} # {tuple of values: COP}
+    best_values, best_cop = tuple(center), -np.inf
+    history = []
+    converged = False
+    iteration = 0
+    try:
+        while iteration < maxiter:
+            iteration += 1
+            axes = [np.clip(c + w * np.linspace(-1, 1, points), lo, hi) for c, w, lo, hi in zip(center, half_width, lower, upper)]
+            grid = {tuple(float(v) for v in values) for values in zip(*(a.ravel() for a in np.meshgrid(*axes, indexing="ij")))}
+            new = sorted(values for values in grid if values not in evaluated)
+            if new:
+                candidates = [replace(base, **dict(zip(names, values))) for values in new]
+                for values, cop in zip(new, evaluate_cop(candidates, backend, pool=pool)):
+                    evaluated[values] = float(cop)
+            values, cop = max(((v, evaluated[v]) for v in grid), key=lambda item: item[1])
+            if cop > best_cop:
+                best_values, best_cop = values, cop
+            history.append({"iteration": iteration, "best": dict(zip(names, best_values)), "COP": best_cop,
+                            "half_width": dict(zip(names, half_width.tolist())), "new_solves": len(new), "solves": len(evaluated)})
+            if np.isfinite(best_cop):
+                center = np.array(best_values)
+            if np.all(half_width <= tol * (upper - lower)):
+                converged = bool(np.isfinite(best_cop))
+                break
+            half_width = half_width * shrink
+    finally:
+        if pool is not None:
+            pool.close()
+
+    if not np.isfinite(best_cop):
+        raise ValueError("No feasible operating point found inside the bounds " + str(bounds))
+    best = replace(base, **dict(zip(names, best_values)))
+    cache_info = backend.cache_info() if hasattr(backend, "cache_info") else None
+    return OptimizationResult(best, best_cop, solve_cycle(best, backend=backend), history, len(evaluated), iteration,
+                              converged, cache_info)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Maximum COP of the ARS cycle over Temp_3 and x_1")
+    parser.add_argument("--backend", default=None, help="property backend (refprop, numpy or table:<file>)")
+    parser.add_argument("--Temp_3", type=float, nargs=2, default=DEFAULT_BOUNDS["Temp_3"], help="bounds [K]")
+    parser.add_argument("--x_1", type=float, nargs=2, default=DEFAULT_BOUNDS["x_1"], help="bounds [-]")
+    parser.add_argument("--points", type=int, default=5, help="grid points per variable at each iteration")
+    parser.add_argument("--processes", type=int, default=1)
+    args = parser.parse_args()
+
+    result = optimize_cop(bounds={"Temp_3": args.Temp_3, "x_1": args.x_1}, backend=args.backend, points=args.points,
+                          processes=args.processes)
+    for step in result.history:
+        print(str(step["iteration"]).rjust(3) + "  COP = " + "{:.6g}".format(step["COP"]) + "  "
+              + "; ".join(name + " = " + "{:.6g}".format(value) for name, value in step["best"].items())
+              + "  (" + str(step["solves"]) + " solves)")
+    print("Best: Temp_3 = " + "{:.6g}".format(result.inputs.Temp_3) + " K; x_1 = " + "{:.6g}".format(result.inputs.x_1)
+          + "; COP = " + "{:.6g}".format(result.COP) + " (" + str(result.solves) + " solves, " + str(result.iterations) + " iterations)")
+    print(result.result.table())
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 12:00:00 2026
+
+@author: Wellorzzon Novais
+"""
+
+"""
+Description
+--
+This code has the thermodynamic property backends used by the cycle solver.
+A backend solves "Ammonia * Water" at a given ammonia mass fraction x for the input pairs used in the cycle:
+    - TQ (temperature and vapor quality)
+    - PT (pressure and temperature)
+    - PQ (pressure and vapor quality)
+    - PH (pressure and specific enthalpy)
+    - PS (pressure and specific entropy)
+and always returns T, P, h, s and the vapor quality Q (FlashResult), using SI mass base units.
+
+Implemented backends:
+    - "refprop": RefProp v10 through ctREFPROP (path from the environment variable RPPREFIX)
+    - "numpy": simplified ammonia-water correlation in pure NumPy (modules/ammonia_water_numpy.py), vectorized and
+      without license, for CI and compute nodes
+
+    - "table:<file>": precomputed tables of one of the backends above (modules/property_tables.py)
+
+The default backend is taken from the environment variable ARS_PROPERTY_BACKEND ("refprop" if not defined).
+"""
+
+"""
+Log
+
+--------------------------------------
+Version 0.0.1
+--
+Moved the RefProp configuration from cycle_solver.py to RefpropBackend and created the backend interface.
+
+--------------------------------------
+Version 0.0.2
+--
+Added "fluid_hash" to the backends (used by the persistent cache in disk_cache.py).
+
+--------------------------------------
+Version 0.0.3
+--
+Added the "table:<file>" backends (property_tables.py).
+
+--------------------------------------
+Version 0.0.4
+--
+Added "x_range" (ammonia mass fractions the backend can flash) to the backends.
+
+--------------------------------------
+"""
+
+import os
+from typing import NamedTuple
+
+from modules.state_point import PAIRS
+
+
+FLUID = "Ammonia * Water"
+
+# This path is suitable for the developer's computer. It can be overwritten
+# by the environment variable RPPREFIX.
+RPPREFIX_DEFAULT = r'/home/viagempocket/REFPROP_v10'
+
+
+class PropertyError(ValueError):
+    # The backend could not solve the state (RefProp ierr != 0, or out of the correlation range)
+    pass
+
+
+class FlashResult(NamedTuple):
+    # Floats for "flash" and NumPy arrays for "flash_many"
+    T: float # [K]
+    P: float # [Pa]
+    h: float # [J/kg]
+    s: float # [J/(kg.K)]
+    Q: float # [-] (< 0 subcooled, > 1 superheated)
+
+
+class PropertyBackend:
+    # Interface of a property backend (see the module description)
+    name = "base"
+    version = "0"
+    fluid = FLUID
+    # Ammonia mass fractions the backend can flash (e.g. the x axis of the property tables)
+    x_range = (0.0, 1.0)
+
+    def load(self):
+        # Loads libraries/files of the backend (called before the first flash, or before reading "version")
+        return None
+
+    def flash(self, pair, value_1, value_2, x):
+        # One state: "pair" in PAIRS, (value_1, value_2) in the same order of the pair, x = ammonia mass fraction
+        raise NotImplementedError
+
+    def flash_many(self, pair, value_1, value_2, x):
+        # Many states at once (arrays that broadcast together). This default just loops over "flash";
+        # NaN is returned where a state could not be solved.
+        import numpy as np
+
+        value_1, value_2, x = np.broadcast_arrays(np.asarray(value_1, float), np.asarray(value_2, float), np.asarray(x, float))
+        out = np.full((5,) + x.shape, np.nan)
+        for index in np.ndindex(x.shape):
+            try:
+                out[(slice(None),) + index] = self.flash(pair, float(value_1[index]), float(value_2[index]), float(x[index]))
+            except PropertyError:
+                pass
+        return FlashResult(*out)
+
+    def fluid_hash(self):
+        # Hash of the fluid files (or model constants) used by the backend, to invalidate persistent caches
+        return ""
+
+    @staticmethod
+    def check_pair(pair):
+        if pair not in PAIRS:
+            raise PropertyError("Input pair " + repr(pair) + " is not one of " + ", ".join(PAIRS))
+
+
+class RefpropBackend(PropertyBackend):
+    # RefProp v10 (https://refprop-docs.readthedocs.io/en/latest/DLL/high_level.html#f/_/REFPROPdll)
+    # The DLL is loaded on the first flash, not on instantiation.
+    name = "refprop"
+
+    def __init__(self, prefix=None):
+        self.prefix = prefix
+        self.RP = None
+        self.MASS_BASE_SI = None
+
+    def load(self):
+        if self.RP is None:
+            from ctREFPROP.ctREFPROP import REFPROPFunctionLibrary
+
+            if self.prefix is None:
+                self.prefix = os.environ.get('RPPREFIX', RPPREFIX_DEFAULT)
+            RP = REFPROPFunctionLibrary(self.prefix)
+            RP.SETPATHdll(self.prefix)
+            self.MASS_BASE_SI = RP.GETENUMdll(0, "MASS BASE SI").iEnum
+            self.version = RP.RPVersion()
+            self.RP = RP
+        return self.RP
+
+    def flash(self, pair, value_1, value_2, x):
+        self.check_pair(pair)
+        RP = self.load()
+        ocalc = RP.REFPROPdll(self.fluid, pair, "T;P;H;S", self.MASS_BASE_SI, 1, 0, value_1, value_2, [x, 1 - x])
+        if ocalc.ierr != 0:
+            raise PropertyError(ocalc.herr)
+        T, P, h, s = ocalc.Output[0:4]
+        return FlashResult(T, P, h, s, ocalc.q)
+
+    def fluid_hash(self):
+        # sha256 of the ammonia and water fluid files and of the mixing rules used by RefProp
+        import hashlib
+
+        if self.prefix is None:
+            self.prefix = os.environ.get('RPPREFIX', RPPREFIX_DEFAULT)
+        sha = hashlib.sha256()
+        for name in (os.path.join('FLUIDS', 'AMMONIA.FLD'), os.path.join('FLUIDS', 'WATER.FLD'), os.path.join('MIXTURES', 'HMX.BNC')):
+            path = os.path.join(self.prefix, name)
+            if os.path.exists(path):
+                with open(path, 'rb') as file:
+                    sha.update(file.read())
+        return sha.hexdigest()
+
+
+# ==========================================================================
+# Backend registry (one instance per name and per process)
+# ==========================================================================
+
+def _numpy_backend():
+    from modules.ammonia_water_numpy import NumpyAmmoniaWaterBackend
+    return NumpyAmmoniaWaterBackend()
+
+
+BACKEND_FACTORIES = {
+    "refprop": RefpropBackend,
+    "numpy": _numpy_backend,
+}
+
+_BACKENDS = {}
+
+
+def default_backend_name():
+    return os.environ.get('ARS_PROPERTY_BACKEND', "refprop")
+
+
+def get_backend(name=None):
+    # Returns the backend instance of this process, creating it only the first time
+    if isinstance(name, PropertyBackend):
+        return name
+    if name is None:
+        name = default_backend_name()
+    if name not in _BACKENDS and name.startswith("table:"):
+        from modules.property_tables import TableBackend
+        _BACKENDS[name] = TableBackend(name[len("table:"):])
+    if name not in _BACKENDS:
+        if name not in BACKEND_FACTORIES:
+            raise PropertyError("Unknown property backend " + repr(name) + " (available: " + ", ".join(BACKEND_FACTORIES) + ")")
+        _BACKENDS[name] = BACKEND_FACTORIES[name]()
+    return _BACKENDS[name]
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 14:00:00 2026
+
+@author: Wellorzzon Novais
+"""
+
+"""
+Description
+--
+This code has a memoizing layer in front of a property backend (modules/property_backend.py).
+Each flash is stored with the key (fluid, input pair, value_1, value_2, x), so states that do not change between
+solves (for example lines 4 and 6, that only depend on Temp_4 and Temp_6) are taken from memory instead of
+calling RefProp again.
+    - maxsize: number of states kept (least recently used ones are dropped)
+    - digits: optional number of significant digits used to round the inputs of the key (quantization)
+    - cache_info(): hits, misses, evictions, maxsize and current size
+"""
+
+"""
+Log
+
+--------------------------------------
+Version 0.0.1
+--
+Introduced CachedBackend with LRU eviction, key quantization and statistics.
+
+--------------------------------------
+"""
+
+from collections import OrderedDict
+from typing import NamedTuple
+
+from modules.property_backend import FlashResult, PropertyBackend, get_backend
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: int
+    currsize: int
+
+
+def quantize(value, digits=None):
+    # Rounds value to "digits" significant digits (no rounding with digits=None)
+    if digits is None:
+        return float(value)
+    return float('%.*g' % (digits, value))
+
+
+class CachedBackend(PropertyBackend):
+
+    def __init__(self, backend=None, maxsize=100000, digits=None):
+        self.backend = get_backend(backend)
+        self.maxsize = maxsize
+        self.digits = digits
+        self.store = OrderedDict()
+        self.hits = self.misses = self.evictions = 0
+
+    @property
+    def name(self):
+        return self.backend.name
+
+    @property
+    def version(self):
+        return self.backend.version
+
+    @property
+    def fluid(self):
+        return self.backend.fluid
+
+    @property
+    def x_range(self):
+        return self.backend.x_range
+
+    def load(self):
+        return self.backend.load()
+
+    def fluid_hash(self):
+        return self.backend.fluid_hash()
+
+    def key(self, pair, value_1, value_2, x):
+        return (self.fluid, pair, quantize(value_1, self.digits), quantize(value_2, self.digits), quantize(x, self.digits))
+
+    def get(self, key):
+        # Cached FlashResult or None (the entry becomes the most recently used one)
+        result = self.store.get(key)
+        if result is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self.store.move_to_end(key)
+        return result
+
+    def put(self, key, result):
+        self.store[key] = result
+        self.store.move_to_end(key)
+        while len(self.store) > self.maxsize:
+            self.store.popitem(last=False)
+            self.evictions += 1
+
+    def flash(self, pair, value_1, value_2, x):
+        key = self.key(pair, value_1, value_2, x)
+        result = self.get(key)
+        if result is None:
+            # With quantization, the backend is called with the rounded inputs, so a key always has one result
+            result = self.backend.flash(pair, *key[2:])
+            self.put(key, result)
+        return result
+
+    def flash_many(self, pair, value_1, value_2, x):
+        # Looks up every state and solves the missing (unique) ones with one call to the backend
+        import numpy as np
+
+        value_1, value_2, x = np.broadcast_arrays(np.asarray(value_1, float), np.asarray(value_2, float), np.asarray(x, float))
+        out = np.empty((5,) + x.shape)
+        missing = {}
+        for index in np.ndindex(x.shape):
+            key = self.key(pair, value_1[index], value_2[index], x[index])
+            result = self.get(key)
+            if result is None:
+                missing.setdefault(key, []).append(index)
+            else:
+                out[(slice(None),) + index] = result
+        if missing:
+            keys = list(missing)
+            inputs = np.array([key[2:] for key in keys])
+            solved = self.backend.flash_many(pair, inputs[:, 0], inputs[:, 1], inputs[:, 2])
+            for i, key in enumerate(keys):
+                result = FlashResult(*(float(column[i]) for column in solved))
+                if all(value == value for value in result):
+                    self.put(key, result)
+                for index in missing[key]:
+                    out[(slice(None),) + index] = result
+        return FlashResult(*out)
+
+    def cache_info(self):
+        return CacheInfo(self.hits, self.misses, self.evictions, self.maxsize, len(self.store))
+
+    def cache_clear(self):
+        self.store.clear()
+        self.hits = self.misses = self.evictions = 0
+
+
+_CACHED_BACKENDS = {}
+
+
+def get_cached_backend(name=None, maxsize=100000, digits=None):
+    # One CachedBackend per (backend, maxsize, digits) and per process
+    if isinstance(name, PropertyBackend):
+        return CachedBackend(name, maxsize, digits)
+    key = (name, maxsize, digits)
+    if key not in _CACHED_BACKENDS:
+        _CACHED_BACKENDS[key] = CachedBackend(name, maxsize, digits)
+    return _CACHED_BACKENDS[key]
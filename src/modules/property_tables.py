@@ -0,0 +1,488 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 16:30:00 2026
+
+@author: Wellorzzon Novais
+"""
+
+"""
+Description
+--
+This code has precomputed property tables, used as a fast surrogate backend ("table") of a property backend.
+    - "build_tables" samples the backend once, with grids built per phase, so no interpolation crosses the saturation
+      curves (where the properties have kinks):
+        PQ -> T, h, s, Q: two-phase grid (P, zeta, x); TQ -> P, h, s, Q: two-phase grid (T, zeta, x). The two-phase
+        coordinate zeta is the mean of Q and of the normalized T (PQ) or log(P) (TQ) between the bubble and dew
+        points: near pure ammonia T(Q) is very steep close to Q = 1 (dew point), so neither Q nor T is a good grid
+        coordinate alone, while both change by a bounded amount per zeta step. The nodes come from a dense sampling
+        of each column in Q (SATURATION_SAMPLES) and the Q of a state is found on the Q column of the grid.
+        Zeta = 0 and 1 are the bubble and dew curves.
+        PT -> h, s, PH -> T, s and PS -> T, h: liquid and vapor grids (P, region coordinate, x). The region
+        coordinate goes from -1 to 0 in the liquid (from the start of the axis, or a margin below the bubble point,
+        up to the bubble point) and from 1 to 2 in the vapor (from the dew point up to the end of the axis, or a
+        margin above it), so the nodes 0 and 1 are on the saturation curves of the PQ grid.
+    - The phase comes from the position of T, h or s against the bubble and dew points (PQ grid at P and x); in the
+      two-phase region zeta is found on the column of T, h or s of the PQ grid, where the other outputs are
+      interpolated
+    - The x axis is denser near its ends ("ends" spacing: cos spacing plus geometric steps from 1e-6 to 2e-2 away
+      from 0 and 1): the dew curve of nearly pure ammonia changes sharply within 1e-3 of x = 1
+    - TableBackend interpolates the grids linearly by default (scipy RegularGridInterpolator); other methods (e.g.
+      "cubic") are only applied inside each phase
+    - The grids are saved in a compact binary file (compressed NumPy .npz, float32), with the error of each table
+      against the exact backend on random points of the envelope (a part of them with x close to 0 and 1; max, mean
+      and 99th percentile of the absolute error, max relative error and the fraction of points with another phase)
+    - The errors are checked against an error bound (DEFAULT_MAX_ERRORS, or "max_errors" of build_tables). The
+      outputs above it are saved with the tables, the command line reports them (exit code 1) and TableBackend does
+      not accept those tables (unless strict=False)
+
+The default envelope covers x from 0 to 1, P from 0.05 to 3 MPa, T from 240 to 410 K and the default ranges of h and
+s. The largest errors are on the dew curve of the nearly pure fluids (x close to 0 or 1).
+Outside of the tables, the result is NaN and "flash" raises PropertyError.
+
+Usage, running from the src folder:
+    python -m modules.property_tables build tables.npz --backend numpy
+    python -m modules.property_tables info tables.npz
+and then solve_cycle(inputs, backend="table:tables.npz").
+"""
+
+"""
+Log
+
+--------------------------------------
+Version 0.0.1
+--
+Introduced the table generator, file format and TableBackend.
+
+--------------------------------------
+Version 0.0.2
+--
+Grids built per phase (two-phase PQ and TQ grids on the zeta coordinate; liquid and vapor grids of PT, PH and PS on
+a coordinate fitted to the saturation curves), linear interpolation by default, x axis from 0 to 1 refined near its
+ends and error bound of the tables.
+File version 2.
+
+--------------------------------------
+Version 0.0.3
+--
+The name of TableBackend is its get_backend spec ("table:<file>"); the sampled backend is in "source".
+
+--------------------------------------
+"""
+
+import json
+
+import numpy as np
+
+from modules.property_backend import FlashResult, PropertyBackend, PropertyError, get_backend
+
+
+FILE_VERSION = 2
+
+# Points of each phase (liquid and vapor) of the single-phase grids
+PHASE_POINTS = 17
+
+# Samples in Q of each column of the two-phase grids (interpolated to the zeta nodes)
+SATURATION_SAMPLES = 201
+
+# Geometric steps of the "ends" spacing: distance from the ends of the axis (fraction of its range) and points
+END_STEPS = (1.0e-6, 2.0e-2, 16)
+
+# Grid of each input: (name, start, stop, number of points, spacing)
+# "cos" is denser near the ends, "ends" adds the geometric END_STEPS to it; "phase" is the region coordinate of the
+# single-phase grids (PHASE_POINTS per phase); "zeta" is the two-phase coordinate of the PQ and TQ grids
+DEFAULT_AXES = {
+    "T": ("T", 240.0, 410.0, 86, "lin"), # [K]
+    "P": ("P", 5.0e4, 3.0e6, 48, "log"), # [Pa]
+    "zeta": ("zeta", 0.0, 1.0, 33, "cos"), # [-]
+    "h": ("h", -2.0e5, 2.1e6, PHASE_POINTS, "phase"), # [J/kg]
+    "s": ("s", 0.0, 7500.0, PHASE_POINTS, "phase"), # [J/(kg.K)]
+    "x": ("x", 0.0, 1.0, 61, "ends"), # [-]
+}
+
+OUTPUT_NAMES = ("T", "P", "h", "s", "Q")
+
+# Names of the inputs of each pair (letters of the pair in RefProp)
+PAIR_INPUTS = {"TQ": ("T", "Q"), "PT": ("P", "T"), "PQ": ("P", "Q"), "PH": ("P", "h"), "PS": ("P", "s")}
+
+# Pairs with liquid and vapor grids (their two-phase states come from the PQ grid) and pairs with two-phase grids
+PHASE_PAIRS = ("PT", "PH", "PS")
+TWO_PHASE_PAIRS = ("TQ", "PQ")
+
+# Margin of the single-phase grids beyond the saturation curves when they are outside of the axis (fraction of the
+# axis range), so the liquid and vapor grids never have zero width
+PHASE_MARGIN = 0.05
+
+Q_SUBCOOLED, Q_SUPERHEATED = -998.0, 998.0
+
+# Error bound of the tables on the check points: max absolute error of T [K], h [J/kg], s [J/(kg.K)] and Q [-] (two-
+# phase), max relative error of P [-] and fraction of points with another phase. The largest errors of the default
+# tables are P of TQ on the dew curve close to x = 1 (about 4%) and h, s and Q of PT in the two-phase region of the
+# nearly pure fluids, where Q changes sharply with T.
+DEFAULT_MAX_ERRORS = {"T": 2.0, "P": 0.05, "h": 2.5e4, "s": 80.0, "Q": 0.02, "phase_mismatch": 0.002}
+
+
+def axis_values(axis):
+    name, start, stop, num, spacing = axis
+    if spacing == "log":
+        return np.geomspace(start, stop, num)
+    if spacing in ("cos", "ends"):
+        values = (1 - np.cos(np.pi * np.linspace(0, 1, num))) / 2
+        if spacing == "ends":
+            steps = np.geomspace(*END_STEPS)
+            values = np.unique(np.concatenate([values, steps, 1 - steps]))
+        return start + (stop - start) * values
+    if spacing == "phase":
+        return np.concatenate([np.linspace(-1, 0, num), np.linspace(1, 2, num)])
+    return np.linspace(start, stop, num)
+
+
+def axis_coordinates(axis, values):
+    # Coordinates of the interpolation (log of the values on "log" axes)
+    return np.log(values) if axis[4] == "log" else np.asarray(values, float)
+
+
+def phase_axis(axis):
+    # Region coordinate axis of the single-phase grids, with the range of "axis"
+    name, start, stop, num, spacing = axis
+    return tuple(axis) if spacing == "phase" else (name, start, stop, PHASE_POINTS, "phase")
+
+
+def table_outputs(pair):
+    # Outputs stored for each pair: the two-phase grids store Q (on the zeta axis), the others not the inputs nor Q
+    if pair in TWO_PHASE_PAIRS:
+        return tuple(name for name in OUTPUT_NAMES if name != PAIR_INPUTS[pair][0])
+    return tuple(name for name in OUTPUT_NAMES if name not in PAIR_INPUTS[pair] and name != "Q")
+
+
+def _region_limits(bubble, dew, axis):
+    # Lowest liquid and highest vapor values of the single-phase grids at each (P, x)
+    margin = PHASE_MARGIN * (axis[2] - axis[1])
+    return np.minimum(axis[1], bubble - margin), np.maximum(axis[2], dew + margin)
+
+
+def region_value(coordinate, bubble, dew, axis):
+    # T, h or s of a region coordinate (-1 ... 0: liquid, 1 ... 2: vapor)
+    low, high = _region_limits(bubble, dew, axis)
+    return np.where(coordinate <= 0, bubble + coordinate * (bubble - low), dew + (coordinate - 1) * (high - dew))
+
+
+def region_coordinate(value, bubble, dew, axis):
+    # Region coordinate of T, h or s (inverse of region_value)
+    low, high = _region_limits(bubble, dew, axis)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(value <= bubble, (value - bubble) / (bubble - low), 1 + (value - dew) / (high - dew))
+
+
+def _invert_columns(columns, values, nodes):
+    # Position (on "nodes") of each value in its row of "columns" (increasing), linear between the nodes
+    k = np.clip(np.sum(columns < values[:, None], axis=1) - 1, 0, len(nodes) - 2)
+    rows = np.arange(len(values))
+    low, high = columns[rows, k], columns[rows, k + 1]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        fraction = np.clip(np.where(high > low, (values - low) / (high - low), 0.0), 0, 1)
+    return np.where(np.isfinite(low) & np.isfinite(high), nodes[k] + fraction * (nodes[k + 1] - nodes[k]), np.nan)
+
+
+def _sample_two_phase(backend, pair, value_1, zeta, x):
+    # Two-phase grid (value_1, zeta, x) of TQ or PQ: each column is sampled in Q and interpolated to the zeta nodes
+    samples = axis_values(("Q", 0.0, 1.0, SATURATION_SAMPLES, "cos"))
+    value_1, Q, x = np.meshgrid(value_1, samples, x, indexing="ij")
+    result = backend.flash_many(pair, value_1, Q, x)._asdict()
+    # Normalized T (PQ) or log(P) (TQ; decreasing with Q) between the bubble and dew points; Q for pure fluids
+    coordinate = result["T"] if pair == "PQ" else -np.log(result["P"])
+    span = coordinate[:, -1:, :] - coordinate[:, :1, :]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        normalized = np.where(span > 1e-9 * np.abs(coordinate[:, :1, :]), (coordinate - coordinate[:, :1, :]) / span, Q)
+    column_zeta = np.maximum.accumulate((normalized + Q) / 2, axis=1)
+    grid = {name: np.full((value_1.shape[0], len(zeta), value_1.shape[2]), np.nan) for name in table_outputs(pair)}
+    for i in range(value_1.shape[0]):
+        for k in range(value_1.shape[2]):
+            if not np.all(np.isfinite(column_zeta[i, :, k])):
+                continue
+            for name in grid:
+                column = np.log(result[name][i, :, k]) if name == "P" else result[name][i, :, k]
+                grid[name][i, :, k] = np.interp(zeta, column_zeta[i, :, k], column)
+    if "P" in grid:
+        grid["P"] = np.exp(grid["P"])
+    return grid
+
+
+def _sample_single_phase(backend, pair, P, coordinate, x, saturation, axis):
+    # Liquid and vapor grids of a pair of PHASE_PAIRS. The nodes on the saturation curves (coordinates 0 and 1) are the
+    # states of the PQ grid: a flash exactly on the curve can fall on either side of it.
+    bubble, dew = saturation[PAIR_INPUTS[pair][1]][:, :1, :], saturation[PAIR_INPUTS[pair][1]][:, -1:, :]
+    result = backend.flash_many(pair, P, region_value(coordinate, bubble, dew, axis), x)._asdict()
+    n = axis[3]
+    for name in table_outputs(pair):
+        result[name][:, n - 1, :] = saturation[name][:, 0, :]
+        result[name][:, n, :] = saturation[name][:, -1, :]
+    return result
+
+
+def build_tables(backend=None, pairs=("TQ", "PQ", "PT", "PH", "PS"), axes=None, n_check=2000, seed=0, method="linear",
+                 max_errors=None):
+    # Samples the backend on the grids of each pair. Returns a dictionary that can be saved with "save_tables".
+    # The pairs of PHASE_PAIRS need the PQ grid (added when missing). The errors on "n_check" random points per pair
+    # are checked against "max_errors" (DEFAULT_MAX_ERRORS by default); the outputs above it are in "violations".
+    backend = get_backend(backend)
+    backend.load()
+    axes = dict(DEFAULT_AXES, **(axes or {}))
+    pairs = list(pairs)
+    if "PQ" not in pairs and any(pair in PHASE_PAIRS for pair in pairs):
+        pairs.append("PQ")
+    pairs.sort(key=lambda pair: pair != "PQ")
+    tables = {"file_version": FILE_VERSION, "backend": backend.name, "backend_version": str(backend.version),
+              "fluid": backend.fluid, "fluid_hash": backend.fluid_hash(), "method": method, "axes": {}, "grids": {},
+              "errors": {}, "max_errors": dict(DEFAULT_MAX_ERRORS if max_errors is None else max_errors), "violations": []}
+    for pair in pairs:
+        name_1, name_2 = PAIR_INPUTS[pair]
+        pair_axes = (axes[name_1], axes["zeta"] if pair in TWO_PHASE_PAIRS else phase_axis(axes[name_2]), axes["x"])
+        if pair in TWO_PHASE_PAIRS:
+            result = _sample_two_phase(backend, pair, *(axis_values(axis) for axis in pair_axes))
+        else:
+            value_1, value_2, x = np.meshgrid(*(axis_values(axis) for axis in pair_axes), indexing="ij")
+            result = _sample_single_phase(backend, pair, value_1, value_2, x, tables["grids"]["PQ"], pair_axes[1])
+        tables["axes"][pair] = [list(axis) for axis in pair_axes]
+        tables["grids"][pair] = {name: np.asarray(result[name], float).astype(np.float32) for name in table_outputs(pair)}
+
+    # Error against the exact backend on random points inside the grid
+    if n_check:
+        rng = np.random.default_rng(seed)
+        table = TableBackend(tables, strict=False)
+        for pair in pairs:
+            check = [rng.uniform(axis[1], axis[2], n_check) for axis in tables["axes"][pair]]
+            if pair[0] == "P":
+                check[0] = np.exp(rng.uniform(np.log(axes["P"][1]), np.log(axes["P"][2]), n_check))
+            if pair in TWO_PHASE_PAIRS:
+                # Half of the points saturated (Q = 0 or 1), as in the cycle
+                check[1] = np.where(rng.uniform(size=n_check) < 0.5, rng.integers(0, 2, n_check), rng.uniform(size=n_check))
+            # A fifth of the points within END_STEPS of the ends of x (nearly pure fluids)
+            low, high = tables["axes"][pair][2][1:3]
+            near = (high - low) * np.exp(rng.uniform(*np.log(END_STEPS[:2]), n_check))
+            end = rng.uniform(size=n_check)
+            check[2] = np.where(end < 0.1, low + near, np.where(end < 0.2, high - near, check[2]))
+            tables["errors"][pair] = table_errors(pair, backend.flash_many(pair, *check), table.flash_many(pair, *check))
+        tables["violations"] = error_violations(tables["errors"], tables["max_errors"])
+    return tables
+
+
+def table_errors(pair, exact, table):
+    # Error of the table outputs against the exact backend (only where both are finite)
+    from modules.state_point import phase_code_from_quality
+
+    errors = {}
+    ok = np.all(np.isfinite(exact), axis=0) & np.all(np.isfinite(table), axis=0)
+    for name in OUTPUT_NAMES:
+        if name in PAIR_INPUTS[pair]:
+            continue
+        e, t = getattr(exact, name)[ok], getattr(table, name)[ok]
+        if name == "Q":
+            phase_e = np.array([phase_code_from_quality(value) for value in e])
+            phase_t = np.array([phase_code_from_quality(value) for value in t])
+            two_phase = (e >= 0) & (e <= 1) & (t >= 0) & (t <= 1)
+            errors["phase_mismatch"] = float(np.mean(phase_e != phase_t)) if e.size else float('nan')
+            e, t = e[two_phase], t[two_phase]
+        diff = np.abs(t - e)
+        errors[name] = {
+            "max_abs": float(diff.max()) if diff.size else float('nan'),
+            "mean_abs": float(diff.mean()) if diff.size else float('nan'),
+            "p99_abs": float(np.percentile(diff, 99)) if diff.size else float('nan'),
+            "max_rel": float((diff / np.maximum(np.abs(e), 1e-12)).max()) if diff.size else float('nan'),
+        }
+    errors["points"] = int(ok.sum())
+    return errors
+
+
+def error_violations(errors, max_errors):
+    # Errors above the bound, as text ("PQ T max 12.3 > 10")
+    violations = []
+    for pair, table in errors.items():
+        for name, bound in max_errors.items():
+            if name == "phase_mismatch":
+                value = table.get(name, float('nan'))
+            elif name in table:
+                value = table[name]["max_rel" if name == "P" else "max_abs"]
+            else:
+                continue
+            if value > bound:
+                violations.append(pair + " " + name + " max " + "{:.3g}".format(value) + " > " + "{:.3g}".format(bound))
+    return violations
+
+
+def save_tables(tables, path):
+    arrays = {}
+    for pair, grid in tables["grids"].items():
+        for name, values in grid.items():
+            arrays[pair + "/" + name] = values
+    meta = {key: value for key, value in tables.items() if key != "grids"}
+    np.savez_compressed(path, meta=np.array(json.dumps(meta)), **arrays)
+
+
+def load_tables(path):
+    with np.load(path) as data:
+        tables = json.loads(str(data["meta"]))
+        if tables.get("file_version") != FILE_VERSION:
+            raise PropertyError("Property table file " + str(path) + " has version " + str(tables.get("file_version")) + ", expected " + str(FILE_VERSION))
+        tables["grids"] = {}
+        for key in data.files:
+            if key != "meta":
+                pair, name = key.split("/")
+                tables["grids"].setdefault(pair, {})[name] = data[key]
+    return tables
+
+
+class TableBackend(PropertyBackend):
+
+    def __init__(self, tables, method=None, strict=True):
+        # tables: file (name "table:<file>", the get_backend spec of the tables) or dictionary of build_tables
+        # (name "table"); "source" is the backend sampled by build_tables
+        self.path = None if isinstance(tables, dict) else str(tables)
+        if self.path is not None:
+            tables = load_tables(self.path)
+        if strict and tables.get("violations"):
+            raise PropertyError("The property tables are above their error bound (" + "; ".join(tables["violations"])
+                                + "): rebuild them with denser axes, or use strict=False")
+        self.tables = tables
+        self.method = method or tables.get("method", "linear")
+        self.name = "table" if self.path is None else "table:" + self.path
+        self.source = tables["backend"]
+        self.version = self.source + " " + tables["backend_version"] + "/" + str(tables["file_version"])
+        self.fluid = tables["fluid"]
+        # Compositions covered by the x axis of every pair
+        x_axes = [axes[-1] for axes in tables["axes"].values()]
+        self.x_range = (max(axis[1] for axis in x_axes), min(axis[2] for axis in x_axes))
+        self._interpolators = {}
+
+    def fluid_hash(self):
+        return self.tables["fluid_hash"]
+
+    @property
+    def errors(self):
+        return self.tables["errors"]
+
+    def interpolator(self, pair, region=None):
+        # One interpolator per grid for all the outputs (log(P) is used as coordinate and output).
+        # region: "liquid" or "vapor" part of the grids of PHASE_PAIRS.
+        if (pair, region) not in self._interpolators:
+            from scipy.interpolate import RegularGridInterpolator
+
+            axes = self.tables["axes"][pair]
+            points = [axis_coordinates(axis, axis_values(axis)) for axis in axes]
+            grid = self.tables["grids"][pair]
+            values = np.stack([np.log(np.asarray(grid[name], float)) if name == "P" else np.asarray(grid[name], float) for name in table_outputs(pair)], axis=-1)
+            if region is not None:
+                part = slice(0, axes[1][3]) if region == "liquid" else slice(axes[1][3], None)
+                points[1], values = points[1][part], values[:, part]
+            method = self.method if all(len(p) >= 4 for p in points) else "linear"
+            self._interpolators[(pair, region)] = RegularGridInterpolator(points, values, method=method, bounds_error=False, fill_value=np.nan)
+        return self._interpolators[(pair, region)]
+
+    def columns(self, pair, name, value_1, x):
+        # Column of "name" along the zeta axis of a two-phase grid at (value_1, x), shape (n, zeta points)
+        if (pair, name) not in self._interpolators:
+            from scipy.interpolate import RegularGridInterpolator
+
+            axes = self.tables["axes"][pair]
+            columns = np.moveaxis(np.asarray(self.tables["grids"][pair][name], float), 1, -1)
+            self._interpolators[(pair, name)] = RegularGridInterpolator(
+                (axis_coordinates(axes[0], axis_values(axes[0])), axis_values(axes[2])), columns, bounds_error=False, fill_value=np.nan)
+        return self._interpolators[(pair, name)](np.stack([axis_coordinates(self.tables["axes"][pair][0], value_1), x], axis=-1))
+
+    def _interpolate(self, pair, region, value_1, value_2, x):
+        axes = self.tables["axes"][pair]
+        points = np.stack([axis_coordinates(axes[0], value_1), axis_coordinates(axes[1], value_2), x], axis=-1)
+        values = self.interpolator(pair, region)(points)
+        result = dict(zip(table_outputs(pair), np.moveaxis(values, -1, 0)))
+        if "P" in result:
+            result["P"] = np.exp(result["P"])
+        return result
+
+    def _two_phase(self, pair, value_1, Q, x):
+        # States of the two-phase grids, at the zeta of Q on its column
+        zeta = _invert_columns(self.columns(pair, "Q", value_1, x), Q, axis_values(self.tables["axes"][pair][1]))
+        result = self._interpolate(pair, None, value_1, zeta, x)
+        result["Q"] = np.where(np.isfinite(zeta), Q, np.nan)
+        return result
+
+    def _single_phase(self, pair, P, value, x):
+        # Liquid and vapor from their grids; two-phase from the PQ grid, at the zeta of "value" on its column
+        name = PAIR_INPUTS[pair][1]
+        columns = self.columns("PQ", name, P, x)
+        bubble, dew = columns[:, 0], columns[:, -1]
+        liquid, vapor = value <= bubble, value >= dew
+        coordinate = region_coordinate(value, bubble, dew, self.tables["axes"][pair][1])
+        result = {output: np.full(P.shape, np.nan) for output in table_outputs(pair)}
+        Q = np.full(P.shape, np.nan)
+        for region, rows, quality in (("liquid", liquid, Q_SUBCOOLED), ("vapor", vapor & ~liquid, Q_SUPERHEATED)):
+            if rows.any():
+                for output, values in self._interpolate(pair, region, P[rows], coordinate[rows], x[rows]).items():
+                    result[output][rows] = values
+                Q[rows] = quality
+        rows = ~liquid & ~vapor & np.isfinite(bubble) & np.isfinite(dew)
+        if rows.any():
+            zeta = _invert_columns(columns[rows], value[rows], axis_values(self.tables["axes"]["PQ"][1]))
+            saturated = self._interpolate("PQ", None, P[rows], zeta, x[rows])
+            for output in table_outputs(pair):
+                result[output][rows] = saturated[output]
+            Q[rows] = saturated["Q"]
+        return result, Q
+
+    def flash_many(self, pair, value_1, value_2, x):
+        self.check_pair(pair)
+        value_1, value_2, x = np.broadcast_arrays(np.asarray(value_1, float), np.asarray(value_2, float), np.asarray(x, float))
+        if pair not in self.tables["grids"] or (pair in PHASE_PAIRS and "PQ" not in self.tables["grids"]):
+            raise PropertyError("Input pair " + pair + " is not in the property tables")
+        shape = x.shape
+        value_1, value_2, x = value_1.ravel(), value_2.ravel(), x.ravel()
+        with np.errstate(invalid='ignore', divide='ignore'):
+            if pair in PHASE_PAIRS:
+                result, Q = self._single_phase(pair, value_1, value_2, x)
+            else:
+                result = self._two_phase(pair, value_1, value_2, x)
+                Q = result.pop("Q")
+        name_1, name_2 = PAIR_INPUTS[pair]
+        result[name_1], result[name_2], result["Q"] = value_1.copy(), value_2.copy(), Q
+        return FlashResult(*(result[name].reshape(shape) for name in OUTPUT_NAMES))
+
+    def flash(self, pair, value_1, value_2, x):
+        result = self.flash_many(pair, value_1, value_2, x)
+        if not np.isfinite(result).all():
+            raise PropertyError("State out of the property tables: " + pair + " = (" + str(value_1) + ", " + str(value_2) + "), x = " + str(x))
+        return FlashResult(*(float(column) for column in result))
+
+
+def format_errors(errors):
+    lines = []
+    for pair, table in errors.items():
+        text = [pair + " (" + str(table["points"]) + " points, phase mismatch " + "{:.2%}".format(table.get("phase_mismatch", 0.0)) + "):"]
+        for name in OUTPUT_NAMES:
+            if name in table:
+                e = table[name]
+                text.append(name + " max " + "{:.3g}".format(e["max_abs"]) + " (" + "{:.2g}".format(100 * e["max_rel"]) + "%) p99 "
+                            + "{:.3g}".format(e["p99_abs"]) + " mean " + "{:.3g}".format(e["mean_abs"]))
+        lines.append("  ".join(text))
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="Precomputed property tables of the ARS cycle")
+    parser.add_argument("command", choices=["build", "info"])
+    parser.add_argument("path")
+    parser.add_argument("--backend", default=None, help="property backend sampled by 'build' (refprop or numpy)")
+    parser.add_argument("--check", type=int, default=2000, help="random points per table used to publish the errors")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        tables = build_tables(args.backend, n_check=args.check)
+        save_tables(tables, args.path)
+    else:
+        tables = load_tables(args.path)
+    print("Backend: " + tables["backend"] + " " + tables["backend_version"])
+    print(format_errors(tables["errors"]))
+    if tables["violations"]:
+        print("Above the error bound: " + "; ".join(tables["violations"]))
+        sys.exit(1)
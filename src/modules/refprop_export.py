@@ -0,0 +1,416 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 03:30:00 2026
+
+@author: Wellorzzon Novais
+"""
+
+"""
+Description
+--
+This code reads the tables exported from REFPROP ("Specified state points", tab separated, decimal comma) and checks
+solver results against them.
+An export has one or more blocks:
+    14: ammonia/water 0.48-0.52: Specified state points (42,/58,)       <- title
+    Mass Frac.  Mass Frac.  Temperature  Pressure  Density   ...        <- names
+    (ammonia)   (water)     (K)          (Pa)      (kg/m^3)  ...        <- units
+    0,42000     0,58000     307,69       290710,   843,12    ...        <- data (Quality: number, Subcooled or Superheated)
+Files without title and header (as "..._withoutHeader.csv") are read with the default REFPROP columns (DEFAULT_COLUMNS).
+    - iter_refprop_chunks: streaming reader; yields typed NumPy structured arrays of at most "chunksize" rows (fields
+      "block", "row" (row inside the block) and the columns: x, x_water, T, P, D, h, s, Q, ...), in SI units. Each chunk
+      (many blocks) is parsed at once by np.loadtxt (C parser); rows with a different number of columns are skipped
+    - load_refprop: the whole file in one array (and the block titles)
+    - compare_states: vectorized regression check of reference rows against the state points of cycle results
+      (CYCLE_DTYPE records of result_store.py, BatchResult, CycleResult or a list of them); each reference row is
+      the state point "lines[row]" of the operating point "block"
+    - check_reference_file: compare_states chunk by chunk, for reference files larger than the memory
+    - write_states: writes the state points of cycle results in the same layout (one block per operating point), as
+      reference of another backend or of a later version of the solver
+The qualities follow the RefProp convention of the backends: Subcooled -> -998, Superheated -> 998. Single phase
+reference points are checked by their phase, two phase points by their quality.
+The exports of the notes folder are not a reference of this solver: they were made with REFPROP for x_1 = 0.42 and
+an older version of the cycle (e.g. h_8 = h_2 and x_7 with a quality of 0.001). Their lines are:
+    Most_Simple_model_-_Lines_1_2.csv: 1 2
+    Most_Simple_model_-_Lines_3_4_5_6_7_8.csv: 4 6 3 5 7 8
+
+Running from the src folder (the operating point is CycleInputs, with the inputs given as options):
+    python -m modules.refprop_export reference.csv --lines 1 2 3 4 5 6 7 8 --backend numpy --write
+    python -m modules.refprop_export reference.csv --lines 1 2 3 4 5 6 7 8 --backend table:tables.npz
+    python -m modules.refprop_export export.csv --lines 4 6 3 5 7 8 --backend refprop --x_1 0.42
+"""
+
+"""
+Log
+
+--------------------------------------
+Version 0.0.1
+--
+Introduced the streaming reader of REFPROP exports and the regression check.
+
+--------------------------------------
+Version 0.0.2
+--
+The command line needs the export files (the notes exports are of another operating point and version of the cycle)
+and takes every input of CycleInputs; write_states writes references in the export layout.
+
+--------------------------------------
+"""
+
+import io
+import os
+import re
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from modules.state_point import SATURATED_LIQUID, SATURATED_VAPOR, TWO_PHASE, phase_code_array
+
+
+DEFAULT_CHUNKSIZE = 100000
+
+# Column of each (name, unit) of the header; "Mass Frac." depends on the unit (component)
+COLUMN_NAMES = {
+    "mass frac.": {"(ammonia)": "x", "(water)": "x_water"},
+    "temperature": "T",
+    "pressure": "P",
+    "density": "D",
+    "enthalpy": "h",
+    "entropy": "s",
+    "quality": "Q",
+    "internal energy": "u",
+    "cp": "cp",
+    "cv": "cv",
+}
+DEFAULT_COLUMNS = ("x", "x_water", "T", "P", "D", "h", "s", "Q")
+
+# Units converted to SI: (factor, offset)
+UNITS = {
+    "(c)": (1.0, 273.15),
+    "(kpa)": (1e3, 0.0),
+    "(mpa)": (1e6, 0.0),
+    "(bar)": (1e5, 0.0),
+    "(kj/kg)": (1e3, 0.0),
+    "(kj/kg-k)": (1e3, 0.0),
+}
+
+# Qualities written as text
+QUALITY_WORDS = {"Subcooled": "-998", "Superheated": "998"}
+
+TITLE = re.compile(r"^\s*\d+\s*:")
+NUMBER = re.compile(r"^\s*[-+]?(\d[\d,.]*|[.,]\d+)([eE][-+]?\d+)?\s*$")
+
+# Tolerances of the regression check: {field: (absolute, relative)}; a value passes if
+# |value - reference| <= absolute + relative * |reference|. The exports have 5 significant digits.
+DEFAULT_TOLERANCES = {
+    "T": (0.02, 0.0), # [K]
+    "P": (0.0, 1e-4), # [Pa]
+    "h": (1.0, 1e-4), # [J/kg]
+    "s": (0.1, 1e-4), # [J/(kg.K)]
+    "x": (1e-4, 0.0), # [-]
+    "Q": (1e-4, 0.0), # [-] (two phase points only)
+}
+
+
+def _column_name(name, unit):
+    column = COLUMN_NAMES.get(name.strip().lower())
+    if isinstance(column, dict):
+        column = column.get(unit.strip().lower())
+    return column or re.sub(r"\W+", "_", (name + " " + unit).strip().lower()).strip("_")
+
+
+@dataclass
+class _Block:
+    index: int
+    title: str = ""
+    header: list = field(default_factory=list) # header rows (names, units)
+    columns: tuple = None
+    units: tuple = None
+    rows: int = 0
+
+
+def _parse(columns, units, lines, block, row):
+    # Structured array of data lines with the same columns (of one or more blocks)
+    text = "\n".join(lines).replace(",", ".")
+    for word, value in QUALITY_WORDS.items():
+        text = text.replace(word, value)
+    try:
+        values = np.loadtxt(io.StringIO(text), delimiter="\t", ndmin=2)
+    except ValueError:
+        # Unknown words or empty cells: NaN in those cells
+        def number(cell):
+            try:
+                return float(cell)
+            except ValueError:
+                return np.nan
+
+        values = np.array([[number(cell) for cell in line.split("\t")] for line in text.split("\n")], float)
+    dtype = np.dtype([("block", np.int32), ("row", np.int32)] + [(name, np.float64) for name in columns])
+    data = np.empty(len(values), dtype)
+    data["block"] = block
+    data["row"] = row
+    for k, name in enumerate(columns):
+        factor, offset = UNITS.get(units[k].strip().lower(), (1.0, 0.0))
+        data[name] = values[:, k] * factor + offset
+    return data
+
+
+def iter_refprop_chunks(path, chunksize=DEFAULT_CHUNKSIZE, blocks=None, skipped=None):
+    # Structured arrays of at most "chunksize" rows of the export "path"; consecutive blocks with the same columns
+    # share the chunks. "blocks" (list) receives the title of each block; "skipped" (list) the lines that were not read.
+    block = None
+    lines, block_ids, row_ids, layout = [], [], [], None # pending rows and their (columns, units)
+
+    def new_block(title=""):
+        index = block.index + 1 if block is not None else 0
+        if blocks is not None:
+            blocks.append(title)
+        return _Block(index, title)
+
+    with open(path, encoding="latin-1", newline=None) as file:
+        for line in file:
+            line = line.rstrip("\r\n")
+            if not line.strip():
+                continue
+            if "\t" not in line and TITLE.match(line):
+                block = new_block(line.strip())
+                continue
+            cells = line.split("\t")
+            if not NUMBER.match(cells[0]):
+                if block is None:
+                    block = new_block()
+                if block.columns is None:
+                    block.header.append(cells)
+                elif skipped is not None:
+                    skipped.append(line)
+                continue
+            if block is None:
+                block = new_block()
+            if block.columns is None:
+                if block.header:
+                    names = block.header[0]
+                    units = (block.header[1] if len(block.header) > 1 else []) + [""] * len(names)
+                    block.columns = tuple(_column_name(name, unit) for name, unit in zip(names, units))
+                    block.units = tuple(units[:len(names)])
+                else:
+                    block.columns = DEFAULT_COLUMNS[:len(cells)]
+                    block.units = ("",) * len(block.columns)
+            if len(cells) != len(block.columns):
+                if skipped is not None:
+                    skipped.append(line)
+                continue
+            if layout != (block.columns, block.units) or len(lines) >= chunksize:
+                if lines:
+                    yield _parse(*layout, lines, block_ids, row_ids)
+                lines, block_ids, row_ids, layout = [], [], [], (block.columns, block.units)
+            lines.append(line)
+            block_ids.append(block.index)
+            row_ids.append(block.rows)
+            block.rows += 1
+    if lines:
+        yield _parse(*layout, lines, block_ids, row_ids)
+
+
+@dataclass
+class RefpropTable:
+    path: str
+    titles: list # title of each block ("" for files without title)
+    data: np.ndarray # structured array (block, row, columns)
+    skipped: list = field(default_factory=list)
+
+    def block(self, index):
+        return self.data[self.data["block"] == index]
+
+
+def load_refprop(path, chunksize=DEFAULT_CHUNKSIZE):
+    # Whole export in one structured array. Blocks with different columns keep only the common columns.
+    titles, skipped = [], []
+    chunks = list(iter_refprop_chunks(path, chunksize, titles, skipped))
+    if not chunks:
+        data = np.empty(0, [("block", np.int32), ("row", np.int32)])
+    else:
+        names = [name for name in chunks[0].dtype.names if all(name in chunk.dtype.names for chunk in chunks)]
+        data = np.concatenate([chunk[names] for chunk in chunks]) if len(chunks) > 1 else chunks[0]
+    return RefpropTable(os.fspath(path), titles, np.asarray(data), skipped)
+
+
+# ==========================================================================
+# Regression check
+# ==========================================================================
+
+def as_records(results):
+    # CYCLE_DTYPE records (result_store.py) of a BatchResult, a CycleResult, a list of CycleResult or records
+    from modules.result_store import CYCLE_DTYPE, records_from_batch, records_from_results
+
+    if isinstance(results, np.ndarray) and results.dtype == CYCLE_DTYPE:
+        return results
+    if hasattr(results, "to_records"):
+        return results.to_records()
+    if hasattr(results, "points") and hasattr(results, "inputs"):
+        results = [results]
+    if hasattr(results, "P") and hasattr(results, "phase"):
+        return records_from_batch(results)
+    return records_from_results(list(results))
+
+
+@dataclass
+class RegressionReport:
+    tolerances: dict
+    rows: int = 0 # reference rows checked
+    failed_rows: int = 0
+    failures: dict = field(default_factory=dict) # {field: rows out of tolerance}
+    max_error: dict = field(default_factory=dict) # {field: largest |value - reference|}
+    worst: dict = field(default_factory=dict) # {field: (block, row) of the largest error}
+    phase_failures: int = 0 # single phase reference rows with another phase
+    first_failures: list = field(default_factory=list) # (block, row, fields) of the first failed rows
+
+    @property
+    def passed(self):
+        return self.failed_rows == 0
+
+    def add(self, other):
+        # Merges the report of another chunk
+        self.rows += other.rows
+        self.failed_rows += other.failed_rows
+        self.phase_failures += other.phase_failures
+        for name, count in other.failures.items():
+            self.failures[name] = self.failures.get(name, 0) + count
+        for name, error in other.max_error.items():
+            if error > self.max_error.get(name, -np.inf):
+                self.max_error[name], self.worst[name] = error, other.worst[name]
+        self.first_failures.extend(other.first_failures[:max(0, MAX_LISTED_FAILURES - len(self.first_failures))])
+        return self
+
+    def table(self):
+        from tabulate import tabulate
+
+        rows = [[name, '%.4g' % self.max_error.get(name, np.nan), self.failures.get(name, 0), self.worst.get(name, "")]
+                for name in self.tolerances]
+        rows.append(["phase", "", self.phase_failures, ""])
+        return tabulate(rows, headers=["Field", "Max |error|", "Failed rows", "Worst (block, row)"])
+
+
+MAX_LISTED_FAILURES = 20
+
+
+def compare_states(reference, results, lines, points=None, tolerances=None):
+    # Checks the reference rows (structured array of iter_refprop_chunks/load_refprop) against the state points of
+    # "results". The reference row k is the line lines[row_k % len(lines)] (1 - 8) of the operating point points[k]
+    # (default: the block of the row, or the only operating point).
+    tolerances = dict(DEFAULT_TOLERANCES if tolerances is None else tolerances)
+    records = as_records(results)
+    lines = np.asarray(lines, int)
+    line = lines[reference["row"] % len(lines)] - 1
+    if points is None:
+        points = np.zeros(len(reference), int) if len(records) == 1 else reference["block"]
+    states = records["points"][np.asarray(points, int), line]
+
+    report = RegressionReport(tolerances, rows=len(reference))
+    failed = np.zeros(len(reference), bool)
+    reference_phase = phase_code_array(reference["Q"]) if "Q" in reference.dtype.names else None
+    saturated = np.isin(reference_phase, (SATURATED_LIQUID, TWO_PHASE, SATURATED_VAPOR)) if reference_phase is not None else None
+    fields_failed = {}
+    for name, (absolute, relative) in tolerances.items():
+        if name not in reference.dtype.names:
+            continue
+        expected, value = reference[name], states[name]
+        check = np.isfinite(expected)
+        if name == "Q":
+            check &= saturated
+        error = np.where(check, np.abs(value - expected), 0.0)
+        bad = check & ~(error <= absolute + relative * np.abs(expected)) # NaN values fail
+        fields_failed[name] = bad
+        failed |= bad
+        report.failures[name] = int(bad.sum())
+        error = np.where(np.isnan(error), np.inf, error)
+        if len(error):
+            k = int(np.argmax(error))
+            report.max_error[name] = float(error[k])
+            report.worst[name] = (int(reference["block"][k]), int(reference["row"][k]))
+    if reference_phase is not None:
+        # Single phase reference: same phase (the saturated ones are checked by their quality)
+        bad = ~saturated & (reference_phase >= 0) & (states["phase"] != reference_phase)
+        report.phase_failures = int(bad.sum())
+        fields_failed["phase"] = bad
+        failed |= bad
+    report.failed_rows = int(failed.sum())
+    for k in np.flatnonzero(failed)[:MAX_LISTED_FAILURES]:
+        report.first_failures.append((int(reference["block"][k]), int(reference["row"][k]),
+                                      [name for name, bad in fields_failed.items() if bad[k]]))
+    return report
+
+
+def check_reference_file(path, results, lines, points=None, tolerances=None, chunksize=DEFAULT_CHUNKSIZE):
+    # compare_states over the export "path", chunk by chunk. "points" is a function of the chunk (structured array)
+    # that returns the operating point index of each row (default: as compare_states).
+    records = as_records(results)
+    report = RegressionReport(dict(DEFAULT_TOLERANCES if tolerances is None else tolerances))
+    for chunk in iter_refprop_chunks(path, chunksize):
+        report.add(compare_states(chunk, records, lines, points(chunk) if points is not None else None, report.tolerances))
+    return report
+
+
+# Columns written by write_states: (name, unit, record field)
+WRITTEN_COLUMNS = (("Mass Frac.", "(ammonia)", "x"), ("Mass Frac.", "(water)", None), ("Temperature", "(K)", "T"),
+                   ("Pressure", "(Pa)", "P"), ("Enthalpy", "(J/kg)", "h"), ("Entropy", "(J/kg-K)", "s"),
+                   ("Quality", "(kg/kg)", "Q"))
+
+
+def _cell(value, name):
+    if name == "Q":
+        for word, code in QUALITY_WORDS.items():
+            if value == float(code):
+                return word
+    return "" if np.isnan(value) else ("%.10g" % value).replace(".", ",")
+
+
+def write_states(path, results, lines, title="ammonia/water: Specified state points"):
+    # Export of the state points "lines" (1 - 8) of each operating point of "results" (one block each, in the
+    # layout of the REFPROP exports), to be read by iter_refprop_chunks and checked by compare_states
+    records = as_records(results)
+    with open(path, "w", encoding="latin-1", newline="\r\n") as file:
+        for block, record in enumerate(records):
+            file.write(str(block + 1) + ": " + title + "\n\n")
+            file.write("\t".join(name for name, _, _ in WRITTEN_COLUMNS) + "\n")
+            file.write("\t".join(unit for _, unit, _ in WRITTEN_COLUMNS) + "\n")
+            file.write("\t" * (len(WRITTEN_COLUMNS) - 1) + "\n")
+            for line in lines:
+                state = record["points"][line - 1]
+                file.write("\t".join(_cell(1 - state["x"] if name is None else state[name], name)
+                                      for _, _, name in WRITTEN_COLUMNS) + "\n")
+            file.write("\n\n")
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+    from dataclasses import fields
+
+    from modules.cycle_solver import CycleInputs, solve_cycle
+
+    parser = argparse.ArgumentParser(description="Regression check of the ARS cycle against REFPROP exports")
+    parser.add_argument("files", nargs="+", help="exports")
+    parser.add_argument("--lines", type=int, nargs="+", required=True, help="state line (1 - 8) of the rows of each block")
+    parser.add_argument("--backend", default=None, help="property backend (refprop, numpy or table:<file>)")
+    parser.add_argument("--write", action="store_true", help="write the state points to the files instead of checking them")
+    for f in fields(CycleInputs):
+        parser.add_argument("--" + f.name, type=float, default=f.default, help="default: " + str(f.default))
+    args = parser.parse_args()
+
+    inputs = CycleInputs(**{f.name: getattr(args, f.name) for f in fields(CycleInputs)})
+    result = solve_cycle(inputs, backend=args.backend)
+    failed = False
+    for path in args.files:
+        if args.write:
+            write_states(path, result, args.lines)
+            print("Saved: " + path)
+            continue
+        start = time.perf_counter()
+        report = check_reference_file(path, result, args.lines)
+        print(os.path.basename(path) + ": " + str(report.rows) + " rows, " + str(report.failed_rows) + " failed ("
+              + "{:.3g}".format(time.perf_counter() - start) + " s)")
+        print(report.table())
+        for block, row, names in report.first_failures:
+            print("  block " + str(block) + ", row " + str(row) + ": " + ", ".join(names))
+        failed |= not report.passed
+    raise SystemExit(1 if failed else 0)
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 21:30:00 2026
+
+@author: Wellorzzon Novais
+"""
+
+"""
+Description
+--
+This code has the compact (columnar) representation of the cycle results, used at sweep scale instead of lists of
+CycleResult and StatePoint objects:
+    - STATE_DTYPE: NumPy structured type of a state point, with float64 columns (P, T, x, Q, h, s, m_ponto) and an int8
+      phase code (state_point.py; -1 where the point was not solved)
+    - CYCLE_DTYPE: one operating point, with the inputs (CycleInputs fields), the 8 state points, the heat exchange
+      rates and a "feasible" flag
+Many cycles are one contiguous array of CYCLE_DTYPE (records["points"]["h"] has shape (number of cycles, 8)):
+    - records_from_batch: from a BatchResult, column by column (no Python object per point)
+    - records_from_results: from a list of CycleResult (None for failed points, e.g. SweepResult.results)
+    - result_from_record: back to a CycleResult (e.g. to print its table)
+"""
+
+"""
+Log
+
+--------------------------------------
+Version 0.0.1
+--
+Introduced the structured types of the state points and of the cycles.
+
+--------------------------------------
+"""
+
+from dataclasses import fields
+
+import numpy as np
+
+from modules.cycle_solver import CycleInputs, CycleResult
+from modules.state_point import PHASE_NAMES, StatePoint
+
+
+N_POINTS = 8
+
+STATE_FIELDS = ("P", "T", "x", "Q", "h", "s", "m_ponto")
+STATE_DTYPE = np.dtype([(name, np.float64) for name in STATE_FIELDS] + [("phase", np.int8)])
+
+INPUT_NAMES = tuple(f.name for f in fields(CycleInputs))
+CYCLE_DTYPE = np.dtype([(name, np.float64) for name in INPUT_NAMES]
+                       + [("points", STATE_DTYPE, (N_POINTS,)),
+                          ("Q_gen", np.float64), ("Q_con", np.float64), ("Q_abs", np.float64),
+                          ("feasible", np.bool_)])
+
+
+def empty_records(n):
+    # n cycles with NaN everywhere (phase -1, not feasible)
+    records = np.zeros(n, CYCLE_DTYPE)
+    for name in INPUT_NAMES + ("Q_gen", "Q_con", "Q_abs"):
+        records[name] = np.nan
+    for name in STATE_FIELDS:
+        records["points"][name] = np.nan
+    records["points"]["phase"] = -1
+    return records
+
+
+def records_from_batch(batch):
+    # CYCLE_DTYPE array of a BatchResult (modules/batch_solver.py)
+    records = np.empty(len(batch), CYCLE_DTYPE)
+    for name in INPUT_NAMES:
+        records[name] = batch.inputs[name]
+    for name in STATE_FIELDS + ("phase",):
+        records["points"][name] = getattr(batch, name)
+    for name in ("Q_gen", "Q_con", "Q_abs", "feasible"):
+        records[name] = getattr(batch, name)
+    return records
+
+
+def records_from_results(results, points=None):
+    # CYCLE_DTYPE array of a list of CycleResult; failed points (None) keep NaN and take their inputs from "points"
+    # (list of CycleInputs, e.g. SweepResult.points)
+    records = empty_records(len(results))
+    for i, result in enumerate(results):
+        inputs = result.inputs if result is not None else (points[i] if points is not None else None)
+        if inputs is not None:
+            for name in INPUT_NAMES:
+                records[name][i] = getattr(inputs, name)
+        if result is None:
+            continue
+        row = records["points"][i]
+        for j in range(N_POINTS):
+            point = result.points[j + 1]
+            for name in STATE_FIELDS:
+                row[name][j] = getattr(point, name)
+            row["phase"][j] = PHASE_NAMES.index(point.phase) if point.phase in PHASE_NAMES else -1
+        records["Q_gen"][i], records["Q_con"][i], records["Q_abs"][i] = result.Q_gen, result.Q_con, result.Q_abs
+        records["feasible"][i] = True
+    return records
+
+
+def result_from_record(record):
+    # CycleResult of one CYCLE_DTYPE element (without flash counts and x_7 solution)
+    inputs = CycleInputs(**{name: float(record[name]) for name in INPUT_NAMES})
+    points = {}
+    for j, row in enumerate(record["points"]):
+        phase = PHASE_NAMES[row["phase"]] if row["phase"] >= 0 else ''
+        points[j + 1] = StatePoint(*(float(row[name]) for name in STATE_FIELDS), phase=phase)
+    return CycleResult(inputs, points, float(record["Q_gen"]), float(record["Q_con"]), float(record["Q_abs"]))
@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 22:00:00 2026
+
+@author: Wellorzzon Novais
+"""
+
+"""
+Description
+--
+This code writes sweep results to disk in fixed-size chunks, so the memory stays bounded whatever the sweep size.
+The rows are the cycles (result_store.CYCLE_DTYPE) with flat columns: the inputs (input_Temp_3, input_x_1, ...), then
+P_1 ... P_8, Temp_1 ... Temp_8, x_, Qu_, h_, s_, m_ponto_ and Phase_ (int phase codes of state_point.py) of the 8
+lines, Q_gen, Q_con, Q_abs and feasible.
+Formats:
+    - "csv": one tab-separated text file with a header row
+    - "refprop": one text file in the layout of the RefProp exports of the notes folder (e.g.
+      notes/Most_Simple_model_-_Lines_1_2.csv): a title line, a blank line, the names row, the units row and an empty
+      row, then the rows with tab separators, decimal commas, CRLF line ends and "Subcooled"/"Superheated" in the
+      quality columns (NaN values are blank), so it opens as the other sheets of the project
+    - "npy": a folder with one .npy file of CYCLE_DTYPE per chunk (np.load(..., mmap_mode="r") maps them)
+    - "npz": a folder with one compressed .npz file of the flat columns per chunk
+    - "parquet": a folder with one .parquet file per chunk (a Parquet dataset; needs pyarrow)
+Next to the output there is a manifest (<path>.manifest.json) updated after every chunk written (rows, chunks and
+size of the csv or refprop file). An interrupted sweep is resumed with resume=True: the rows after the last complete chunk are
+dropped and the sweep goes on from the first point not written.
+
+Running from the src folder:
+    python -m modules.result_writer sweep.json results.csv --backend numpy --batch
+"""
+
+"""
+Log
+
+--------------------------------------
+Version 0.0.1
+--
+Introduced the chunked writer (csv, npy, npz and parquet) and write_sweep.
+
+--------------------------------------
+Version 0.0.2
+--
+Added the "refprop" format (layout of the RefProp exports of the notes folder).
+
+--------------------------------------
+Version 0.0.3
+--
+write_sweep takes the points one chunk at a time (memory bounded for any sweep size) and solves all the chunks in
+one sweep.SweepPool.
+
+--------------------------------------
+"""
+
+import json
+import os
+
+import numpy as np
+
+from modules.result_store import CYCLE_DTYPE, INPUT_NAMES, N_POINTS, STATE_FIELDS
+
+
+FORMATS = ("csv", "refprop", "npy", "npz", "parquet")
+TEXT_FORMATS = ("csv", "refprop")
+DEFAULT_CHUNKSIZE = 10000
+
+# Names of the state point columns in the flat rows (same names of ARS_simple_solver.py)
+STATE_COLUMN_NAMES = {"P": "P", "T": "Temp", "x": "x", "Q": "Qu", "h": "h", "s": "s", "m_ponto": "m_ponto", "phase": "Phase"}
+
+# "refprop" format: title, units of the columns (by name prefix, "(-)" for the others) and quality texts
+REFPROP_TITLE = "ARS simple cycle: sweep results"
+REFPROP_UNITS = {"Temp": "(K)", "P": "(Pa)", "x": "(ammonia)", "Qu": "(kg/kg)", "h": "(J/kg)", "s": "(J/kg-K)",
+                 "m_ponto": "(kg/s)", "Q": "(W)"}
+REFPROP_QUALITIES = {-998.0: "Subcooled", 998.0: "Superheated"}
+REFPROP_HEADER_LINES = 5
+
+
+def flat_columns(records):
+    # {column name: 1D array} of a CYCLE_DTYPE array
+    columns = {"input_" + name: records[name] for name in INPUT_NAMES}
+    for name in STATE_FIELDS + ("phase",):
+        values = records["points"][name]
+        for j in range(N_POINTS):
+            columns[STATE_COLUMN_NAMES[name] + "_" + str(j + 1)] = values[:, j]
+    for name in ("Q_gen", "Q_con", "Q_abs", "feasible"):
+        columns[name] = records[name]
+    return columns
+
+
+def column_unit(name):
+    # Unit of a flat column in the "refprop" format (Temp_3, input_Temp_3 -> (K))
+    name = name[len("input_"):] if name.startswith("input_") else name
+    return REFPROP_UNITS.get(name.rsplit("_", 1)[0], "(-)")
+
+
+def refprop_value(name, value):
+    # Text of a value in the "refprop" format: decimal comma, quality texts and blank NaN
+    if name.startswith("Qu_") and value in REFPROP_QUALITIES:
+        return REFPROP_QUALITIES[value]
+    if isinstance(value, float) and value != value:
+        return ""
+    return repr(value).replace(".", ",")
+
+
+def format_from_path(path):
+    extension = os.path.splitext(str(path))[1].lower().lstrip(".")
+    return {"tsv": "csv", "txt": "csv"}.get(extension, extension if extension in FORMATS else "npy")
+
+
+class ResultWriter:
+
+    def __init__(self, path, format=None, chunksize=DEFAULT_CHUNKSIZE, resume=False):
+        self.path = str(path)
+        self.format = format or format_from_path(path)
+        if self.format not in FORMATS:
+            raise ValueError("Unknown result format: " + str(self.format) + " (use one of " + ", ".join(FORMATS) + ")")
+        if self.format == "parquet":
+            import pyarrow  # noqa: F401 (fails early when pyarrow is not installed)
+        self.chunksize = int(chunksize)
+        self.manifest_path = self.path + ".manifest.json"
+        self.rows = 0
+        self.chunks = 0
+        self.size = 0 # bytes of the csv file
+        self._buffer = []
+        self._buffered = 0
+
+        if resume and os.path.exists(self.manifest_path):
+            with open(self.manifest_path) as file:
+                manifest = json.load(file)
+            if manifest["format"] != self.format:
+                raise ValueError("Can not resume " + self.path + ": it was written as " + manifest["format"])
+            self.rows, self.chunks, self.size = manifest["rows"], manifest["chunks"], manifest["size"]
+            self._drop_incomplete()
+        else:
+            self._start()
+
+    # ----- Files -----
+
+    def _chunk_path(self, i):
+        extension = {"npy": ".npy", "npz": ".npz", "parquet": ".parquet"}[self.format]
+        return os.path.join(self.path, "chunk_" + "{:06d}".format(i) + extension)
+
+    def _open(self, mode):
+        # Text file of the csv and refprop formats (CRLF line ends in refprop, as RefProp writes them)
+        return open(self.path, mode, newline="\r\n" if self.format == "refprop" else None)
+
+    def _start(self):
+        if self.format in TEXT_FORMATS:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            names = list(flat_columns(np.empty(0, CYCLE_DTYPE)))
+            with self._open("w") as file:
+                if self.format == "refprop":
+                    file.write(REFPROP_TITLE + "\n\n")
+                    file.write("\t".join(names) + "\n")
+                    file.write("\t".join(column_unit(name) for name in names) + "\n")
+                    file.write("\t" * (len(names) - 1) + "\n")
+                else:
+                    file.write("\t".join(names) + "\n")
+                self.size = file.tell()
+        else:
+            os.makedirs(self.path, exist_ok=True)
+            for name in os.listdir(self.path):
+                if name.startswith("chunk_"):
+                    os.remove(os.path.join(self.path, name))
+        self._save_manifest()
+
+    def _drop_incomplete(self):
+        # Removes what was written after the last complete chunk (e.g. the sweep stopped while writing)
+        if self.format in TEXT_FORMATS:
+            with open(self.path, "r+") as file:
+                file.truncate(self.size)
+        else:
+            for name in os.listdir(self.path):
+                if name.startswith("chunk_") and int(name[6:12]) >= self.chunks:
+                    os.remove(os.path.join(self.path, name))
+
+    def _save_manifest(self):
+        manifest = {"format": self.format, "rows": self.rows, "chunks": self.chunks, "size": self.size,
+                    "chunksize": self.chunksize}
+        temporary = self.manifest_path + ".tmp"
+        with open(temporary, "w") as file:
+            json.dump(manifest, file)
+        os.replace(temporary, self.manifest_path)
+
+    def _write_chunk(self, records):
+        if self.format in TEXT_FORMATS:
+            columns = flat_columns(records)
+            with self._open("a") as file:
+                lines = zip(*(column.astype(int) if column.dtype.kind in "bi" else column for column in columns.values()))
+                if self.format == "refprop":
+                    file.writelines("\t".join(refprop_value(name, value.item()) for name, value in zip(columns, line)) + "\n"
+                                    for line in lines)
+                else:
+                    file.writelines("\t".join(map(repr, (value.item() for value in line))) + "\n" for line in lines)
+                file.flush()
+                os.fsync(file.fileno())
+                self.size = file.tell()
+        elif self.format == "npy":
+            np.save(self._chunk_path(self.chunks), records)
+        elif self.format == "npz":
+            np.savez_compressed(self._chunk_path(self.chunks), **flat_columns(records))
+        else:
+            import pyarrow
+            import pyarrow.parquet
+
+            table = pyarrow.table({name: np.ascontiguousarray(column) for name, column in flat_columns(records).items()})
+            pyarrow.parquet.write_table(table, self._chunk_path(self.chunks))
+        self.rows += len(records)
+        self.chunks += 1
+        self._save_manifest()
+
+    # ----- Writing -----
+
+    def write(self, records):
+        # Buffers the rows (CYCLE_DTYPE array) and writes every complete chunk
+        self._buffer.append(records)
+        self._buffered += len(records)
+        while self._buffered >= self.chunksize:
+            records = np.concatenate(self._buffer)
+            self._write_chunk(records[:self.chunksize])
+            self._buffer, self._buffered = [records[self.chunksize:]], len(records) - self.chunksize
+
+    def flush(self):
+        # Writes the rows left in the buffer (last chunk, smaller than chunksize)
+        if self._buffered:
+            self._write_chunk(np.concatenate(self._buffer))
+        self._buffer, self._buffered = [], 0
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        # Only complete chunks are kept when the sweep fails, so it can be resumed
+        if exc[0] is None:
+            self.close()
+
+
+def read_results(path, format=None):
+    # Flat columns of a result file or folder (all the chunks in memory)
+    format = format or format_from_path(path)
+    if format == "csv":
+        data = np.genfromtxt(path, delimiter="\t", names=True, dtype=None, encoding=None)
+        return {name: data[name] for name in data.dtype.names}
+    if format == "refprop":
+        texts = {text: value for value, text in REFPROP_QUALITIES.items()}
+        with open(path, newline="") as file:
+            lines = file.read().splitlines()
+        names = lines[2].split("\t")
+        rows = [line.split("\t") for line in lines[REFPROP_HEADER_LINES:] if line]
+        columns = {}
+        for j, name in enumerate(names):
+            values = np.array([texts[row[j]] if row[j] in texts else float(row[j].replace(",", ".") or "nan") for row in rows])
+            columns[name] = values.astype(int) if name.startswith("Phase_") or name == "feasible" else values
+        return columns
+    names = sorted(name for name in os.listdir(path) if name.startswith("chunk_"))
+    if format == "npy":
+        return flat_columns(np.concatenate([np.load(os.path.join(path, name), mmap_mode="r") for name in names]))
+    if format == "npz":
+        chunks = [np.load(os.path.join(path, name)) for name in names]
+        return {key: np.concatenate([chunk[key] for chunk in chunks]) for key in chunks[0].files} if chunks else {}
+    import pyarrow.parquet
+
+    table = pyarrow.parquet.read_table(path)
+    return {name: table[name].to_numpy() for name in table.column_names}
+
+
+def write_sweep(points, path, backend=None, format=None, chunksize=DEFAULT_CHUNKSIZE, resume=False, batch=False,
+                processes=None, cache_size=100000):
+    # Solves the sweep (iterable of CycleInputs or sweep definition) chunk by chunk and writes each chunk to "path".
+    # The points are taken one chunk at a time (a sweep definition is never expanded in memory) and all the chunks
+    # are solved in one sweep.SweepPool. With resume=True the points already written are skipped. Returns the
+    # ResultWriter.
+    import itertools
+
+    from modules.sweep import SweepPool, iter_sweep, run_batch_sweep, run_sweep
+
+    writer = ResultWriter(path, format, chunksize, resume)
+    points = iter_sweep(points, writer.rows) if isinstance(points, dict) else itertools.islice(points, writer.rows, None)
+    with writer, SweepPool(backend, processes, cache_size) as pool:
+        while True:
+            chunk = list(itertools.islice(points, writer.chunksize))
+            if not chunk:
+                break
+            if batch:
+                writer.write(run_batch_sweep(chunk, pool=pool).to_records())
+            else:
+                writer.write(run_sweep(chunk, pool=pool).to_records())
+    return writer
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from modules.sweep import load_sweep_definition
+
+    parser = argparse.ArgumentParser(description="Sweep of the ARS cycle written to disk in chunks")
+    parser.add_argument("sweep", help="sweep definition (JSON)")
+    parser.add_argument("output", help="csv/tsv file, refprop text file (--format refprop), or folder (npy, npz or parquet)")
+    parser.add_argument("--format", choices=FORMATS, default=None)
+    parser.add_argument("--backend", default=None, help="property backend (refprop, numpy or table:<file>)")
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE)
+    parser.add_argument("--resume", action="store_true", help="go on from the last chunk written")
+    parser.add_argument("--batch", action="store_true", help="solve with the vectorized batch solver")
+    args = parser.parse_args()
+
+    writer = write_sweep(load_sweep_definition(args.sweep), args.output, args.backend, args.format, args.chunksize,
+                         args.resume, args.batch, args.processes)
+    print("Rows: " + str(writer.rows) + " in " + str(writer.chunks) + " chunks (" + writer.format + ")")
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 18:00:00 2026
+
+@author: Wellorzzon Novais
+"""
+
+"""
+Description
+--
+This code has the root finders used by the property model and by the cycle solvers:
+    - solve_bracketed: Illinois (modified regula falsi) method over NumPy arrays, one bracket per element
+    - brent: Brent's method for one scalar root, reusing the function values already known at the bracket
+"""
+
+"""
+Log
+
+--------------------------------------
+Version 0.0.1
+--
+Moved "solve_bracketed" from ammonia_water_numpy.py, with the option of evaluating only the unconverged elements
+(masked=True), so expensive functions (a backend flash) are not called again for converged elements.
+
+--------------------------------------
+Version 0.0.2
+--
+Introduced "brent" (same algorithm of scipy.optimize.brentq), that accepts f(a) and f(b) already calculated.
+
+--------------------------------------
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+
+
+XTOL = 1e-12
+MAXITER = 100
+RTOL = 4 * np.finfo(float).eps
+
+
+class RootResult(NamedTuple):
+    root: float
+    iterations: int
+    function_calls: int # calls of f done by the root finder (not counting f(a) and f(b) given by the caller)
+    converged: bool
+
+
+def solve_bracketed(f, lo, hi, xtol=XTOL, maxiter=MAXITER, masked=False):
+    # Illinois (modified regula falsi) over arrays: f(lo) and f(hi) must have opposite signs (or be zero).
+    # Where they do not (or f is not finite), the bound with the smallest |f| is returned.
+    # With masked=True, f is called as f(values, mask) and only needs to be right where mask is True.
+    lo, hi = np.broadcast_arrays(np.asarray(lo, float), np.asarray(hi, float))
+    lo, hi = lo.copy(), hi.copy()
+    if masked:
+        everything = np.ones(lo.shape, bool)
+        f_lo, f_hi = f(lo, everything), f(hi, everything)
+    else:
+        f_lo, f_hi = f(lo), f(hi)
+    root = np.where(np.abs(f_lo) <= np.abs(f_hi), lo, hi)
+    active = (f_lo * f_hi < 0) & np.isfinite(f_lo) & np.isfinite(f_hi)
+    side = np.zeros(lo.shape, int)
+    for _ in range(maxiter):
+        if not active.any():
+            break
+        c = np.where(active, (lo * f_hi - hi * f_lo) / np.where(active, f_hi - f_lo, 1.0), root)
+        f_c = f(c, active) if masked else f(c)
+        # The bound with the same sign of f(c) is replaced; when the same side is replaced twice in a row,
+        # f at the other bound is halved (Illinois)
+        move_lo = active & (f_c * f_lo > 0)
+        move_hi = active & ~move_lo
+        lo, f_lo = np.where(move_lo, c, lo), np.where(move_lo, f_c, f_lo)
+        hi, f_hi = np.where(move_hi, c, hi), np.where(move_hi, f_c, f_hi)
+        f_hi = np.where(move_lo & (side == -1), f_hi / 2, f_hi)
+        f_lo = np.where(move_hi & (side == 1), f_lo / 2, f_lo)
+        side = np.where(move_lo, -1, np.where(move_hi, 1, side))
+        step = np.abs(c - root)
+        root = np.where(active, c, root)
+        active = active & (f_c != 0) & np.isfinite(f_c) & (step > xtol * (1 + np.abs(c)))
+    return root
+
+
+def brent(f, a, b, f_a=None, f_b=None, xtol=XTOL, rtol=RTOL, maxiter=MAXITER):
+    # Brent's method (inverse quadratic interpolation, secant and bisection) for a root of f in [a, b].
+    # f(a) and f(b) must have opposite signs (or be zero); they are only calculated if not given.
+    calls = 0
+    if f_a is None:
+        f_a, calls = f(a), calls + 1
+    if f_b is None:
+        f_b, calls = f(b), calls + 1
+    if f_a * f_b > 0:
+        raise ValueError("f(a) and f(b) must have opposite signs")
+    if f_a == 0:
+        return RootResult(a, 0, calls, True)
+    if f_b == 0:
+        return RootResult(b, 0, calls, True)
+
+    x_pre, x_cur, f_pre, f_cur = a, b, f_a, f_b
+    x_blk = f_blk = s_pre = s_cur = 0.0
+    for iteration in range(1, maxiter + 1):
+        if f_pre * f_cur < 0:
+            x_blk, f_blk = x_pre, f_pre
+            s_pre = s_cur = x_cur - x_pre
+        if abs(f_blk) < abs(f_cur):
+            x_pre, x_cur, x_blk = x_cur, x_blk, x_cur
+            f_pre, f_cur, f_blk = f_cur, f_blk, f_cur
+
+        delta = (xtol + rtol * abs(x_cur)) / 2
+        s_bis = (x_blk - x_cur) / 2
+        if f_cur == 0 or abs(s_bis) < delta:
+            return RootResult(x_cur, iteration, calls, True)
+
+        if abs(s_pre) > delta and abs(f_cur) < abs(f_pre):
+            if x_pre == x_blk:
+                # secant
+                s_try = -f_cur * (x_cur - x_pre) / (f_cur - f_pre)
+            else:
+                # inverse quadratic interpolation
+                d_pre = (f_pre - f_cur) / (x_pre - x_cur)
+                d_blk = (f_blk - f_cur) / (x_blk - x_cur)
+                s_try = -f_cur * (f_blk * d_blk - f_pre * d_pre) / (d_blk * d_pre * (f_blk - f_pre))
+            if 2 * abs(s_try) < min(abs(s_pre), 3 * abs(s_bis) - delta):
+                s_pre, s_cur = s_cur, s_try
+            else:
+                s_pre = s_cur = s_bis
+        else:
+            s_pre = s_cur = s_bis
+
+        x_pre, f_pre = x_cur, f_cur
+        if abs(s_cur) > delta:
+            x_cur += s_cur
+        else:
+            x_cur += delta if s_bis > 0 else -delta
+        f_cur, calls = f(x_cur), calls + 1
+    return RootResult(x_cur, maxiter, calls, False)
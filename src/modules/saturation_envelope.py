@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 02:30:00 2026
+
+@author: Wellorzzon Novais
+"""
+
+"""
+Description
+--
+This code has precomputed saturation envelopes, because most of the flashes of a solve are saturation lookups:
+    - lines 4 and 6: TQ of pure ammonia (x = 1)
+    - line 1: PQ at P_6 (Qu_1 = 0, x_1)
+    - line 7: PQ at P_4 (Qu_7 = 0) for every x tried by the x_7 search
+The envelope has:
+    - the saturation curve of pure ammonia: P(T), h(T) and s(T) of saturated liquid and vapor (TQ at any quality)
+    - for each pressure of the cycle (P_4 and P_6), the bubble (Q = 0) and dew (Q = 1) curves T(x), h(x) and s(x)
+as cubic splines (scipy), built once with a few "flash_many" calls of the backend. The splines of T(x) are also
+inverted, so "which x has bubble temperature Temp_3 at P_7" is a direct lookup (saturation_composition) instead of an
+iterative root solve: solve_x_7 and solve_x_7_batch use it when the backend has it.
+
+EnvelopeBackend answers the queries inside the envelope and sends all the others to the wrapped backend:
+    backend = EnvelopeBackend.for_cycle(CycleInputs(), "numpy")
+    solve_cycle(CycleInputs(), backend=backend)
+"""
+
+"""
+Log
+
+--------------------------------------
+Version 0.0.1
+--
+Introduced the saturation envelopes and EnvelopeBackend.
+
+--------------------------------------
+"""
+
+import numpy as np
+
+from modules.property_backend import FlashResult, PropertyBackend, get_backend
+
+
+# Grid of the pure ammonia curve [K] and number of compositions of each pressure (denser near x = 0 and x = 1)
+T_RANGE = (230.0, 405.0)
+N_T = 351
+N_X = 201
+
+# Tolerance [K] and iterations of the inversion of T(x)
+SOLVE_TOL = 1e-9
+SOLVE_MAXITER = 20
+
+# Relative tolerance to consider that a pressure is one of the envelope
+P_RTOL = 1e-10
+
+
+def composition_grid(n=N_X):
+    return (1 - np.cos(np.pi * np.linspace(0, 1, n))) / 2
+
+
+class SaturationEnvelope:
+
+    def __init__(self, backend=None, T_range=T_RANGE, n_T=N_T, n_x=N_X):
+        from scipy.interpolate import CubicSpline
+
+        self._spline = CubicSpline
+        self.backend = get_backend(backend)
+        self.n_x = n_x
+        self.T = np.linspace(T_range[0], T_range[1], n_T)
+        self.pure = {}
+        for Q in (0, 1):
+            flash = self.backend.flash_many("TQ", self.T, Q, 1.0)
+            self.pure[Q] = {"lnP": CubicSpline(self.T, np.log(flash.P)), "h": CubicSpline(self.T, flash.h),
+                            "s": CubicSpline(self.T, flash.s)}
+        self.pressures = np.empty(0)
+        self.curves = [] # one {Q: {"T", "h", "s": spline of x}} per pressure
+
+    def add_pressure(self, P):
+        # Bubble and dew curves at the pressure P (nothing to do if it is already in the envelope)
+        if self.pressure_index(P) is not None:
+            return
+        x = composition_grid(self.n_x)
+        curves = {}
+        for Q in (0, 1):
+            flash = self.backend.flash_many("PQ", P, Q, x)
+            ok = np.isfinite(flash.T) & np.isfinite(flash.h)
+            curves[Q] = {name: self._spline(x[ok], getattr(flash, name)[ok]) for name in ("T", "h", "s")}
+        self.pressures = np.append(self.pressures, float(P))
+        self.curves.append(curves)
+
+    @classmethod
+    def for_cycle(cls, inputs, backend=None, **options):
+        # Envelope with the two pressures of the cycle (from the pure ammonia curve, as lines 4 and 6)
+        envelope = cls(backend, **options)
+        for T, Q in ((inputs.Temp_4, inputs.Qu_4), (inputs.Temp_6, inputs.Qu_6)):
+            envelope.add_pressure(envelope.pure_saturation(T, Q).P)
+        return envelope
+
+    def pressure_index(self, P):
+        close = np.flatnonzero(np.abs(self.pressures - P) <= P_RTOL * abs(P))
+        return int(close[0]) if len(close) else None
+
+    # ----- Queries -----
+
+    def pure_saturation(self, T, Q):
+        # TQ of pure ammonia (any quality between 0 and 1)
+        T, Q = np.asarray(T, float), np.asarray(Q, float)
+        P = np.exp(self.pure[0]["lnP"](T))
+        h = (1 - Q) * self.pure[0]["h"](T) + Q * self.pure[1]["h"](T)
+        s = (1 - Q) * self.pure[0]["s"](T) + Q * self.pure[1]["s"](T)
+        return FlashResult(T, P, h, s, Q)
+
+    def in_pure_range(self, T, Q, x):
+        T, Q, x = np.asarray(T, float), np.asarray(Q, float), np.asarray(x, float)
+        return (x == 1) & (Q >= 0) & (Q <= 1) & (T >= self.T[0]) & (T <= self.T[-1])
+
+    def saturation(self, index, Q, x):
+        # PQ at the pressure of the envelope "index", Q = 0 or 1
+        curves = self.curves[index][int(Q)]
+        x = np.asarray(x, float)
+        return FlashResult(curves["T"](x), np.full(x.shape, self.pressures[index]), curves["h"](x), curves["s"](x), np.full(x.shape, float(Q)))
+
+    def saturation_composition(self, P, Q, T):
+        # x with saturation temperature T at P (Q = 0: bubble, Q = 1: dew); NaN when P or Q are not in the envelope
+        # or T is outside the curve. Scalars or arrays.
+        # The saturation temperature decreases with x, so the root is bracketed by the grid (linear interpolation
+        # as first guess) and refined by Newton's method on the spline.
+        P, Q, T = np.broadcast_arrays(np.asarray(P, float), np.asarray(Q, float), np.asarray(T, float))
+        x = np.full(P.shape, np.nan)
+        for index, pressure in enumerate(self.pressures):
+            for q in (0, 1):
+                here = (np.abs(P - pressure) <= P_RTOL * pressure) & (Q == q)
+                if here.any():
+                    x[here] = self._invert(self.curves[index][q]["T"], T[here])
+        return float(x) if x.ndim == 0 else x
+
+    @staticmethod
+    def _invert(spline, T, tol=SOLVE_TOL, maxiter=SOLVE_MAXITER):
+        x_nodes, T_nodes = spline.x, spline(spline.x)
+        inside = (T >= T_nodes.min()) & (T <= T_nodes.max())
+        x = np.interp(T, T_nodes[::-1], x_nodes[::-1])
+        slope = spline.derivative()
+        for _ in range(maxiter):
+            residual = spline(x) - T
+            if np.all(np.abs(residual[inside]) <= tol):
+                break
+            x = np.clip(x - residual / slope(x), x_nodes[0], x_nodes[-1])
+        inside &= np.abs(spline(x) - T) <= tol
+        return np.where(inside, x, np.nan)
+
+
+class EnvelopeBackend(PropertyBackend):
+
+    def __init__(self, envelope, backend=None):
+        self.envelope = envelope
+        self.backend = get_backend(backend) if backend is not None else envelope.backend
+        self.name = "envelope:" + self.backend.name
+        self.version = self.backend.version
+        self.fluid = self.backend.fluid
+        self.x_range = self.backend.x_range
+
+    @classmethod
+    def for_cycle(cls, inputs, backend=None, **options):
+        return cls(SaturationEnvelope.for_cycle(inputs, backend, **options))
+
+    def load(self):
+        return self.backend.load()
+
+    def fluid_hash(self):
+        return self.backend.fluid_hash()
+
+    def saturation_composition(self, P, Q, T):
+        return self.envelope.saturation_composition(P, Q, T)
+
+    def _lookup(self, pair, value_1, value_2, x):
+        # (mask, values (5, ...)) of the states inside the envelope; the others are NaN
+        value_1, value_2, x = np.broadcast_arrays(np.asarray(value_1, float), np.asarray(value_2, float), np.asarray(x, float))
+        out = np.full((5,) + x.shape, np.nan)
+        done = np.zeros(x.shape, bool)
+        if pair == "TQ":
+            done = self.envelope.in_pure_range(value_1, value_2, x)
+            if done.any():
+                out[:, done] = self.envelope.pure_saturation(value_1[done], value_2[done])
+        elif pair == "PQ":
+            for index, P in enumerate(self.envelope.pressures):
+                for Q in (0, 1):
+                    here = ~done & (np.abs(value_1 - P) <= P_RTOL * P) & (value_2 == Q) & (x >= 0) & (x <= 1)
+                    if here.any():
+                        out[:, here] = self.envelope.saturation(index, Q, x[here])
+                        done |= here
+        return done, out
+
+    def flash_many(self, pair, value_1, value_2, x):
+        self.check_pair(pair)
+        value_1, value_2, x = np.broadcast_arrays(np.asarray(value_1, float), np.asarray(value_2, float), np.asarray(x, float))
+        done, out = self._lookup(pair, value_1, value_2, x)
+        if not done.all():
+            rest = ~done
+            out[:, rest] = self.backend.flash_many(pair, value_1[rest], value_2[rest], x[rest])
+        return FlashResult(*out)
+
+    def flash(self, pair, value_1, value_2, x):
+        self.check_pair(pair)
+        done, out = self._lookup(pair, value_1, value_2, x)
+        if not done:
+            return self.backend.flash(pair, value_1, value_2, x)
+        return FlashResult(*(float(column) for column in out))
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from modules.cycle_solver import CycleInputs
+
+    parser = argparse.ArgumentParser(description="Saturation envelopes of the ARS cycle pressures (accuracy check)")
+    parser.add_argument("--backend", default=None, help="property backend (refprop, numpy or table:<file>)")
+    parser.add_argument("--points", type=int, default=51, help="compositions of the check")
+    args = parser.parse_args()
+
+    envelope = SaturationEnvelope.for_cycle(CycleInputs(), args.backend)
+    x = np.linspace(0.02, 0.98, args.points)
+    for index, P in enumerate(envelope.pressures):
+        for Q, curve in ((0, "bubble"), (1, "dew")):
+            exact = envelope.backend.flash_many("PQ", P, Q, x)
+            approximate = envelope.saturation(index, Q, x)
+            print("P = " + "{:.6g}".format(P) + " Pa, " + curve + ": max |dT| = " + "{:.3g}".format(np.nanmax(np.abs(exact.T - approximate.T)))
+                  + " K; max |dh| = " + "{:.3g}".format(np.nanmax(np.abs(exact.h - approximate.h))) + " J/kg")
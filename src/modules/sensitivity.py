@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 01:00:00 2026
+
+@author: Wellorzzon Novais
+"""
+
+"""
+Description
+--
+This code has the sensitivity mode of the cycle: the Jacobian of the outputs (m_ponto_1 ... m_ponto_8, Q_gen, Q_con,
+Q_abs, COP and x_7) with respect to every input (CycleInputs fields), e.g. dCOP/dTemp_3 or dm_ponto_2/dx_1.
+The outputs are closed-form balances (mass_and_energy_balance.py) of a few state properties, z = (h_1 ... h_8, x_7):
+    out = balances(z, Q_eva, x_1)
+so the Jacobian is the chain rule
+    d out / d input = d balances / d z * d z / d input + (direct derivative for Q_eva and x_1)
+    - d balances / d z, Q_eva, x_1: complex step of the balance equations (exact to machine precision)
+    - d z / d input: finite differences of the state points, all the perturbed operating points of all the base points
+      in one batch solve (central differences; one sided for qualities at 0 or 1)
+    - inputs that do not reach any flash (Q_eva, eff_p; see incremental.py) are not solved again
+    - the property backend is cached, so the lines that an input does not change (e.g. lines 4 and 6 when Temp_3 is
+      perturbed) are not evaluated again
+
+Running from the src folder:
+    python -m modules.sensitivity --backend numpy
+"""
+
+"""
+Log
+
+--------------------------------------
+Version 0.0.1
+--
+Introduced the sensitivity (Jacobian) report.
+
+--------------------------------------
+"""
+
+from dataclasses import dataclass, fields, replace
+
+import numpy as np
+
+import modules.mass_and_energy_balance as meb
+from modules.cycle_solver import CycleInputs
+from modules.incremental import dependents
+
+
+INPUT_NAMES = tuple(f.name for f in fields(CycleInputs))
+OUTPUT_NAMES = tuple("m_ponto_" + str(i) for i in range(1, 9)) + ("Q_gen", "Q_con", "Q_abs", "COP", "x_7")
+
+# Finite difference steps of the inputs that change the state points
+STEPS = {"Temp_3": 1e-3, "Temp_4": 1e-3, "Temp_6": 1e-3, "x_1": 1e-5, "Qu_1": 1e-5, "Qu_4": 1e-5, "Qu_6": 1e-5, "Qu_7": 1e-5}
+
+# Step of the complex step derivatives
+COMPLEX_STEP = 1e-30
+
+
+def balances(z, Q_eva, x_1):
+    # Outputs (OUTPUT_NAMES) from z = (h_1 ... h_8, x_7), the same steps 8 - 14 of solve_cycle (works with complex numbers)
+    h = {i: z[i - 1] for i in range(1, 9)}
+    x_7 = z[8]
+    m_ponto_6 = meb.m_ponto_calc_eva(Q_eva, h[5], h[6])
+    m_ponto_3 = m_ponto_6
+    m_ponto_7 = meb.m_ponto_low_outlet_calc_gen(m_ponto_3, x_1, 1, x_7)
+    m_ponto_2 = meb.m_ponto_inlet_calc_gen(m_ponto_3, m_ponto_7)
+    Q_gen = meb.Q_gen_calc(m_ponto_3, h[3], m_ponto_7, h[7], m_ponto_2, h[2])
+    Q_con = meb.Q_con_calc(m_ponto_3, h[3], h[4])
+    Q_abs = meb.Q_abs_calc(m_ponto_2, h[1], m_ponto_6, h[6], m_ponto_7, h[8])
+    return np.array([m_ponto_2, m_ponto_2, m_ponto_3, m_ponto_3, m_ponto_3, m_ponto_6, m_ponto_7, m_ponto_7,
+                     Q_gen, Q_con, Q_abs, Q_eva / Q_gen, x_7])
+
+
+def balances_jacobian(z, Q_eva, x_1):
+    # Complex step derivatives of "balances" with respect to (z, Q_eva, x_1): array (outputs, 11)
+    arguments = np.concatenate([np.asarray(z, float), [Q_eva, x_1]])
+    jacobian = np.empty((len(OUTPUT_NAMES), len(arguments)))
+    for k in range(len(arguments)):
+        perturbed = arguments.astype(complex)
+        perturbed[k] += 1j * COMPLEX_STEP
+        jacobian[:, k] = balances(perturbed[:9], perturbed[9], perturbed[10]).imag / COMPLEX_STEP
+    return jacobian
+
+
+def flash_inputs():
+    # Inputs that change at least one flash (the others only reach the balances, or nothing)
+    return tuple(name for name in INPUT_NAMES if set(dependents([name])) - {"balances"})
+
+
+@dataclass
+class SensitivityResult:
+    points: list # base CycleInputs
+    outputs: np.ndarray # (points, outputs) values at the base points
+    jacobian: np.ndarray # (points, outputs, inputs)
+    feasible: np.ndarray # (points,) bool
+    solves: int # cycle solves (base and perturbed points)
+    output_names: tuple = OUTPUT_NAMES
+    input_names: tuple = INPUT_NAMES
+
+    def derivative(self, output, input, point=0):
+        return self.jacobian[point, self.output_names.index(output), self.input_names.index(input)]
+
+    def table(self, point=0):
+        from tabulate import tabulate
+
+        rows = [[name] + ['%.4g' % value for value in self.jacobian[point, i]] for i, name in enumerate(self.output_names)]
+        return tabulate(rows, headers=["d out / d in"] + list(self.input_names))
+
+
+def sensitivity(points=None, backend=None, cache_size=100000):
+    # Jacobian of the outputs at each base point (a CycleInputs or a list of them)
+    from modules.batch_solver import inputs_from_list, solve_cycle_batch
+    from modules.property_backend import get_backend
+    from modules.property_cache import CachedBackend
+
+    if points is None or isinstance(points, CycleInputs):
+        points = [points or CycleInputs()]
+    points = list(points)
+    backend = get_backend(backend)
+    if cache_size:
+        backend = CachedBackend(backend, maxsize=cache_size)
+    perturbed_inputs = flash_inputs()
+
+    # Base points and all the perturbed points in one batch: (base, input, sign) -> row
+    candidates, rows, steps = list(points), {}, {}
+    for b, base in enumerate(points):
+        for name in perturbed_inputs:
+            value, step = getattr(base, name), STEPS.get(name, 1e-6 * max(abs(getattr(base, name)), 1.0))
+            signs = (1, -1)
+            if name.startswith("Qu_"):
+                signs = tuple(sign for sign in signs if 0 <= value + sign * step <= 1)
+            steps[b, name] = step
+            for sign in signs:
+                rows[b, name, sign] = len(candidates)
+                candidates.append(replace(base, **{name: value + sign * step}))
+    batch = solve_cycle_batch(inputs_from_list(candidates), backend=backend)
+    z = np.concatenate([batch.h, batch.x_7[:, None]], axis=1)
+
+    outputs = np.full((len(points), len(OUTPUT_NAMES)), np.nan)
+    jacobian = np.full((len(points), len(OUTPUT_NAMES), len(INPUT_NAMES)), np.nan)
+    feasible = np.zeros(len(points), bool)
+    for b, base in enumerate(points):
+        if not batch.feasible[b]:
+            continue
+        feasible[b] = True
+        outputs[b] = balances(z[b], base.Q_eva, base.x_1)
+        d_balances = balances_jacobian(z[b], base.Q_eva, base.x_1)
+        for j, name in enumerate(INPUT_NAMES):
+            if name in perturbed_inputs:
+                plus, minus = rows.get((b, name, 1)), rows.get((b, name, -1))
+                if plus is not None and minus is not None:
+                    dz = (z[plus] - z[minus]) / (2 * steps[b, name])
+                else:
+                    dz = (z[plus] - z[b]) / steps[b, name] if plus is not None else (z[b] - z[minus]) / steps[b, name]
+                jacobian[b, :, j] = d_balances[:, :9] @ dz
+            else:
+                jacobian[b, :, j] = 0.0
+            # Direct dependence of the balances on the input
+            if name == "Q_eva":
+                jacobian[b, :, j] += d_balances[:, 9]
+            elif name == "x_1":
+                jacobian[b, :, j] += d_balances[:, 10]
+    return SensitivityResult(points, outputs, jacobian, feasible, len(candidates))
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Sensitivity (Jacobian) of the ARS cycle outputs")
+    parser.add_argument("--backend", default=None, help="property backend (refprop, numpy or table:<file>)")
+    args = parser.parse_args()
+
+    result = sensitivity(backend=args.backend)
+    print(result.table())
+    print("(" + str(result.solves) + " cycle solves in one batch)")
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 02:00:00 2026
+
+@author: Wellorzzon Novais
+"""
+
+"""
+Description
+--
+This code has a small local service (HTTP on localhost, asyncio, no extra packages) around the batch solver, so the
+tools that need cycle solves share warm property backends instead of starting their own script and RefProp:
+    - POST /solve with a JSON object of CycleInputs fields (or a list of them) -> JSON result(s)
+    - GET /stats -> requests, batches, deduplicated requests, queue depth and latency percentiles
+Infeasible operating points (e.g. no x_7 below x_1) get "feasible": false and null values. Malformed requests get
+the status 400 (and the connection is closed), errors of the solver 500.
+Requests that arrive together (within "batch_window" seconds, up to "max_batch" points) are solved as one batch
+(solve_cycle_batch); identical operating points in flight are solved once and all their requests get the result.
+The batches run in a worker thread (processes=1, one backend in this process) or in a process pool where each
+worker loads its backend once (processes > 1, as the parallel sweeps).
+
+Running from the src folder:
+    python -m modules.service --backend numpy --port 8765
+    curl -X POST localhost:8765/solve -d '{"Temp_3": 380}'
+"""
+
+"""
+Log
+
+--------------------------------------
+Version 0.0.1
+--
+Introduced the local solve service with request coalescing and deduplication.
+
+--------------------------------------
+Version 0.0.2
+--
+Status 400 for malformed request lines, headers and bodies, 500 for the other errors, and null values for the
+infeasible points.
+
+--------------------------------------
+"""
+
+import asyncio
+import json
+import time
+from collections import deque
+from dataclasses import fields
+
+import numpy as np
+
+from modules.cycle_solver import CycleInputs
+
+
+INPUT_NAMES = tuple(f.name for f in fields(CycleInputs))
+DEFAULT_PORT = 8765
+LATENCY_WINDOW = 10000 # last requests used for the percentiles
+
+
+def _solve_points(points):
+    # Runs in the worker (thread or process): BatchResult of a list of CycleInputs, with the worker backend
+    import modules.sweep as sweep
+
+    return sweep._solve_batch_chunk((0, points))[1]
+
+
+def _point_result(batch, i):
+    # JSON result of the point i of a BatchResult (null values when it is infeasible: its states are not a cycle)
+    feasible = bool(batch.feasible[i])
+
+    def value(v):
+        v = float(v)
+        return v if feasible and np.isfinite(v) else None
+
+    points = {str(j + 1): {name: value(getattr(batch, name)[i, j]) for name in ("P", "T", "x", "Q", "h", "s", "m_ponto")}
+              for j in range(8)}
+    for j in range(8):
+        points[str(j + 1)]["phase"] = int(batch.phase[i, j]) if feasible else None
+    return {"feasible": feasible, "Q_gen": value(batch.Q_gen[i]), "Q_con": value(batch.Q_con[i]),
+            "Q_abs": value(batch.Q_abs[i]), "COP": value(batch.COP[i]), "x_7": value(batch.x_7[i]), "points": points}
+
+
+class SolveService:
+
+    def __init__(self, backend=None, processes=1, max_batch=1024, batch_window=0.002):
+        self.backend = backend
+        self.processes = processes
+        self.max_batch = max_batch
+        self.batch_window = batch_window
+        self._pending = [] # [(key, CycleInputs)] waiting for the next batch
+        self._inflight = {} # {key: future} pending or being solved
+        self._flush_task = None
+        self._executor = None
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.requests = self.batches = self.batch_points = self.deduplicated = 0
+        self.solving = 0
+
+    def start(self):
+        import concurrent.futures
+        import modules.sweep as sweep
+
+        if self.processes == 1:
+            # One thread, so the backend (RefProp DLL) is never called by two threads at the same time
+            self._executor = concurrent.futures.ThreadPoolExecutor(1, initializer=sweep._init_worker, initargs=(self.backend, 0))
+        else:
+            self._executor = concurrent.futures.ProcessPoolExecutor(self.processes, initializer=sweep._init_worker, initargs=(self.backend, 0))
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+
+    async def solve(self, inputs):
+        # Result (dictionary) of one operating point
+        start = time.perf_counter()
+        self.requests += 1
+        key = tuple(getattr(inputs, name) for name in INPUT_NAMES)
+        future = self._inflight.get(key)
+        if future is not None:
+            self.deduplicated += 1
+        else:
+            future = asyncio.get_running_loop().create_future()
+            self._inflight[key] = future
+            self._pending.append((key, inputs))
+            if len(self._pending) >= self.max_batch:
+                self._flush_now()
+            elif self._flush_task is None:
+                self._flush_task = asyncio.ensure_future(self._flush_later())
+        try:
+            return await asyncio.shield(future)
+        finally:
+            self.latencies.append(time.perf_counter() - start)
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.batch_window)
+        self._flush_task = None
+        self._flush_now()
+
+    def _flush_now(self):
+        while self._pending:
+            batch, self._pending = self._pending[:self.max_batch], self._pending[self.max_batch:]
+            asyncio.ensure_future(self._run_batch(batch))
+
+    async def _run_batch(self, batch):
+        keys = [key for key, _ in batch]
+        self.batches += 1
+        self.batch_points += len(batch)
+        self.solving += len(batch)
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(self._executor, _solve_points, [inputs for _, inputs in batch])
+            for i, key in enumerate(keys):
+                self._inflight.pop(key).set_result(_point_result(result, i))
+        except Exception as error:
+            for key in keys:
+                future = self._inflight.pop(key, None)
+                if future is not None and not future.done():
+                    future.set_exception(error)
+        finally:
+            self.solving -= len(batch)
+
+    def stats(self):
+        latencies = np.array(self.latencies) * 1000
+        percentiles = {"p" + str(p): float(np.percentile(latencies, p)) if len(latencies) else None for p in (50, 90, 99)}
+        return {"requests": self.requests, "batches": self.batches, "deduplicated": self.deduplicated,
+                "mean_batch_size": self.batch_points / self.batches if self.batches else None,
+                "queue_depth": len(self._pending), "solving": self.solving, "latency_ms": percentiles,
+                "backend": self.backend, "processes": self.processes}
+
+
+# ==========================================================================
+# HTTP
+# ==========================================================================
+
+def _inputs_from_json(data):
+    unknown = set(data) - set(INPUT_NAMES)
+    if unknown:
+        raise ValueError("Unknown inputs: " + ", ".join(sorted(unknown)))
+    return CycleInputs(**{name: float(value) for name, value in data.items()})
+
+
+async def _respond(writer, status, body, close=False):
+    text = json.dumps(body).encode()
+    reason = {200: "OK", 400: "Bad Request", 404: "Not Found", 500: "Internal Server Error"}[status]
+    writer.write(("HTTP/1.1 " + str(status) + " " + reason + "\r\nContent-Type: application/json\r\nContent-Length: "
+                  + str(len(text)) + ("\r\nConnection: close" if close else "") + "\r\n\r\n").encode() + text)
+    await writer.drain()
+
+
+async def _read_request(reader, request_line):
+    # (method, path, headers, body); ValueError when the request is malformed
+    method, path, _ = request_line.decode().split(" ", 2)
+    headers = {}
+    while True:
+        line = (await reader.readline()).decode().strip()
+        if not line:
+            break
+        name, separator, value = line.partition(":")
+        if not separator:
+            raise ValueError("Malformed header: " + line)
+        headers[name.strip().lower()] = value.strip()
+    length = int(headers.get("content-length", 0))
+    if length < 0:
+        raise ValueError("Negative Content-Length")
+    return method, path, headers, await reader.readexactly(length)
+
+
+async def handle_connection(service, reader, writer):
+    # HTTP/1.1 with keep-alive; one request at a time per connection
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                break
+            try:
+                method, path, headers, body = await _read_request(reader, request_line)
+            except ValueError as error: # the rest of the stream can not be trusted: the connection is closed
+                await _respond(writer, 400, {"error": "Malformed request: " + str(error)}, close=True)
+                break
+
+            if method == "GET" and path == "/stats":
+                await _respond(writer, 200, service.stats())
+            elif method == "POST" and path == "/solve":
+                try:
+                    data = json.loads(body or b"{}")
+                    inputs = [_inputs_from_json(item) for item in data] if isinstance(data, list) else _inputs_from_json(data)
+                except (ValueError, TypeError) as error:
+                    await _respond(writer, 400, {"error": str(error)})
+                else:
+                    try:
+                        if isinstance(inputs, list):
+                            result = await asyncio.gather(*(service.solve(item) for item in inputs))
+                        else:
+                            result = await service.solve(inputs)
+                    except Exception as error:
+                        await _respond(writer, 500, {"error": type(error).__name__ + ": " + str(error)})
+                    else:
+                        await _respond(writer, 200, result)
+            else:
+                await _respond(writer, 404, {"error": "use POST /solve or GET /stats"})
+            if headers.get("connection", "").lower() == "close":
+                break
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(backend=None, host="127.0.0.1", port=DEFAULT_PORT, processes=1, max_batch=1024, batch_window=0.002):
+    service = SolveService(backend, processes, max_batch, batch_window)
+    service.start()
+    server = await asyncio.start_server(lambda reader, writer: handle_connection(service, reader, writer), host, port)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Local solve service of the ARS cycle")
+    parser.add_argument("--backend", default=None, help="property backend (refprop, numpy or table:<file>)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--processes", type=int, default=1)
+    parser.add_argument("--max-batch", type=int, default=1024)
+    parser.add_argument("--batch-window", type=float, default=0.002, help="[s]")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args.backend, args.host, args.port, args.processes, args.max_batch, args.batch_window))
+    except KeyboardInterrupt:
+        pass
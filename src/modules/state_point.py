@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 11:00:00 2026
+
+@author: Wellorzzon Novais
+"""
+
+"""
+Description
+--
+This code has the state point representation used by the cycle solver:
+    - StatePoint (P, T, x, Q, h, s, mass flow rate and phase)
+    - phase of a point from its vapor quality (so only one property call is needed per point); a quality that is not a
+      finite number (failed flash) has the UNKNOWN phase code (-1) instead of a phase
+    - FlashCounter, the number of property calls (flashes) per input pair in a solve
+"""
+
+"""
+Log
+
+--------------------------------------
+Version 0.0.1
+--
+Phase taken from the quality of the same call (RefProp returns q < 0 for subcooled and q > 1 for superheated states),
+instead of a second "PHASE" call at every line.
+
+--------------------------------------
+Version 0.0.2
+--
+NaN and infinite qualities get the UNKNOWN phase code (-1, "Unknown") instead of superheated/subcooled.
+
+--------------------------------------
+"""
+
+import math
+from collections import Counter
+from dataclasses import dataclass
+
+
+# Input pairs used in the cycle
+PAIRS = ("TQ", "PT", "PQ", "PH", "PS")
+
+# Phase codes (index) and names
+PHASE_NAMES = ("Subcooled", "Saturated liquid", "Two-phase", "Saturated vapor", "Superheated")
+SUBCOOLED, SATURATED_LIQUID, TWO_PHASE, SATURATED_VAPOR, SUPERHEATED = range(5)
+
+# Phase code and name of a quality that is not a finite number (failed or unsolved state)
+UNKNOWN = -1
+UNKNOWN_PHASE = "Unknown"
+
+# Tolerance to consider a quality as saturated liquid (0) or saturated vapor (1)
+QUALITY_TOL = 1e-9
+
+
+def phase_code_from_quality(Q):
+    # (RefProp convention) Q < 0: subcooled liquid; 0 <= Q <= 1: saturated; Q > 1: superheated vapor
+    if not math.isfinite(Q):
+        return UNKNOWN
+    if Q < -QUALITY_TOL:
+        return SUBCOOLED
+    if Q <= QUALITY_TOL:
+        return SATURATED_LIQUID
+    if Q < 1 - QUALITY_TOL:
+        return TWO_PHASE
+    if Q <= 1 + QUALITY_TOL:
+        return SATURATED_VAPOR
+    return SUPERHEATED
+
+
+def phase_code_array(Q):
+    # Same as phase_code_from_quality, for NumPy arrays (int8 codes)
+    import numpy as np
+
+    Q = np.asarray(Q, float)
+    code = np.select([Q < -QUALITY_TOL, Q <= QUALITY_TOL, Q < 1 - QUALITY_TOL, Q <= 1 + QUALITY_TOL],
+                     [SUBCOOLED, SATURATED_LIQUID, TWO_PHASE, SATURATED_VAPOR], SUPERHEATED)
+    return np.where(np.isfinite(Q), code, UNKNOWN).astype(np.int8)
+
+
+def phase_from_quality(Q):
+    code = phase_code_from_quality(Q)
+    return UNKNOWN_PHASE if code == UNKNOWN else PHASE_NAMES[code]
+
+
+@dataclass
+class StatePoint:
+    P: float # [Pa]
+    T: float # [K]
+    x: float # [-]
+    Q: float # [-]
+    h: float # [J/kg]
+    s: float # [J/(kg.K)]
+    m_ponto: float = float('nan') # [kg/s]
+    phase: str = ''
+
+
+class FlashCounter(Counter):
+    # Number of property calls (flashes) per input pair, e.g. FlashCounter({'TQ': 2, 'PQ': 9, ...})
+
+    def add(self, pair, n=1):
+        self[pair] += n
+
+    @property
+    def total_flashes(self):
+        return sum(self.values())
+
+    def as_dict(self):
+        # All pairs of the cycle, including the ones not called
+        return {pair: self[pair] for pair in PAIRS}
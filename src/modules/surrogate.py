@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 03:00:00 2026
+
+@author: Wellorzzon Novais
+"""
+
+"""
+Description
+--
+This code has a surrogate (trained approximation) of the whole cycle, for screening and machine learning work that
+needs many more evaluations than the solver can give:
+    (Temp_3, Temp_4, Temp_6, x_1, Q_eva) -> m_ponto_1 ... m_ponto_8, Q_gen, Q_con, Q_abs, COP, x_7
+(the other inputs are fixed at "base", the CycleInputs default).
+    - data: the exact batch solver over a Latin hypercube of the inputs inside "bounds" (generate_data)
+    - model: the mass flows have a pole where x_7 reaches x_1 and are proportional to Q_eva, so they are not fitted
+      directly. The fitted quantities are the smooth state properties z = (h_1 ... h_8, x_7), functions of
+      (Temp_3, Temp_4, Temp_6, x_1) only, and the outputs come from z by the exact balances (sensitivity.balances).
+      z is a polynomial of total degree "degree" on the inputs scaled to [-1, 1] (products of Legendre polynomials,
+      well conditioned), fitted by least squares on the feasible samples; pure NumPy, and the prediction of a batch is
+      one matrix product and the balances
+    - validity domain: the training box; also, points predicted near the feasibility limit (x_7 near 0 or x_1), where
+      the surrogate cannot tell feasible from infeasible, are outside the domain
+    - Surrogate.evaluate predicts inside the domain and solves the other points with the exact solver
+The held-out samples ("holdout" fraction) are not used in the fit; the errors of each output on the held-out samples
+inside the validity domain are in Surrogate.errors (maximum, RMS and RMS relative to the range of the output).
+
+Running from the src folder:
+    python -m modules.surrogate --backend numpy --samples 20000 --degree 4 --output surrogate.npz
+"""
+
+"""
+Log
+
+--------------------------------------
+Version 0.0.1
+--
+Introduced the polynomial surrogate of the cycle, its data generator and the validity domain.
+
+--------------------------------------
+Version 0.0.2
+--
+The data generator takes the property cache size and a sweep.SweepPool kept by the caller (processes > 1).
+
+--------------------------------------
+"""
+
+import contextlib
+import json
+from dataclasses import asdict, fields
+
+import numpy as np
+
+from modules.cycle_solver import CycleInputs
+from modules.sensitivity import OUTPUT_NAMES, balances
+
+
+SURROGATE_INPUTS = ("Temp_3", "Temp_4", "Temp_6", "x_1", "Q_eva")
+SURROGATE_OUTPUTS = OUTPUT_NAMES
+
+# Inputs of the fitted state properties (z does not depend on Q_eva)
+FIT_INPUTS = ("Temp_3", "Temp_4", "Temp_6", "x_1")
+FIT_COLUMNS = [SURROGATE_INPUTS.index(name) for name in FIT_INPUTS]
+
+# Training box of the inputs
+DEFAULT_BOUNDS = {
+    "Temp_3": (360.0, 400.0), # [K]
+    "Temp_4": (303.15, 318.15), # [K]
+    "Temp_6": (258.15, 273.15), # [K]
+    "x_1": (0.38, 0.48), # [-]
+    "Q_eva": (2000.0, 10000.0), # [W]
+}
+
+DEFAULT_DEGREE = 4
+
+# Distance [-] of the predicted x_7 to the feasibility limits (0 and x_1) below which the exact solver is used
+X_7_MARGIN = 0.01
+
+
+def outputs_from_states(Z, X):
+    # Outputs (n, SURROGATE_OUTPUTS) from the state properties Z (n, 9) and the inputs X (n, SURROGATE_INPUTS)
+    Q_eva, x_1 = X[:, SURROGATE_INPUTS.index("Q_eva")], X[:, SURROGATE_INPUTS.index("x_1")]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return balances(Z.T, Q_eva, x_1).T
+
+
+def batch_states(batch):
+    # State properties z = (h_1 ... h_8, x_7) of a BatchResult: (n, 9)
+    return np.concatenate([batch.h, np.asarray(batch.x_7, float)[:, None]], axis=1)
+
+
+def generate_data(bounds=None, samples=20000, backend=None, base=None, seed=0, processes=1, cache_size=100000,
+                  pool=None):
+    # Exact solves over a Latin hypercube of the inputs: (X (n, SURROGATE_INPUTS), Z (n, 9) states, feasible).
+    # processes > 1 solves them in "pool" (a sweep.SweepPool the caller keeps, e.g. for several trainings) or in a
+    # SweepPool of the backend name started for this call; the workers have a property cache of cache_size states.
+    from modules.batch_solver import solve_cycle_batch
+    from modules.property_backend import get_backend
+    from modules.property_cache import CachedBackend
+    from modules.uncertainty import sample_inputs
+
+    bounds = dict(bounds or DEFAULT_BOUNDS)
+    base = base or CycleInputs()
+    distributions = {name: {"dist": "uniform", "low": low, "high": high} for name, (low, high) in bounds.items()}
+    columns = sample_inputs(distributions, samples, "lhs", np.random.default_rng(seed))
+    X = np.stack([columns[name] for name in SURROGATE_INPUTS], axis=1)
+    inputs = {f.name: columns.get(f.name, np.full(samples, getattr(base, f.name))) for f in fields(CycleInputs)}
+    if processes == 1 and pool is None:
+        backend = CachedBackend(get_backend(backend), maxsize=cache_size) if cache_size else get_backend(backend)
+        batch = solve_cycle_batch(inputs, backend=backend)
+    else:
+        from modules.sweep import SweepPool, run_batch_sweep
+
+        points = [CycleInputs(**{name: float(column[i]) for name, column in inputs.items()}) for i in range(samples)]
+        with (SweepPool(backend, processes, cache_size) if pool is None else contextlib.nullcontext(pool)) as pool:
+            batch = run_batch_sweep(points, chunksize=max(samples // pool.processes, 1), pool=pool)
+    Z = batch_states(batch)
+    feasible = batch.feasible & np.all(np.isfinite(Z), axis=1)
+    return X, Z, feasible
+
+
+def polynomial_exponents(dimensions, degree):
+    # Exponents (terms, dimensions) of all the monomials of total degree <= degree
+    exponents = [()]
+    for _ in range(dimensions):
+        exponents = [e + (k,) for e in exponents for k in range(degree + 1 - sum(e))]
+    return np.array(sorted(exponents, key=lambda e: (sum(e), e)), int)
+
+
+class Surrogate:
+
+    def __init__(self, bounds, degree, coefficients, z_mean, z_scale, base=None, errors=None, coverage=None):
+        self.bounds = {name: tuple(float(v) for v in bounds[name]) for name in SURROGATE_INPUTS}
+        self.degree = int(degree)
+        self.exponents = polynomial_exponents(len(FIT_INPUTS), self.degree)
+        self.coefficients = np.asarray(coefficients, float) # (terms, 9)
+        self.z_mean = np.asarray(z_mean, float)
+        self.z_scale = np.asarray(z_scale, float)
+        self.base = base or CycleInputs()
+        self.errors = errors or {} # {output: {"max", "rms", "rms_relative"}} on the held-out samples
+        self.coverage = coverage # fraction of the held-out feasible samples inside the validity domain
+        self._low = np.array([self.bounds[name][0] for name in SURROGATE_INPUTS])
+        self._high = np.array([self.bounds[name][1] for name in SURROGATE_INPUTS])
+
+    def scale(self, X):
+        return 2 * (np.asarray(X, float) - self._low) / (self._high - self._low) - 1
+
+    def features(self, X):
+        # Products of Legendre polynomials of the scaled inputs: (n, terms)
+        from numpy.polynomial.legendre import legvander
+
+        U = self.scale(X)[:, FIT_COLUMNS]
+        features = np.ones((U.shape[0], len(self.exponents)))
+        for d in range(U.shape[1]):
+            features *= legvander(U[:, d], self.degree)[:, self.exponents[:, d]]
+        return features
+
+    def predict_states(self, X):
+        # State properties z (n, 9) at the inputs X (n, SURROGATE_INPUTS)
+        return self.features(np.atleast_2d(X)) @ self.coefficients * self.z_scale + self.z_mean
+
+    def predict_array(self, X):
+        # (n, SURROGATE_OUTPUTS) at the inputs X (n, SURROGATE_INPUTS)
+        X = np.atleast_2d(np.asarray(X, float))
+        return outputs_from_states(self.predict_states(X), X)
+
+    def predict(self, X):
+        return dict(zip(SURROGATE_OUTPUTS, self.predict_array(X).T))
+
+    def in_domain(self, X, Y=None):
+        # Points inside the training box and not near the feasibility limit (predicted x_7 inside (0, x_1))
+        X = np.atleast_2d(np.asarray(X, float))
+        Y = self.predict_array(X) if Y is None else Y
+        x_7, x_1 = Y[:, SURROGATE_OUTPUTS.index("x_7")], X[:, SURROGATE_INPUTS.index("x_1")]
+        inside = np.all((X >= self._low) & (X <= self._high), axis=1)
+        return inside & (x_7 > X_7_MARGIN) & (x_7 < x_1 - X_7_MARGIN)
+
+    def evaluate(self, X, backend=None):
+        # Outputs at X: the surrogate inside the validity domain, the exact solver (backend) outside.
+        # Returns ({output: array (n,)}, exact (n,) bool); infeasible exact points are NaN.
+        from modules.batch_solver import solve_cycle_batch
+
+        X = np.atleast_2d(np.asarray(X, float))
+        Y = self.predict_array(X)
+        exact = ~self.in_domain(X, Y)
+        if exact.any():
+            inputs = {f.name: np.full(int(exact.sum()), getattr(self.base, f.name)) for f in fields(CycleInputs)}
+            inputs.update({name: X[exact, i] for i, name in enumerate(SURROGATE_INPUTS)})
+            batch = solve_cycle_batch(inputs, backend=backend)
+            Y[exact] = np.where(batch.feasible[:, None], outputs_from_states(batch_states(batch), X[exact]), np.nan)
+        return dict(zip(SURROGATE_OUTPUTS, Y.T)), exact
+
+    # ----- Files -----
+
+    def save(self, path):
+        np.savez(path, bounds=json.dumps(self.bounds), degree=self.degree, coefficients=self.coefficients,
+                 z_mean=self.z_mean, z_scale=self.z_scale, base=json.dumps(asdict(self.base)), errors=json.dumps(self.errors),
+                 coverage=np.nan if self.coverage is None else self.coverage)
+
+    @classmethod
+    def load(cls, path):
+        data = np.load(path)
+        return cls(json.loads(str(data["bounds"])), int(data["degree"]), data["coefficients"], data["z_mean"],
+                   data["z_scale"], CycleInputs(**json.loads(str(data["base"]))), json.loads(str(data["errors"])),
+                   None if np.isnan(data["coverage"]) else float(data["coverage"]))
+
+    def error_table(self):
+        from tabulate import tabulate
+
+        rows = [[name] + ['%.4g' % value for value in errors.values()] for name, errors in self.errors.items()]
+        return tabulate(rows, headers=["Output"] + list(next(iter(self.errors.values()))))
+
+
+def fit_surrogate(X, Z, feasible=None, bounds=None, degree=DEFAULT_DEGREE, holdout=0.2, ridge=1e-10, base=None, seed=0):
+    # Least squares fit of the polynomial on the feasible samples, minus the held-out fraction used for the errors
+    bounds = dict(bounds or DEFAULT_BOUNDS)
+    feasible = np.all(np.isfinite(Z), axis=1) if feasible is None else feasible
+    X, Z = X[feasible], Z[feasible]
+    order = np.random.default_rng(seed).permutation(len(X))
+    n_test = int(round(holdout * len(X)))
+    test, train = order[:n_test], order[n_test:]
+
+    z_mean, z_scale = Z[train].mean(axis=0), Z[train].std(axis=0)
+    z_scale[z_scale == 0] = 1.0
+    surrogate = Surrogate(bounds, degree, None, z_mean, z_scale, base)
+    if len(train) < len(surrogate.exponents):
+        raise ValueError("Not enough feasible samples (" + str(len(train)) + ") for the " + str(len(surrogate.exponents))
+                         + " terms of a degree " + str(degree) + " polynomial")
+    A = surrogate.features(X[train])
+    B = (Z[train] - z_mean) / z_scale
+    # Normal equations with a small ridge (the Legendre features are well conditioned)
+    surrogate.coefficients = np.linalg.solve(A.T @ A + ridge * len(train) * np.eye(A.shape[1]), A.T @ B)
+
+    # Errors of the outputs on the held-out samples where the surrogate is used (inside the validity domain)
+    if n_test:
+        X_test = X[test]
+        predicted = surrogate.predict_array(X_test)
+        used = surrogate.in_domain(X_test, predicted)
+        exact = outputs_from_states(Z[test], X_test)
+        residual = (predicted - exact)[used]
+        value_range = exact[used].max(axis=0) - exact[used].min(axis=0) if used.any() else np.zeros(exact.shape[1])
+        for k, name in enumerate(SURROGATE_OUTPUTS):
+            if not used.any():
+                break
+            rms = float(np.sqrt(np.mean(residual[:, k] ** 2)))
+            surrogate.errors[name] = {"max": float(np.abs(residual[:, k]).max()), "rms": rms,
+                                      "rms_relative": rms / value_range[k] if value_range[k] else 0.0}
+        surrogate.coverage = float(used.mean())
+    return surrogate
+
+
+def train_surrogate(bounds=None, samples=20000, backend=None, degree=DEFAULT_DEGREE, holdout=0.2, base=None, seed=0,
+                    processes=1, cache_size=100000, pool=None):
+    # Data generation and fit
+    X, Z, feasible = generate_data(bounds, samples, backend, base, seed, processes, cache_size, pool)
+    return fit_surrogate(X, Z, feasible, bounds, degree, holdout, base=base, seed=seed)
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Surrogate model of the ARS cycle")
+    parser.add_argument("--backend", default=None, help="property backend (refprop, numpy or table:<file>)")
+    parser.add_argument("--samples", type=int, default=20000)
+    parser.add_argument("--degree", type=int, default=DEFAULT_DEGREE)
+    parser.add_argument("--holdout", type=float, default=0.2)
+    parser.add_argument("--processes", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help=".npz file of the trained surrogate")
+    args = parser.parse_args()
+
+    surrogate = train_surrogate(samples=args.samples, backend=args.backend, degree=args.degree, holdout=args.holdout,
+                                seed=args.seed, processes=args.processes)
+    print(surrogate.error_table())
+    print("Held-out feasible points inside the validity domain: " + "{:.1%}".format(surrogate.coverage))
+    X = np.stack([np.random.default_rng(1).uniform(*DEFAULT_BOUNDS[name], size=100000) for name in SURROGATE_INPUTS], axis=1)
+    start = time.perf_counter()
+    surrogate.predict_array(X)
+    print("Prediction: " + "{:.3g}".format((time.perf_counter() - start) / len(X) * 1e6) + " us per point (batch of " + str(len(X)) + ")")
+    if args.output:
+        surrogate.save(args.output)
+        print("Saved: " + args.output)
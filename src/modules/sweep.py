@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 15:00:00 2026
+
+@author: Wellorzzon Novais
+"""
+
+"""
+Description
+--
+This code has the definition and the parallel execution of parametric sweeps of the cycle.
+A sweep definition is a dictionary (or a JSON file) with fields of CycleInputs, each one being:
+    - a number: the same value for all the points
+    - a list: the values of that field
+    - {"start": ..., "stop": ..., "num": ...}: "num" equally spaced values (stop included)
+The operating points are all the combinations (grid) of the fields, in the order they are written, e.g.:
+    {"Temp_3": {"start": 360, "stop": 400, "num": 5}, "Temp_6": [258.15, 263.15], "x_1": 0.43}
+
+The operating points are spread over a process pool:
+    - each worker creates its property backend once, in the pool initializer (the RefProp DLL is not thread-safe, so
+      there is one backend per process and no threads)
+    - the points are sent in chunks, to keep the communication small compared with the solves
+    - run_sweep solves each point with solve_cycle and returns the CycleResult (or the error) of each point in the
+      input order; run_batch_sweep solves each chunk with solve_cycle_batch and returns one BatchResult
+    - SweepPool keeps the workers (their backends and property caches) for many sweeps: the callers that solve in
+      steps (chunks of a large sweep, iterations of an optimizer, refinement levels...) create one pool for their
+      whole run and pass it to run_sweep / run_batch_sweep ("pool"), so the workers are never started cold again
+    - the backend is created and loaded in this process before the pool starts, so a wrong backend name or a missing
+      property library raises at once; a worker that fails anyway raises BrokenProcessPool (the sweep never hangs)
+
+Running from the src folder:
+    python -m modules.sweep sweep.json --backend numpy --processes 8
+"""
+
+"""
+Log
+
+--------------------------------------
+Version 0.0.1
+--
+Introduced sweep definitions (used by the warm-up of the persistent property cache).
+
+--------------------------------------
+Version 0.0.2
+--
+Introduced the parallel sweep runners (run_sweep and run_batch_sweep).
+
+--------------------------------------
+Version 0.0.3
+--
+Introduced SweepResult.to_records (structured array of modules/result_store.py).
+
+--------------------------------------
+Version 0.0.4
+--
+Introduced SweepPool (workers kept for many sweeps; concurrent.futures, so a failed worker raises instead of being
+started again forever) and the "pool" argument of run_sweep and run_batch_sweep.
+
+--------------------------------------
+Version 0.0.5
+--
+Introduced iter_sweep (points of a sweep definition created one at a time) and sweep_size.
+
+--------------------------------------
+"""
+
+import concurrent.futures
+import itertools
+import json
+import os
+from dataclasses import dataclass, field, fields
+
+from modules.cycle_solver import CycleInputs, solve_cycle
+from modules.property_backend import PropertyBackend, PropertyError, get_backend
+
+
+INPUT_NAMES = tuple(f.name for f in fields(CycleInputs))
+
+
+def field_values(spec):
+    # Values of one field of the sweep definition
+    if isinstance(spec, dict):
+        start, stop, num = float(spec["start"]), float(spec["stop"]), int(spec["num"])
+        if num == 1:
+            return [start]
+        return [start + (stop - start) * i / (num - 1) for i in range(num)]
+    if isinstance(spec, (list, tuple)):
+        return [float(value) for value in spec]
+    return [float(spec)]
+
+
+def iter_sweep(definition, start=0):
+    # CycleInputs of all the combinations of the sweep definition, created one at a time (from the point "start")
+    unknown = set(definition) - set(INPUT_NAMES)
+    if unknown:
+        raise ValueError("Unknown inputs in sweep definition: " + ", ".join(sorted(unknown)))
+    names = list(definition)
+    grids = [field_values(definition[name]) for name in names]
+    for values in itertools.islice(itertools.product(*grids), start, None):
+        yield CycleInputs(**dict(zip(names, values)))
+
+
+def sweep_size(definition):
+    size = 1
+    for spec in definition.values():
+        size *= len(field_values(spec))
+    return size
+
+
+def expand_sweep(definition):
+    # List of CycleInputs with all the combinations of the sweep definition
+    return list(iter_sweep(definition))
+
+
+def load_sweep_definition(path):
+    with open(path) as file:
+        return json.load(file)
+
+
+# ==========================================================================
+# Parallel execution
+# ==========================================================================
+
+# Errors of a point that are reported as a failure of that point (other errors stop the sweep)
+POINT_ERRORS = (PropertyError, ArithmeticError, ValueError)
+
+DEFAULT_CHUNKSIZE = 64
+
+# Backend of the worker process (created by _init_worker)
+_WORKER_BACKEND = None
+
+
+@dataclass
+class SweepResult:
+    points: list # CycleInputs
+    results: list # CycleResult, or None where the point failed
+    errors: list # None, or the error message of the failed point
+    stats: dict = field(default_factory=dict)
+
+    @property
+    def n_failed(self):
+        return sum(error is not None for error in self.errors)
+
+    def to_records(self):
+        # One contiguous structured array (result_store.CYCLE_DTYPE), failed points with feasible == False
+        from modules.result_store import records_from_results
+
+        return records_from_results(self.results, self.points)
+
+
+def _worker_backend(backend, cache_size):
+    backend = get_backend(backend)
+    if cache_size:
+        from modules.property_cache import CachedBackend
+        backend = CachedBackend(backend, maxsize=cache_size)
+    backend.load()
+    return backend
+
+
+def _init_worker(backend, cache_size):
+    # Pool initializer: one property backend per worker process, loaded only once
+    global _WORKER_BACKEND
+    _WORKER_BACKEND = _worker_backend(backend, cache_size)
+
+
+def _solve_chunk(chunk):
+    # chunk: list of (index, CycleInputs, x_7_guess); returns list of (index, CycleResult or None, error or None)
+    out = []
+    for index, inputs, x_7_guess in chunk:
+        try:
+            out.append((index, solve_cycle(inputs, backend=_WORKER_BACKEND, x_7_guess=x_7_guess), None))
+        except POINT_ERRORS as error:
+            out.append((index, None, type(error).__name__ + ": " + str(error)))
+    return out
+
+
+def _solve_batch_chunk(chunk):
+    from modules.batch_solver import inputs_from_list, solve_cycle_batch
+
+    index, points = chunk
+    return index, solve_cycle_batch(inputs_from_list(points), backend=_WORKER_BACKEND)
+
+
+def _chunks(items, chunksize):
+    return [items[i:i + chunksize] for i in range(0, len(items), chunksize)]
+
+
+class SweepPool:
+    # Workers of the sweeps, each with its property backend (and property cache) loaded once, kept for many calls of
+    # run_sweep / run_batch_sweep (argument "pool"). processes=None uses all the cores; processes=1 solves in this
+    # process. Use it as a context manager (or call close).
+
+    def __init__(self, backend=None, processes=None, cache_size=100000):
+        self.processes = processes or os.cpu_count()
+        self.cache_size = cache_size
+        self._backend = self._executor = None
+        if self.processes == 1:
+            self._backend = _worker_backend(backend, cache_size)
+            return
+        if isinstance(backend, PropertyBackend):
+            raise ValueError("Parallel sweeps need the backend name (e.g. 'numpy'), each worker creates its own backend")
+        # Wrong names and missing libraries raise here, not in the workers
+        get_backend(backend).load()
+        self._executor = concurrent.futures.ProcessPoolExecutor(self.processes, initializer=_init_worker,
+                                                                initargs=(backend, cache_size))
+
+    def map(self, function, tasks):
+        # Results of function(task) (a module-level function using _WORKER_BACKEND) in the order of the tasks
+        global _WORKER_BACKEND
+        if self._executor is None:
+            _WORKER_BACKEND = self._backend
+            return map(function, tasks)
+        return self._executor.map(function, tasks)
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _pool(pool, backend, processes, cache_size):
+    # (pool, whether it is owned by the call): the pool given, or a new one closed at the end of the call
+    return (pool, False) if pool is not None else (SweepPool(backend, processes, cache_size), True)
+
+
+def run_sweep(points, backend=None, processes=None, chunksize=DEFAULT_CHUNKSIZE, cache_size=100000, x_7_guesses=None,
+              pool=None):
+    # Solves all the operating points (list of CycleInputs, or a sweep definition) with solve_cycle.
+    # processes=None uses all the cores; processes=1 solves in this process (no pool).
+    # x_7_guesses: optional warm start of each point. pool: SweepPool kept by the caller (backend, processes and
+    # cache_size are then the ones of the pool).
+    if isinstance(points, dict):
+        points = expand_sweep(points)
+    points = list(points)
+    if x_7_guesses is None:
+        x_7_guesses = [None] * len(points)
+    tasks = _chunks(list(zip(range(len(points)), points, x_7_guesses)), chunksize)
+    results, errors = [None] * len(points), [None] * len(points)
+
+    pool, owned = _pool(pool, backend, processes, cache_size)
+    try:
+        for chunk in pool.map(_solve_chunk, tasks):
+            for index, result, error in chunk:
+                results[index], errors[index] = result, error
+    finally:
+        if owned:
+            pool.close()
+    return SweepResult(points, results, errors, {"processes": pool.processes, "chunks": len(tasks)})
+
+
+def run_batch_sweep(points, backend=None, processes=None, chunksize=4096, cache_size=0, pool=None):
+    # Same as run_sweep, but each chunk is solved with solve_cycle_batch; returns one BatchResult in the input
+    # order (failures are the points with feasible == False).
+    from modules.batch_solver import concatenate_batches
+
+    if isinstance(points, dict):
+        points = expand_sweep(points)
+    points = list(points)
+    tasks = list(enumerate(_chunks(points, chunksize)))
+    pool, owned = _pool(pool, backend, processes, cache_size)
+    try:
+        batches = dict(pool.map(_solve_batch_chunk, tasks))
+    finally:
+        if owned:
+            pool.close()
+    return concatenate_batches(batches[i] for i in range(len(tasks)))
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Parallel parametric sweep of the ARS cycle")
+    parser.add_argument("sweep", help="sweep definition (JSON)")
+    parser.add_argument("--backend", default=None, help="property backend (refprop, numpy or table:<file>)")
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE)
+    parser.add_argument("--batch", action="store_true", help="solve each chunk with the vectorized batch solver")
+    args = parser.parse_args()
+
+    points = expand_sweep(load_sweep_definition(args.sweep))
+    start = time.perf_counter()
+    if args.batch:
+        result = run_batch_sweep(points, args.backend, args.processes, args.chunksize)
+        failed = int((~result.feasible).sum())
+    else:
+        result = run_sweep(points, args.backend, args.processes, args.chunksize)
+        failed = result.n_failed
+    elapsed = time.perf_counter() - start
+    print("Points: " + str(len(points)) + "; failed: " + str(failed) + "; time: " + "{:.3g}".format(elapsed) + " s; "
+          + "{:.4g}".format(len(points) / elapsed) + " points/s")
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 23:00:00 2026
+
+@author: Wellorzzon Novais
+"""
+
+"""
+Description
+--
+This code has the per-step instrumentation of solve_cycle (modules/cycle_solver.py):
+    solve_cycle(inputs, backend="numpy", trace=SolveTrace())
+records, for each numbered step of the solve (2, 3, 4, 4.1, 5, ..., 14):
+    - the wall time of the step [s]
+    - the property calls (flashes) per input pair
+    - the cache hits and misses, when the backend is cached (property_cache.py or disk_cache.py)
+The trace is a dictionary (SolveTrace.as_dict) or a JSON line (SolveTrace.to_json, JsonLinesTrace for many solves),
+and "summarize" adds up the steps of many traces, e.g. to compare the time of the x_7 solve (step 5) with the PH
+flashes of lines 5 and 8 (steps 4.1 and 7).
+Without a trace (trace=None, the default) solve_cycle only does one "is None" check per step.
+"""
+
+"""
+Log
+
+--------------------------------------
+Version 0.0.1
+--
+Introduced SolveTrace, JsonLinesTrace and summarize.
+
+--------------------------------------
+"""
+
+import json
+import time
+
+
+STEP_NAMES = {
+    2: "Lines 4 and 6 (TQ)",
+    3: "Pressure equality",
+    4: "Lines 3 (PT) and 1 (PQ)",
+    4.1: "Line 5 (PH, h_5 = h_4)",
+    5: "Line 7 (x_7 solve, PQ)",
+    6: "Line 2 (PS, s_2 = s_1)",
+    7: "Line 8 (PH, h_8 = h_7)",
+    8: "Evaporator energy balance",
+    9: "Mass flow rate equality (lines 3, 4, 5)",
+    10: "Generator mass balance (line 7)",
+    11: "Mass flow rate equality (line 8)",
+    12: "Generator mass balance (line 2)",
+    13: "Mass flow rate equality (line 1)",
+    14: "Heat exchange rates",
+}
+
+
+def _cache_counts(backend):
+    # (hits, misses) of a cached backend, or None
+    hits = getattr(backend, "hits", None)
+    if hits is None:
+        return None
+    return hits, backend.misses
+
+
+class SolveTrace:
+
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.steps = []
+        self.total_time = 0.0
+        self.x_7 = None
+        self._current = None
+        self._start = None
+        self._time = None
+        self._flashes = {}
+        self._cache = None
+
+    def _close(self, counter, backend):
+        # Ends the current step with the time, flashes and cache use since it started
+        now = self.clock()
+        if self._current is not None:
+            flashes = {pair: n - self._flashes.get(pair, 0) for pair, n in counter.items() if n != self._flashes.get(pair, 0)}
+            record = {"step": self._current, "name": STEP_NAMES.get(self._current, ""), "time": now - self._time,
+                      "flashes": flashes}
+            cache = _cache_counts(backend)
+            if cache is not None and self._cache is not None:
+                record["cache_hits"], record["cache_misses"] = cache[0] - self._cache[0], cache[1] - self._cache[1]
+            self.steps.append(record)
+        self._flashes = dict(counter)
+        self._cache = _cache_counts(backend)
+        return now
+
+    def step(self, step, counter, backend):
+        # Called by solve_cycle at the beginning of each step
+        now = self._close(counter, backend)
+        if self._start is None:
+            self._start = now
+        self._current, self._time = round(step, 1), now
+
+    def finish(self, counter, backend, x_7_solution=None):
+        now = self._close(counter, backend)
+        self._current = None
+        self.total_time = now - self._start
+        if x_7_solution is not None:
+            self.x_7 = {"iterations": x_7_solution.iterations, "flashes": x_7_solution.flashes,
+                        "converged": x_7_solution.converged}
+
+    def as_dict(self):
+        flashes = {}
+        for record in self.steps:
+            for pair, n in record["flashes"].items():
+                flashes[pair] = flashes.get(pair, 0) + n
+        return {"total_time": self.total_time, "flashes": flashes, "x_7": self.x_7, "steps": self.steps}
+
+    def to_json(self):
+        return json.dumps(self.as_dict())
+
+
+class JsonLinesTrace:
+    # Writes one JSON line per solve: with JsonLinesTrace(path) as sink: solve_cycle(..., trace=sink.new()) ...
+
+    def __init__(self, path):
+        self.file = open(path, "a")
+        self._pending = None
+
+    def new(self):
+        self.write()
+        self._pending = SolveTrace()
+        return self._pending
+
+    def write(self, trace=None):
+        trace = trace or self._pending
+        if trace is not None and trace.steps:
+            self.file.write(trace.to_json() + "\n")
+        if trace is self._pending:
+            self._pending = None
+
+    def close(self):
+        self.write()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def summarize(traces):
+    # Total time, flashes and cache use of each step over many traces (SolveTrace or their dictionaries)
+    summary = {}
+    for trace in traces:
+        steps = trace["steps"] if isinstance(trace, dict) else trace.steps
+        for record in steps:
+            total = summary.setdefault(record["step"], {"name": record["name"], "time": 0.0, "calls": 0, "flashes": {},
+                                                        "cache_hits": 0, "cache_misses": 0})
+            total["time"] += record["time"]
+            total["calls"] += 1
+            for pair, n in record["flashes"].items():
+                total["flashes"][pair] = total["flashes"].get(pair, 0) + n
+            total["cache_hits"] += record.get("cache_hits", 0)
+            total["cache_misses"] += record.get("cache_misses", 0)
+    return dict(sorted(summary.items()))
+
+
+def format_summary(summary):
+    total_time = sum(step["time"] for step in summary.values()) or 1.0
+    lines = []
+    for step, total in summary.items():
+        flashes = ", ".join(pair + ": " + str(n) for pair, n in total["flashes"].items())
+        lines.append(str(step).rjust(4) + "  " + total["name"].ljust(40) + "{:.4g}".format(total["time"]).rjust(10) + " s "
+                     + "{:.1%}".format(total["time"] / total_time).rjust(7) + "  " + flashes)
+    return "\n".join(lines)
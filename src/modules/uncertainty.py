@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 01:30:00 2026
+
+@author: Wellorzzon Novais
+"""
+
+"""
+Description
+--
+This code has the uncertainty mode of the cycle: the measured inputs (Temp_3, Temp_4, Temp_6, Q_eva, x_1) are random
+variables and the result is the distribution of the outputs (Q_gen, Q_abs and COP by default), not a single value.
+    - distributions: {"normal": mean, std}, {"uniform": low, high} or a fixed value, e.g.
+          {"Temp_3": {"dist": "normal", "mean": 373.15, "std": 0.5}, "x_1": {"dist": "uniform", "low": 0.42, "high": 0.44}}
+      (the inputs not given keep the CycleInputs default)
+    - sampling: plain Monte Carlo ("random") or Latin hypercube ("lhs": each chunk is one Latin hypercube, so each
+      input is stratified in "chunksize" equal probability intervals)
+    - the samples are solved chunk by chunk with the batch solver (or one process pool for all the chunks, whose
+      workers keep their cached backends), and only running statistics
+      are kept (count, mean, variance, min, max and a fixed histogram per output), so the memory does not grow with
+      the number of samples. The quantiles come from the histogram (interpolated inside the bin).
+
+Running from the src folder:
+    python -m modules.uncertainty --backend numpy --samples 100000 --sampling lhs
+"""
+
+"""
+Log
+
+--------------------------------------
+Version 0.0.1
+--
+Introduced the Monte Carlo / Latin hypercube propagation with streaming statistics.
+
+--------------------------------------
+Version 0.0.2
+--
+Property cache (cache_size) in both modes; with processes > 1 all the chunks are solved in one sweep.SweepPool.
+
+--------------------------------------
+"""
+
+from dataclasses import dataclass, field, fields
+
+import numpy as np
+
+from modules.cycle_solver import CycleInputs
+
+
+INPUT_NAMES = tuple(f.name for f in fields(CycleInputs))
+DEFAULT_OUTPUTS = ("Q_gen", "Q_abs", "COP")
+
+# Sensor uncertainty around the default operating point (standard deviations)
+DEFAULT_DISTRIBUTIONS = {
+    "Temp_3": {"dist": "normal", "mean": 373.15, "std": 0.5}, # [K]
+    "Temp_4": {"dist": "normal", "mean": 313.15, "std": 0.5}, # [K]
+    "Temp_6": {"dist": "normal", "mean": 263.15, "std": 0.5}, # [K]
+    "Q_eva": {"dist": "normal", "mean": 5000.0, "std": 100.0}, # [W]
+    "x_1": {"dist": "normal", "mean": 0.43, "std": 0.005}, # [-]
+}
+
+DEFAULT_CHUNKSIZE = 10000
+HISTOGRAM_BINS = 200
+
+
+def _from_uniform(u, spec):
+    # Values of the distribution "spec" at the probabilities u (inverse of the cumulative distribution)
+    if not isinstance(spec, dict):
+        return np.full(u.shape, float(spec))
+    if spec["dist"] == "normal":
+        from scipy.special import ndtri
+
+        return spec["mean"] + spec["std"] * ndtri(u)
+    if spec["dist"] == "uniform":
+        return spec["low"] + (spec["high"] - spec["low"]) * u
+    raise ValueError("Unknown distribution: " + str(spec["dist"]) + " (use normal or uniform)")
+
+
+def sample_inputs(distributions, n, sampling="lhs", rng=None):
+    # {input name: array (n,)} of the distributions (the other inputs are not in the dictionary)
+    rng = np.random.default_rng(rng)
+    unknown = set(distributions) - set(INPUT_NAMES)
+    if unknown:
+        raise ValueError("Unknown inputs: " + ", ".join(sorted(unknown)))
+    columns = {}
+    for name, spec in distributions.items():
+        if sampling == "lhs":
+            # One sample in each of the n intervals of probability 1/n, in random order
+            u = (rng.permutation(n) + rng.uniform(size=n)) / n
+        elif sampling == "random":
+            u = rng.uniform(size=n)
+        else:
+            raise ValueError("Unknown sampling: " + str(sampling) + " (use lhs or random)")
+        columns[name] = _from_uniform(u, spec)
+    return columns
+
+
+class RunningStats:
+    # Count, mean, variance (Chan's parallel update), min, max and a fixed histogram of a stream of values.
+    # The histogram edges are set by the first values (their range, widened by "margin" on each side); the values
+    # outside go to the underflow and overflow counts.
+
+    def __init__(self, bins=HISTOGRAM_BINS, margin=1.0):
+        self.bins = bins
+        self.margin = margin
+        self.count = 0
+        self.mean = 0.0
+        self.M2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+        self.edges = None
+        self.counts = None
+        self.underflow = self.overflow = 0
+
+    def update(self, values):
+        values = np.asarray(values, float)
+        values = values[np.isfinite(values)]
+        n = len(values)
+        if n == 0:
+            return
+        mean, M2 = values.mean(), ((values - values.mean()) ** 2).sum()
+        delta = mean - self.mean
+        total = self.count + n
+        self.mean += delta * n / total
+        self.M2 += M2 + delta ** 2 * self.count * n / total
+        self.count = total
+        self.min, self.max = min(self.min, values.min()), max(self.max, values.max())
+        if self.edges is None:
+            low, high = values.min(), values.max()
+            width = (high - low) or abs(low) * 1e-6 or 1e-12
+            self.edges = np.linspace(low - self.margin * width, high + self.margin * width, self.bins + 1)
+            self.counts = np.zeros(self.bins, np.int64)
+        self.counts += np.histogram(values, self.edges)[0]
+        self.underflow += int((values < self.edges[0]).sum())
+        self.overflow += int((values > self.edges[-1]).sum())
+
+    @property
+    def std(self):
+        return float(np.sqrt(self.M2 / (self.count - 1))) if self.count > 1 else float('nan')
+
+    def quantile(self, q):
+        # Quantile q (0 - 1) from the histogram; NaN when it falls in the underflow or overflow
+        if not self.count:
+            return float('nan')
+        target = q * self.count - self.underflow
+        cumulative = np.concatenate([[0], np.cumsum(self.counts)])
+        if target < 0 or target > cumulative[-1]:
+            return float('nan')
+        i = min(max(np.searchsorted(cumulative, target) - 1, 0), self.bins - 1)
+        inside = (target - cumulative[i]) / self.counts[i] if self.counts[i] else 0.0
+        return float(self.edges[i] + inside * (self.edges[i + 1] - self.edges[i]))
+
+    def summary(self, quantiles=(0.025, 0.5, 0.975)):
+        out = {"count": self.count, "mean": float(self.mean), "std": self.std, "min": float(self.min), "max": float(self.max)}
+        out.update({"q" + "{:g}".format(100 * q): self.quantile(q) for q in quantiles})
+        return out
+
+
+@dataclass
+class UncertaintyResult:
+    samples: int
+    infeasible: int
+    stats: dict = field(default_factory=dict) # {output: RunningStats}
+
+    def summary(self, quantiles=(0.025, 0.5, 0.975)):
+        return {name: stats.summary(quantiles) for name, stats in self.stats.items()}
+
+    def table(self, quantiles=(0.025, 0.5, 0.975)):
+        from tabulate import tabulate
+
+        summary = self.summary(quantiles)
+        headers = ["Output"] + list(next(iter(summary.values())))
+        rows = [[name] + ['%.6g' % value for value in values.values()] for name, values in summary.items()]
+        return tabulate(rows, headers=headers)
+
+
+def propagate(distributions=None, samples=100000, sampling="lhs", outputs=DEFAULT_OUTPUTS, backend=None, base=None,
+              chunksize=DEFAULT_CHUNKSIZE, processes=1, seed=0, cache_size=100000):
+    # Distribution of the outputs (BatchResult attributes or properties: Q_gen, Q_con, Q_abs, COP, x_7) for the input
+    # distributions ({input: spec}). Infeasible samples are counted and left out of the statistics.
+    # processes > 1 needs the backend name: all the chunks are solved in one sweep.SweepPool, whose workers keep their
+    # backend and property cache (cache_size) between the chunks.
+    from modules.batch_solver import solve_cycle_batch
+    from modules.property_backend import get_backend
+    from modules.property_cache import CachedBackend
+
+    distributions = DEFAULT_DISTRIBUTIONS if distributions is None else distributions
+    base = base or CycleInputs()
+    rng = np.random.default_rng(seed)
+    pool = None
+    if processes == 1:
+        backend = CachedBackend(get_backend(backend), maxsize=cache_size) if cache_size else get_backend(backend)
+    else:
+        from modules.sweep import SweepPool
+
+        pool = SweepPool(backend, processes, cache_size)
+    result = UncertaintyResult(0, 0, {name: RunningStats() for name in outputs})
+
+    try:
+        for start in range(0, samples, chunksize):
+            n = min(chunksize, samples - start)
+            columns = sample_inputs(distributions, n, sampling, rng)
+            inputs = {name: columns.get(name, np.full(n, getattr(base, name))) for name in INPUT_NAMES}
+            if pool is None:
+                batch = solve_cycle_batch(inputs, backend=backend)
+            else:
+                from modules.sweep import run_batch_sweep
+
+                points = [CycleInputs(**{name: float(inputs[name][i]) for name in INPUT_NAMES}) for i in range(n)]
+                batch = run_batch_sweep(points, chunksize=max(n // pool.processes, 1), pool=pool)
+            feasible = batch.feasible
+            result.samples += n
+            result.infeasible += int((~feasible).sum())
+            for name, stats in result.stats.items():
+                stats.update(np.asarray(getattr(batch, name))[feasible])
+    finally:
+        if pool is not None:
+            pool.close()
+    return result
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Uncertainty propagation of the ARS cycle inputs")
+    parser.add_argument("--distributions", default=None, help="JSON file {input: distribution} (default: sensor uncertainty)")
+    parser.add_argument("--backend", default=None, help="property backend (refprop, numpy or table:<file>)")
+    parser.add_argument("--samples", type=int, default=100000)
+    parser.add_argument("--sampling", choices=["lhs", "random"], default="lhs")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE)
+    parser.add_argument("--processes", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    distributions = None
+    if args.distributions:
+        with open(args.distributions) as file:
+            distributions = json.load(file)
+    result = propagate(distributions, args.samples, args.sampling, backend=args.backend, chunksize=args.chunksize,
+                       processes=args.processes, seed=args.seed)
+    print(result.table())
+    print("Samples: " + str(result.samples) + "; infeasible: " + str(result.infeasible))
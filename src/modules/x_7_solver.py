@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 19:30:00 2026
+
+@author: Wellorzzon Novais
+"""
+
+"""
+Description
+--
+This code finds the ammonia mass fraction of the weak solution at the generator low outlet (x_7).
+Line 7 is saturated liquid (Qu_7) at P_7 and Temp_7 = Temp_3, but RefProp does not accept (P, Q, T) as inputs, so x_7
+is the root of:
+    f(x_7) = T_bubble(P_7, Qu_7, x_7) - Temp_3
+f decreases with x_7 (more ammonia, lower bubble temperature) and the physical bracket is [X_7_MIN, x_1]: the weak
+solution has less ammonia than the strong solution. The bracket is clamped to the compositions the backend can flash
+(PropertyBackend.x_range, e.g. the x axis of the property tables), and a bracket end the backend cannot flash makes the
+cycle infeasible (InfeasibleCycleError) instead of stopping with PropertyError. The root is found with Brent's method (root_finding.brent):
+    - cold start: bracket [X_7_MIN, x_1]
+    - warm start (guess, e.g. x_7 of a neighbour operating point): the bracket is searched from the guess with growing
+      steps, so most of the time only 1 or 2 flashes are needed to bracket the root
+Guesses are always kept inside the bracket, so there is no flash with x outside of [0, 1].
+The flash of the last evaluation at the root is kept, so line 7 does not need a new flash.
+Backends with precomputed saturation envelopes (saturation_envelope.py) give x_7 directly (saturation_composition),
+with no iterations; the Brent solve is only used when the envelope has no answer.
+"""
+
+"""
+Log
+
+--------------------------------------
+Version 0.0.1
+--
+Substituted "fsolve" (unbounded, with finite-difference Jacobian) by a bracketed Brent solve with warm start.
+
+--------------------------------------
+Version 0.0.2
+--
+Direct x_7 from the saturation envelope of the backend, when it has one.
+
+--------------------------------------
+Version 0.0.3
+--
+Bracket clamped to the x_range of the backend; failed flashes of the bracket search raise InfeasibleCycleError.
+
+--------------------------------------
+"""
+
+from dataclasses import dataclass
+
+from modules.property_backend import FlashResult, PropertyError
+from modules.root_finding import brent
+
+
+# Bracket of x_7 (pure water up to x_1)
+X_7_MIN = 0.0
+
+# Tolerance of x_7
+X_7_TOL = 1e-10
+X_7_MAXITER = 100
+
+# First step of the bracket search of a warm start (doubled at each new flash)
+WARM_START_STEP = 0.01
+
+
+class InfeasibleCycleError(ValueError):
+    # The cycle has no solution for the inputs (e.g. no x_7 with Temp_7 = Temp_3 below x_1)
+    pass
+
+
+@dataclass
+class X7Solution:
+    x_7: float # [-]
+    line_7: FlashResult # flash (PQ) at x_7
+    iterations: int # iterations of Brent's method
+    flashes: int # all the flashes of the solve (bracket search + Brent)
+    converged: bool
+
+
+def solve_x_7(backend, P_7, Temp_3, Qu_7=0, x_1=1.0, guess=None, counter=None, xtol=X_7_TOL):
+    x_min, x_max = getattr(backend, "x_range", (0.0, 1.0))
+    lo, hi = max(X_7_MIN, x_min), min(x_1, x_max)
+    evaluated = {}
+    flashes = 0
+
+    def f(x_7):
+        nonlocal flashes
+        flashes += 1
+        if counter is not None:
+            counter.add("PQ")
+        evaluated[x_7] = backend.flash("PQ", P_7, Qu_7, x_7)
+        return evaluated[x_7].T - Temp_3
+
+    # Inverted bubble curve of the backend (NaN when P_7 or Qu_7 are not in its envelope)
+    invert = getattr(backend, "saturation_composition", None)
+    if invert is not None:
+        x_7 = invert(P_7, Qu_7, Temp_3)
+        if lo < x_7 < hi:
+            f(x_7)
+            return X7Solution(x_7, evaluated[x_7], 0, flashes, True)
+
+    # Bracket [a, b] with f(a) >= 0 >= f(b)
+    try:
+        if guess is not None and lo < guess < hi:
+            f_guess = f(guess)
+            step = WARM_START_STEP
+            a, f_a, b, f_b = (guess, f_guess, None, None) if f_guess > 0 else (None, None, guess, f_guess)
+            while a is None or b is None:
+                if a is None:
+                    candidate = max(b - step, lo)
+                    f_candidate = f(candidate)
+                    if f_candidate >= 0:
+                        a, f_a = candidate, f_candidate
+                    elif candidate == lo:
+                        break
+                    else:
+                        b, f_b = candidate, f_candidate
+                else:
+                    candidate = min(a + step, hi)
+                    f_candidate = f(candidate)
+                    if f_candidate <= 0:
+                        b, f_b = candidate, f_candidate
+                    elif candidate == hi:
+                        break
+                    else:
+                        a, f_a = candidate, f_candidate
+                step *= 2
+        else:
+            a, f_a, b, f_b = lo, f(lo), hi, f(hi)
+    except PropertyError as error:
+        raise InfeasibleCycleError("No x_7 in [" + str(lo) + ", " + str(hi) + "] at P_7 = " + str(P_7) + " Pa: " + str(error)) from error
+
+    if a is None or b is None or not f_a >= 0 >= f_b:
+        raise InfeasibleCycleError("No x_7 in [" + str(lo) + ", " + str(hi) + "] with Temp_7 = Temp_3 = " + str(Temp_3) + " K at P_7 = " + str(P_7) + " Pa")
+
+    result = brent(f, a, b, f_a, f_b, xtol=xtol, maxiter=X_7_MAXITER)
+    x_7 = float(result.root)
+    line_7 = evaluated.get(x_7)
+    if line_7 is None:
+        f(x_7)
+        line_7 = evaluated[x_7]
+    return X7Solution(x_7, line_7, result.iterations, flashes, result.converged)
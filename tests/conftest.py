@@ -0,0 +1,26 @@
+# Shared fixtures of the tests (run from the repository root: python -m pytest -q)
+
+import os
+import sys
+
+import pytest
+
+# The modules are imported as in the src folder ("modules.x")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+
+@pytest.fixture(scope="session")
+def numpy_backend():
+    from modules.property_backend import get_backend
+
+    return get_backend("numpy")
+
+
+@pytest.fixture(scope="session")
+def table_file(tmp_path_factory):
+    # Property tables of the numpy backend on the default axes, with their errors on the default check points
+    from modules.property_tables import build_tables, save_tables
+
+    path = str(tmp_path_factory.mktemp("tables") / "numpy_tables.npz")
+    save_tables(build_tables("numpy"), path)
+    return path
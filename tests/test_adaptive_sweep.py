@@ -0,0 +1,21 @@
+import numpy as np
+import pytest
+
+from modules.adaptive_sweep import run_adaptive_sweep
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_refinement_concentrates_at_the_feasibility_boundary(processes):
+    # Below about 367.5 K there is no x_7 below x_1. 30 levels: a uniform grid of 2^32 + 1 points, of which only the
+    # ones bracketing the boundary are solved (no array of the uniform grid)
+    result = run_adaptive_sweep({"Temp_3": (340.0, 400.0)}, initial=5, levels=30, tol=np.inf, backend="numpy",
+                                processes=processes)
+    assert result.shape == (2 ** 32 + 1,)
+    assert all(step["refined"] == step["feasibility_change"] == 1 for step in result.history[1:])
+    assert result.solves == 5 + 30
+    order = np.argsort(result.lattice[:, 0])
+    lattice, feasible = result.lattice[order, 0], result.batch.feasible[order]
+    first = int(np.argmax(feasible))
+    assert not feasible[:first].any() and feasible[first:].all()
+    assert lattice[first] - lattice[first - 1] == 1
+    assert 365.0 < result.values()[order][first, 0] < 370.0
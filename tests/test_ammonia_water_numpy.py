@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+
+from modules.property_backend import PropertyError
+
+# States of each region: (P, T, x) of liquid and vapor, (P, Q, x) of the two-phase region, pure fluids included
+P = np.array([5.0e4, 2.0e5, 6.0e5, 1.5e6, 3.0e6])
+X = np.array([0.0, 0.1, 0.35, 0.6, 0.9, 1.0])
+Q = np.array([0.0, 0.2, 0.5, 0.8, 1.0])
+
+
+def single_phase_states(backend, margin):
+    # (P, T, x) "margin" K below the bubble point and above the dew point
+    P_grid, x_grid = (a.ravel() for a in np.meshgrid(P, X, indexing="ij"))
+    bubble = backend.flash_many("PQ", P_grid, 0, x_grid).T
+    dew = backend.flash_many("PQ", P_grid, 1, x_grid).T
+    return (np.concatenate([P_grid, P_grid]), np.concatenate([bubble - margin, dew + margin]),
+            np.concatenate([x_grid, x_grid]))
+
+
+def test_flash_matches_flash_many(numpy_backend):
+    cases = {
+        "TQ": (np.array([250.0, 300.0, 350.0]), np.array([0.0, 0.5, 1.0]), np.array([1.0, 0.5, 0.3])),
+        "PQ": (np.array([2.0e5, 1.5e6, 6.0e5]), np.array([0.0, 0.3, 1.0]), np.array([0.43, 0.0, 0.8])),
+        "PT": (np.array([2.0e5, 1.5e6, 9.0e4]), np.array([300.0, 420.0, 380.0]), np.array([0.43, 1.0, 0.0])),
+        "PH": (np.array([2.0e5, 1.5e6, 6.0e5]), np.array([1.0e5, 1.5e6, 6.0e5]), np.array([0.43, 1.0, 0.6])),
+        "PS": (np.array([2.0e5, 1.5e6, 6.0e5]), np.array([500.0, 5000.0, 3000.0]), np.array([0.43, 1.0, 0.6])),
+    }
+    for pair, (value_1, value_2, x) in cases.items():
+        many = numpy_backend.flash_many(pair, value_1, value_2, x)
+        for i in range(len(x)):
+            one = numpy_backend.flash(pair, value_1[i], value_2[i], x[i])
+            np.testing.assert_allclose(one, [column[i] for column in many], rtol=1e-12, err_msg=pair)
+
+
+def test_flash_out_of_range_raises(numpy_backend):
+    with pytest.raises(PropertyError):
+        numpy_backend.flash("PQ", 2.0e5, 0.0, 1.2)
+    assert np.isnan(numpy_backend.flash_many("PQ", 2.0e5, np.array([0.0, 1.5]), 0.5).T[1])
+
+
+@pytest.mark.parametrize("pair, name", [("PH", "h"), ("PS", "s")])
+def test_single_phase_round_trip(numpy_backend, pair, name):
+    P_states, T_states, x_states = single_phase_states(numpy_backend, 5.0)
+    states = numpy_backend.flash_many("PT", P_states, T_states, x_states)
+    assert np.all(np.abs(states.Q) == 998)
+    back = numpy_backend.flash_many(pair, P_states, getattr(states, name), x_states)
+    np.testing.assert_allclose(back.T, T_states, atol=1e-6)
+    np.testing.assert_array_equal(back.Q, states.Q)
+
+
+@pytest.mark.parametrize("pair, name", [("PH", "h"), ("PS", "s")])
+def test_two_phase_round_trip(numpy_backend, pair, name):
+    P_grid, Q_grid, x_grid = (a.ravel() for a in np.meshgrid(P, Q, X[1:-1], indexing="ij"))
+    states = numpy_backend.flash_many("PQ", P_grid, Q_grid, x_grid)
+    back = numpy_backend.flash_many(pair, P_grid, getattr(states, name), x_grid)
+    np.testing.assert_allclose(back.T, states.T, atol=1e-5)
+    # On the bubble and dew points the state is reported as liquid or vapor
+    inside = (Q_grid > 0) & (Q_grid < 1)
+    np.testing.assert_allclose(back.Q[inside], Q_grid[inside], atol=1e-5)
+
+
+def test_two_phase_pt_round_trip(numpy_backend):
+    # PT inside the two-phase region gives back the quality of the PQ state (mixtures only)
+    P_grid, Q_grid, x_grid = (a.ravel() for a in np.meshgrid(P, Q[1:-1], X[1:-1], indexing="ij"))
+    states = numpy_backend.flash_many("PQ", P_grid, Q_grid, x_grid)
+    back = numpy_backend.flash_many("PT", P_grid, states.T, x_grid)
+    np.testing.assert_allclose(back.Q, Q_grid, atol=1e-6)
+    np.testing.assert_allclose(back.h, states.h, rtol=1e-6)
+
+
+def test_default_cycle_without_refprop(monkeypatch):
+    import sys
+
+    from modules.cycle_solver import CycleInputs, solve_cycle
+
+    # ctREFPROP must not be needed (nor imported) by the numpy backend
+    monkeypatch.setitem(sys.modules, "ctREFPROP", None)
+    result = solve_cycle(CycleInputs(), backend="numpy")
+    assert 0 < result.x_7 < CycleInputs().x_1
+    assert result.Q_gen > 0 and np.isfinite(result.Q_abs)
+    assert all(np.isfinite(point.h) for point in result.points.values())
@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+from modules.batch_solver import concatenate_batches, inputs_from_list, solve_cycle_batch
+from modules.cycle_solver import CycleInputs, solve_cycle
+from modules.x_7_solver import InfeasibleCycleError
+
+
+POINTS = [CycleInputs(Temp_3=Temp_3, x_1=x_1, Temp_6=Temp_6)
+          for Temp_3, x_1, Temp_6 in ((373.15, 0.43, 263.15), (390.0, 0.45, 258.15), (320.0, 0.43, 263.15), (380.0, 0.40, 268.15))]
+
+
+def test_batch_matches_solve_cycle(numpy_backend):
+    batch = solve_cycle_batch(inputs_from_list(POINTS), backend=numpy_backend)
+    assert list(batch.feasible) == [True, True, False, True]
+    for k, inputs in enumerate(POINTS):
+        if not batch.feasible[k]:
+            with pytest.raises(InfeasibleCycleError):
+                solve_cycle(inputs, backend=numpy_backend)
+            continue
+        result = solve_cycle(inputs, backend=numpy_backend)
+        for i, point in result.points.items():
+            assert batch.T[k, i - 1] == pytest.approx(point.T, rel=1e-6)
+            assert batch.h[k, i - 1] == pytest.approx(point.h, rel=1e-5, abs=1.0)
+            assert batch.m_ponto[k, i - 1] == pytest.approx(point.m_ponto, rel=1e-5)
+        assert batch.Q_gen[k] == pytest.approx(result.Q_gen, rel=1e-5)
+
+
+def test_broadcast_columns_and_concatenation(numpy_backend):
+    batch = solve_cycle_batch({"Temp_3": np.array([373.15, 380.0])}, backend=numpy_backend, x_1=0.44)
+    assert len(batch) == 2 and list(batch.inputs["x_1"]) == [0.44, 0.44]
+    both = concatenate_batches([batch, batch])
+    assert len(both) == 4
+    np.testing.assert_array_equal(both.COP[2:], batch.COP)
+    assert sum(both.flash_counts.values()) == 2 * sum(batch.flash_counts.values())
@@ -0,0 +1,16 @@
+from modules.benchmark import compare, run_benchmarks
+
+
+def test_parallel_sweep_of_table_backend(table_file):
+    results = run_benchmarks("table:" + table_file, sizes=(100,), repeat=1, processes=2, only=["parallel_sweep"])
+    assert list(results["results"]) == ["parallel_sweep_100"]
+    assert results["results"]["parallel_sweep_100"]["points_per_s"] > 0
+
+
+def test_compare_regressions_and_missing_benchmarks():
+    def results(**points_per_s):
+        return {"results": {name: {"points_per_s": value} for name, value in points_per_s.items()}}
+
+    rows = compare(results(a=100.0, b=100.0, c=100.0), results(a=95.0, b=80.0), threshold=0.1)
+    assert [(name, regressed) for name, _, _, _, regressed in rows] == [("a", False), ("b", True), ("c", True)]
+    assert rows[2][2] is None
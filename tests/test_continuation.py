@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+
+from modules.continuation import run_continuation, serpentine_order
+from modules.sweep import run_sweep
+
+
+DEFINITION = {"Temp_3": {"start": 370.0, "stop": 390.0, "num": 5}, "Temp_6": {"start": 258.15, "stop": 263.15, "num": 3}}
+
+
+def test_serpentine_steps_change_one_input_by_one():
+    assert serpentine_order((2, 3)) == [0, 1, 2, 5, 4, 3]
+    shape = (3, 3, 2)
+    order = serpentine_order(shape)
+    assert sorted(order) == list(range(18))
+    indices = np.array(np.unravel_index(order, shape)).T
+    assert np.all(np.abs(np.diff(indices, axis=0)).sum(axis=1) == 1)
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_warm_start_matches_cold_solves(processes):
+    result = run_continuation(DEFINITION, "numpy", processes=processes, compare_cold=True)
+    assert result.sweep_result.n_failed == 0
+    savings = result.savings()
+    assert savings["flashes_saved"] > 0 and savings["iterations_saved"] > 0
+    cold = run_sweep(result.sweep_result.points, "numpy", processes=1)
+    for warm, exact in zip(result.sweep_result.results, cold.results):
+        assert warm.inputs == exact.inputs
+        assert warm.x_7 == pytest.approx(exact.x_7, abs=1e-8)
+        assert warm.Q_gen == pytest.approx(exact.Q_gen, rel=1e-6)
@@ -0,0 +1,22 @@
+import pytest
+
+from modules.cycle_solver import CycleInputs, solve_cycle
+
+
+def test_flash_counts_of_the_default_point():
+    # Flashes per input pair of a cold solve on the numpy backend (PQ includes the x_7 search)
+    counts = solve_cycle(CycleInputs(), backend="numpy").flash_counts
+    assert dict(counts) == {"TQ": 2, "PT": 1, "PQ": 9, "PH": 2, "PS": 1}
+    assert sum(counts.values()) == 15
+
+
+def test_unconverged_x_7_is_infeasible(monkeypatch):
+    import modules.x_7_solver as x_7_solver
+    from modules.incremental import IncrementalSolver
+    from modules.x_7_solver import InfeasibleCycleError
+
+    monkeypatch.setattr(x_7_solver, "X_7_MAXITER", 1)
+    with pytest.raises(InfeasibleCycleError, match="did not converge"):
+        solve_cycle(CycleInputs(), backend="numpy")
+    with pytest.raises(InfeasibleCycleError, match="did not converge"):
+        IncrementalSolver(backend="numpy").solve(CycleInputs())
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from modules.ammonia_water_numpy import NumpyAmmoniaWaterBackend
+from modules.disk_cache import DiskCache, PersistentCachedBackend
+
+
+class CountingBackend(NumpyAmmoniaWaterBackend):
+    calls = 0
+
+    def flash(self, pair, value_1, value_2, x):
+        self.calls += 1
+        return super().flash(pair, value_1, value_2, x)
+
+    def flash_many(self, pair, value_1, value_2, x):
+        self.calls += 1
+        return super().flash_many(pair, value_1, value_2, x)
+
+
+P = np.array([2.0e5, 3.0e5, 2.0e5, 4.0e5])
+X = np.array([0.4, 0.4, 0.4, 0.45])
+
+
+def test_hits_across_runs(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    first = PersistentCachedBackend(CountingBackend(), path)
+    expected = first.flash("PQ", 2.0e5, 0.0, 0.4)
+    first.close()
+    backend = CountingBackend()
+    second = PersistentCachedBackend(backend, path)
+    assert second.flash("PQ", 2.0e5, 0.0, 0.4) == expected
+    assert (second.hits, second.misses, backend.calls) == (1, 0, 0)
+
+
+def test_flash_many_one_query_and_one_insert(tmp_path):
+    backend = CountingBackend()
+    cache = PersistentCachedBackend(backend, str(tmp_path / "cache.sqlite"))
+    exact = NumpyAmmoniaWaterBackend().flash_many("PQ", P, 0.0, X)
+    result = cache.flash_many("PQ", P, 0.0, X)
+    for name in ("T", "P", "h", "s", "Q"):
+        np.testing.assert_array_equal(getattr(result, name), getattr(exact, name))
+    # 3 unique states, solved with one call and written at once
+    assert (cache.hits, cache.misses, backend.calls, cache.cache.count()) == (0, 3, 1, 3)
+    cache.flash_many("PQ", P[::-1].reshape(2, 2), 0.0, X[::-1].reshape(2, 2))
+    assert (cache.hits, cache.misses, backend.calls) == (3, 3, 1)
+    assert cache.flash("PQ", 4.0e5, 0.0, 0.45).T == exact.T[3]
+
+
+def test_other_backend_version_is_not_used(tmp_path, monkeypatch):
+    path = str(tmp_path / "cache.sqlite")
+    first = PersistentCachedBackend(CountingBackend(), path)
+    first.flash_many("PQ", P, 0.0, X)
+    monkeypatch.setattr(CountingBackend, "version", "changed")
+    second = PersistentCachedBackend(CountingBackend(), path)
+    second.flash_many("PQ", P, 0.0, X)
+    assert (second.hits, second.misses) == (0, 3)
+    assert DiskCache(path).purge(second.signature) == 3
+    assert DiskCache(path).count() == 3
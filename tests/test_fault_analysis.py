@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from modules.cycle_solver import CycleInputs, solve_cycle
+from modules.fault_analysis import DEFAULT_FAULTS, HEALTHY, INPUT_NAMES, analyze_faults, build_scenarios
+
+
+BASES = [CycleInputs(), CycleInputs(Temp_3=380.0, Q_eva=6000.0)]
+
+
+def test_scenario_matrix_shape_and_labels():
+    scenarios, fault_names = build_scenarios(BASES, levels=4)
+    assert fault_names == [HEALTHY] + list(DEFAULT_FAULTS)
+    n = len(BASES) * (1 + 4 * len(DEFAULT_FAULTS))
+    assert all(len(column) == n for column in scenarios.values())
+    labels = np.array(fault_names)[scenarios["fault"]]
+    assert (labels == HEALTHY).sum() == len(BASES) and (labels == "condenser_fouling").sum() == 4 * len(BASES)
+    # Offsets from the low to the high value of the fault, only on its input
+    fouling = labels == "condenser_fouling"
+    offsets = scenarios["Temp_4"][fouling] - np.array([BASES[b].Temp_4 for b in scenarios["base"][fouling]])
+    np.testing.assert_allclose(offsets, np.tile([1.0, 1.0 + 7 / 3, 1.0 + 14 / 3, 8.0], len(BASES)))
+    np.testing.assert_array_equal(scenarios["Temp_6"][fouling], [BASES[b].Temp_6 for b in scenarios["base"][fouling]])
+    with pytest.raises(ValueError):
+        build_scenarios(BASES, {"leak": {"Temp_9": (0.0, 1.0)}})
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_residuals_against_solve_cycle(processes, numpy_backend):
+    result = analyze_faults(BASES, levels=3, backend="numpy", processes=processes)
+    assert result.solves < len(result.scenarios["base"]) + len(BASES)
+    healthy = result.scenarios["fault"] == 0
+    np.testing.assert_array_equal(result.residuals[healthy], 0.0)
+    k = int(np.flatnonzero(result.scenarios["fault"] == result.fault_names.index("Temp_6_sensor_drift"))[-1])
+    inputs = CycleInputs(**{name: float(result.scenarios[name][k]) for name in INPUT_NAMES})
+    faulty, expected = solve_cycle(inputs, backend=numpy_backend), solve_cycle(BASES[result.scenarios["base"][k]], backend=numpy_backend)
+    assert result.residuals[k, 0] == pytest.approx(faulty.Q_gen - expected.Q_gen, rel=1e-5)
+    assert result.residuals[k, 3] == pytest.approx(faulty.points[1].T - expected.points[1].T, rel=1e-5, abs=1e-8)
+    features, labels = result.training_data()
+    assert features.shape == (int(result.feasible.sum()), 4) and set(labels) <= set(result.fault_names)
@@ -0,0 +1,43 @@
+from dataclasses import replace
+
+import pytest
+
+from modules.cycle_solver import CycleInputs, solve_cycle
+from modules.incremental import IncrementalSolver
+from modules.x_7_solver import InfeasibleCycleError
+
+
+def assert_same_cycle(result, expected):
+    for i, point in expected.points.items():
+        assert result.points[i].T == pytest.approx(point.T, rel=1e-9)
+        assert result.points[i].h == pytest.approx(point.h, rel=1e-7, abs=1e-6)
+        assert result.points[i].m_ponto == pytest.approx(point.m_ponto, rel=1e-7)
+        assert result.points[i].phase == point.phase
+    assert (result.Q_gen, result.Q_con, result.Q_abs) == pytest.approx((expected.Q_gen, expected.Q_con, expected.Q_abs), rel=1e-7)
+
+
+def test_changes_match_solve_cycle(numpy_backend):
+    solver = IncrementalSolver(numpy_backend)
+    inputs = CycleInputs()
+    for change in ({}, {"Q_eva": 6000.0}, {"Temp_3": 380.0}, {"Temp_6": 258.15}, {"x_1": 0.45}, {"Temp_4": 308.15}):
+        inputs = replace(inputs, **change)
+        assert_same_cycle(solver.solve(inputs), solve_cycle(inputs, backend=numpy_backend))
+
+
+def test_only_the_dependent_nodes_are_solved(numpy_backend):
+    solver = IncrementalSolver(numpy_backend)
+    solver.solve(CycleInputs())
+    result = solver.solve(CycleInputs(Q_eva=6000.0))
+    assert solver.last_solved == ["balances"] and sum(result.flash_counts.values()) == 0
+    solver.solve(CycleInputs(Q_eva=6000.0, Temp_3=380.0))
+    assert {"point_4", "point_6", "point_1", "point_2", "point_5"}.isdisjoint(solver.last_solved)
+    assert {"point_3", "x_7_solution", "point_7", "point_8", "balances"} <= set(solver.last_solved)
+
+
+def test_failed_solve_keeps_the_last_solution(numpy_backend):
+    solver = IncrementalSolver(numpy_backend)
+    expected = solver.solve(CycleInputs())
+    with pytest.raises(InfeasibleCycleError):
+        solver.solve(CycleInputs(Temp_3=320.0))
+    assert_same_cycle(solver.solve(CycleInputs()), expected)
+    assert solver.last_solved == []
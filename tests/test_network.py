@@ -0,0 +1,31 @@
+import pytest
+
+from modules.cycle_solver import CycleInputs, solve_cycle
+from modules.network import solve_network_cycle
+
+# The Newton solver needs scipy.sparse
+pytest.importorskip("scipy")
+
+
+@pytest.mark.parametrize("inputs", [CycleInputs(), CycleInputs(Temp_3=385.0, x_1=0.45, Temp_6=258.15)])
+def test_network_matches_solve_cycle(inputs, numpy_backend):
+    solution = solve_network_cycle(inputs, numpy_backend)
+    assert solution.converged
+    result, expected = solution.to_cycle_result(inputs), solve_cycle(inputs, backend=numpy_backend)
+    for i, point in expected.points.items():
+        assert result.points[i].P == pytest.approx(point.P, rel=1e-6)
+        assert result.points[i].T == pytest.approx(point.T, abs=1e-4)
+        assert result.points[i].x == pytest.approx(point.x, abs=1e-7)
+        assert result.points[i].h == pytest.approx(point.h, rel=1e-5, abs=1.0)
+        assert result.points[i].m_ponto == pytest.approx(point.m_ponto, rel=1e-5)
+    assert (result.Q_gen, result.Q_con, result.Q_abs) == pytest.approx((expected.Q_gen, expected.Q_con, expected.Q_abs), rel=1e-5)
+
+
+def test_pipe_losses_change_the_cycle(numpy_backend):
+    inputs = CycleInputs()
+    plain = solve_network_cycle(inputs, numpy_backend)
+    piped = solve_network_cycle(inputs, numpy_backend, pipes={4: {"dP": 2000.0, "Q_loss": 20.0}})
+    assert piped.converged
+    assert piped.streams["4p"].P == pytest.approx(piped.streams["4"].P - 2000.0)
+    assert piped.streams["4p"].h * piped.streams["4p"].m_ponto == pytest.approx(piped.streams["4"].h * piped.streams["4"].m_ponto - 20.0)
+    assert piped.duties["generator"] != pytest.approx(plain.duties["generator"], rel=1e-9)
@@ -0,0 +1,23 @@
+import pytest
+
+import modules.sweep as sweep
+from modules.optimizer import optimize_cop
+
+
+BOUNDS = {"Temp_3": (360.0, 400.0), "x_1": (0.38, 0.48)}
+
+
+def test_parallel_optimization_keeps_one_cached_pool(monkeypatch):
+    pools = []
+
+    class RecordedPool(sweep.SweepPool):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            pools.append(self)
+
+    monkeypatch.setattr(sweep, "SweepPool", RecordedPool)
+    serial = optimize_cop(bounds=BOUNDS, backend="numpy", tol=1e-2)
+    parallel = optimize_cop(bounds=BOUNDS, backend="numpy", tol=1e-2, processes=2, cache_size=5000)
+    assert parallel.iterations > 1 and len(pools) == 1 and pools[0].cache_size == 5000
+    assert parallel.inputs == serial.inputs and parallel.COP == pytest.approx(serial.COP)
+    assert parallel.solves == serial.solves
@@ -0,0 +1,52 @@
+import numpy as np
+
+from modules.ammonia_water_numpy import NumpyAmmoniaWaterBackend
+from modules.cycle_solver import CycleInputs, solve_cycle
+from modules.property_cache import CachedBackend
+
+
+class CountingBackend(NumpyAmmoniaWaterBackend):
+    calls = 0
+
+    def flash(self, pair, value_1, value_2, x):
+        self.calls += 1
+        return super().flash(pair, value_1, value_2, x)
+
+
+def test_lru_eviction():
+    backend = CountingBackend()
+    cache = CachedBackend(backend, maxsize=2)
+    for P in (2.0e5, 3.0e5, 2.0e5, 4.0e5): # 3e5 is the least recently used one when 4e5 comes
+        cache.flash("PQ", P, 0.0, 0.4)
+    assert tuple(cache.cache_info()) == (1, 3, 1, 2, 2)
+    cache.flash("PQ", 2.0e5, 0.0, 0.4)
+    cache.flash("PQ", 3.0e5, 0.0, 0.4)
+    assert (cache.hits, cache.misses, backend.calls) == (2, 4, 4)
+
+
+def test_quantized_keys():
+    backend = CountingBackend()
+    cache = CachedBackend(backend, digits=6)
+    first = cache.flash("PQ", 2.0e5, 0.0, 0.4)
+    assert cache.flash("PQ", 2.0e5 * (1 + 1e-9), 0.0, 0.4) is first
+    assert backend.calls == 1
+
+
+def test_clear_and_results_of_the_backend():
+    backend = CountingBackend()
+    cache = CachedBackend(backend)
+    exact = NumpyAmmoniaWaterBackend().flash_many("PQ", np.array([2.0e5, 3.0e5]), 0.0, 0.4)
+    result = cache.flash_many("PQ", np.array([2.0e5, 3.0e5, 2.0e5]), 0.0, 0.4)
+    np.testing.assert_array_equal(result.T, np.append(exact.T, exact.T[0]))
+    cache.cache_clear()
+    assert cache.cache_info().currsize == 0
+    cache.flash("PQ", 2.0e5, 0.0, 0.4)
+    assert (cache.hits, cache.misses) == (0, 1)
+
+
+def test_repeated_solve_is_served_from_memory():
+    cache = CachedBackend(CountingBackend())
+    first = solve_cycle(CycleInputs(), backend=cache)
+    calls = cache.backend.calls
+    second = solve_cycle(CycleInputs(), backend=cache)
+    assert cache.backend.calls == calls and second.Q_gen == first.Q_gen
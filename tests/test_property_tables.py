@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from modules.property_backend import PropertyError
+from modules.property_tables import (DEFAULT_MAX_ERRORS, Q_SUBCOOLED, Q_SUPERHEATED, TableBackend, build_tables,
+                                     load_tables)
+
+
+def test_default_tables_within_error_bound(table_file):
+    tables = load_tables(table_file)
+    assert tables["max_errors"] == DEFAULT_MAX_ERRORS
+    assert set(tables["errors"]) == {"TQ", "PQ", "PT", "PH", "PS"}
+    assert tables["violations"] == []
+
+
+def test_x_axis_from_pure_water_to_pure_ammonia(table_file, numpy_backend):
+    table = TableBackend(table_file)
+    assert table.x_range == (0.0, 1.0)
+    for x in (0.0, 1.0):
+        exact, result = numpy_backend.flash("PQ", 5.0e5, 0.0, x), table.flash("PQ", 5.0e5, 0.0, x)
+        assert result.T == pytest.approx(exact.T, abs=0.1)
+
+
+@pytest.mark.parametrize("x", [1.0e-4, 0.3, 0.7, 0.9999])
+def test_pt_phase_next_to_saturation(table_file, numpy_backend, x):
+    # One kelvin below the bubble point, above the dew point and between them
+    table = TableBackend(table_file)
+    for P in (1.0e5, 4.0e5, 1.5e6):
+        bubble, dew = numpy_backend.flash("PQ", P, 0.0, x).T, numpy_backend.flash("PQ", P, 1.0, x).T
+        assert table.flash("PT", P, bubble - 1.0, x).Q == Q_SUBCOOLED
+        assert table.flash("PT", P, dew + 1.0, x).Q == Q_SUPERHEATED
+        if dew - bubble > 2.0:
+            assert 0 < table.flash("PT", P, (bubble + dew) / 2, x).Q < 1
+
+
+@pytest.mark.parametrize("x", [0.999, 0.9999, 0.99999])
+def test_dew_curve_of_nearly_pure_ammonia(table_file, numpy_backend, x):
+    # The dew point changes sharply within 1e-3 of x = 1
+    table = TableBackend(table_file)
+    for Q in (0.9, 0.99, 1.0):
+        exact, result = numpy_backend.flash("PQ", 2.0e5, Q, x), table.flash("PQ", 2.0e5, Q, x)
+        assert result.T == pytest.approx(exact.T, abs=1.0)
+        assert result.h == pytest.approx(exact.h, abs=5.0e3)
+
+
+def test_tables_above_error_bound_are_rejected():
+    axes = {"P": ("P", 1.0e5, 1.0e6, 5, "log"), "zeta": ("zeta", 0.0, 1.0, 5, "cos"), "x": ("x", 0.0, 1.0, 5, "cos")}
+    tables = build_tables("numpy", pairs=("PQ",), axes=axes, n_check=200, max_errors={"T": 1.0e-6})
+    assert tables["violations"] and tables["violations"][0].startswith("PQ T max")
+    with pytest.raises(PropertyError):
+        TableBackend(tables)
+    result = TableBackend(tables, strict=False).flash_many("PQ", np.array([3.0e5]), np.array([0.5]), np.array([0.5]))
+    assert np.isfinite(result.T).all()
+
+
+def test_name_is_the_backend_spec(table_file):
+    from modules.property_backend import get_backend
+
+    table = get_backend("table:" + table_file)
+    assert table.name == "table:" + table_file and table.source == "numpy"
+    assert get_backend(table.name) is table
@@ -0,0 +1,71 @@
+import os
+
+import numpy as np
+import pytest
+
+from modules.refprop_export import compare_states, iter_refprop_chunks, load_refprop, write_states
+
+
+NOTES = os.path.join(os.path.dirname(__file__), "..", "notes")
+
+HEADER = ("Mass Frac.\tMass Frac.\tTemperature\tPressure\tDensity\tEnthalpy\tEntropy\tQuality\r\n"
+          "(ammonia)\t(water)\t(K)\t(Pa)\t(kg/m^3)\t(J/kg)\t(J/kg-K)\t(kg/kg)\r\n" + "\t" * 7 + "\r\n")
+ROWS = ("0,42000\t0,58000\t307,69\t290710,\t843,12\t52230,\t929,98\t0,00000\r\n"
+        "0,42000\t0,58000\t307,80\t1555400,\t843,51\t53728,\t929,98\tSubcooled\r\n"
+        "1,0000\t0,00000\t373,15\t1555400,\t9,2026\t1808500,\t6141,0\tSuperheated\r\n")
+
+
+@pytest.fixture
+def export(tmp_path):
+    # Three blocks of three rows
+    path = tmp_path / "export.csv"
+    path.write_bytes("".join(str(k + 1) + ": ammonia/water: Specified state points\r\n\r\n" + HEADER + ROWS + "\r\n\r\n"
+                             for k in range(3)).encode("latin-1"))
+    return str(path)
+
+
+def test_blocks_words_and_decimal_commas(export):
+    titles = []
+    data = np.concatenate(list(iter_refprop_chunks(export, blocks=titles)))
+    assert len(titles) == 3 and titles[2].startswith("3:")
+    assert list(data["block"]) == [0, 0, 0, 1, 1, 1, 2, 2, 2]
+    assert list(data["row"]) == [0, 1, 2] * 3
+    assert {"x", "x_water", "T", "P", "D", "h", "s", "Q"} <= set(data.dtype.names)
+    np.testing.assert_array_equal(data["Q"][:3], [0.0, -998.0, 998.0])
+    assert (data["T"][1], data["P"][1], data["D"][2]) == (307.80, 1555400.0, 9.2026)
+
+
+@pytest.mark.parametrize("chunksize", [1, 2, 4])
+def test_chunk_boundary_inside_a_block(export, chunksize):
+    chunks = list(iter_refprop_chunks(export, chunksize))
+    assert all(len(chunk) <= chunksize for chunk in chunks)
+    data = np.concatenate(chunks)
+    whole = load_refprop(export).data
+    for name in whole.dtype.names:
+        np.testing.assert_array_equal(data[name], whole[name])
+    assert list(data["row"]) == [0, 1, 2] * 3
+
+
+def test_headerless_export():
+    skipped = []
+    data = np.concatenate(list(iter_refprop_chunks(os.path.join(NOTES, "Most_Simple_model_-_Lines_1_2 v_withoutHeader.csv"), skipped=skipped)))
+    assert data.dtype.names == ("block", "row", "x", "x_water", "T", "P", "D", "h", "s", "Q")
+    np.testing.assert_array_equal(data["T"], [307.69, 307.8])
+    np.testing.assert_array_equal(data["Q"], [0.0, -998.0])
+    assert skipped == ["1", "2", "3", "4"]
+
+
+def test_self_generated_reference_passes(tmp_path):
+    from modules.batch_solver import solve_cycle_batch
+
+    batch = solve_cycle_batch({"Temp_3": np.array([373.15, 380.0, 390.0]), "x_1": np.array([0.42, 0.43, 0.45])}, backend="numpy")
+    path = str(tmp_path / "reference.csv")
+    write_states(path, batch, range(1, 9))
+    reference = load_refprop(path)
+    assert len(reference.titles) == 3 and len(reference.data) == 24
+    report = compare_states(reference.data, batch, range(1, 9))
+    assert report.passed and report.rows == 24 and report.phase_failures == 0
+    # Another Temp_3 of the first operating point: lines 3, 7 and 8 fail
+    other = solve_cycle_batch({"Temp_3": np.array([375.0, 380.0, 390.0]), "x_1": np.array([0.42, 0.43, 0.45])}, backend="numpy")
+    report = compare_states(reference.data, other, range(1, 9))
+    assert [(block, row) for block, row, _ in report.first_failures] == [(0, 2), (0, 6), (0, 7)]
@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+from modules.batch_solver import inputs_from_list, solve_cycle_batch
+from modules.cycle_solver import CycleInputs, solve_cycle
+from modules.result_store import (CYCLE_DTYPE, STATE_FIELDS, records_from_batch, records_from_results,
+                                  result_from_record)
+
+
+POINTS = [CycleInputs(Temp_3=373.15), CycleInputs(Temp_3=320.0), CycleInputs(Temp_3=385.0)] # the second is infeasible
+
+
+@pytest.fixture(scope="module")
+def results(numpy_backend):
+    return [solve_cycle(POINTS[0], backend=numpy_backend), None, solve_cycle(POINTS[2], backend=numpy_backend)]
+
+
+def test_results_and_batch_give_the_same_records(results, numpy_backend):
+    records = records_from_results(results, POINTS)
+    batch = records_from_batch(solve_cycle_batch(inputs_from_list(POINTS), backend=numpy_backend))
+    assert records.dtype == batch.dtype == CYCLE_DTYPE
+    assert list(records["feasible"]) == list(batch["feasible"]) == [True, False, True]
+    assert list(records["Temp_3"]) == [373.15, 320.0, 385.0]
+    feasible = records["feasible"]
+    for name in STATE_FIELDS:
+        np.testing.assert_allclose(records["points"][name][feasible], batch["points"][name][feasible], rtol=1e-5, atol=1.0e-6)
+    np.testing.assert_array_equal(records["points"]["phase"][feasible], batch["points"]["phase"][feasible])
+    # The failed point keeps NaN states and the unknown phase
+    assert np.isnan(records["points"]["h"][1]).all() and (records["points"]["phase"][1] == -1).all()
+
+
+def test_record_back_to_a_result(results):
+    records = records_from_results(results, POINTS)
+    result = result_from_record(records[0])
+    assert result.inputs == POINTS[0]
+    for i, point in results[0].points.items():
+        assert (result.points[i].h, result.points[i].phase) == (point.h, point.phase)
+    assert result.Q_gen == results[0].Q_gen
@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+
+from modules.result_writer import ResultWriter, read_results
+
+
+@pytest.fixture(scope="module")
+def records():
+    from modules.batch_solver import solve_cycle_batch
+
+    # Two feasible points and one without x_7 (NaN states)
+    return solve_cycle_batch({"Temp_3": np.array([373.15, 380.0, 320.0])}, backend="numpy").to_records()
+
+
+def test_refprop_layout_of_the_notes(tmp_path, records):
+    path = str(tmp_path / "results.txt")
+    with ResultWriter(path, "refprop", chunksize=2) as writer:
+        writer.write(records)
+    with open(path, "rb") as file:
+        lines = file.read().decode().split("\r\n")
+    assert lines[1] == ""
+    names, units, empty = lines[2].split("\t"), lines[3].split("\t"), lines[4]
+    assert names[0] == "input_Temp_3" and units[0] == "(K)"
+    assert units[names.index("x_1")] == "(ammonia)" and units[names.index("s_1")] == "(J/kg-K)"
+    assert empty == "\t" * (len(names) - 1)
+    rows = [line.split("\t") for line in lines[5:] if line]
+    assert len(rows) == len(records)
+    assert rows[0][names.index("input_Temp_3")] == "373,15"
+    assert "." not in "".join(lines[5:])
+    assert {"Subcooled", "Superheated"} & {value for row in rows for value in row}
+
+
+def test_refprop_reads_back_as_csv(tmp_path, records):
+    for format in ("csv", "refprop"):
+        with ResultWriter(str(tmp_path / format), format) as writer:
+            writer.write(records)
+    csv, refprop = read_results(str(tmp_path / "csv"), "csv"), read_results(str(tmp_path / "refprop"), "refprop")
+    assert list(csv) == list(refprop)
+    for name in csv:
+        np.testing.assert_array_equal(np.asarray(csv[name], float), refprop[name])
+
+
+def test_refprop_resume_drops_incomplete_rows(tmp_path, records):
+    path = str(tmp_path / "results.txt")
+    with ResultWriter(path, "refprop", chunksize=2) as writer:
+        writer.write(records[:2])
+    with open(path, "a") as file:
+        file.write("partial row")
+    with ResultWriter(path, "refprop", chunksize=2, resume=True) as writer:
+        assert writer.rows == 2
+        writer.write(records[2:])
+    assert len(read_results(path, "refprop")["input_Temp_3"]) == 3
+
+
+DEFINITION = {"Temp_3": {"start": 365.0, "stop": 385.0, "num": 5}, "Temp_6": [258.15, 263.15]}
+
+
+def test_iter_sweep_is_lazy():
+    from modules.sweep import iter_sweep, sweep_size
+
+    huge = {"Temp_3": {"start": 350.0, "stop": 400.0, "num": 10 ** 6}, "Temp_6": {"start": 253.15, "stop": 273.15, "num": 10 ** 6}}
+    assert sweep_size(huge) == 10 ** 12
+    point = next(iter_sweep(huge, start=10 ** 6 + 1))
+    assert (point.Temp_3, point.Temp_6) == (pytest.approx(350.0 + 50.0 / (10 ** 6 - 1)), pytest.approx(253.15 + 20.0 / (10 ** 6 - 1)))
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_write_sweep_resumes_after_a_failure(tmp_path, processes):
+    from modules.result_writer import write_sweep
+    from modules.sweep import expand_sweep
+
+    points = expand_sweep(DEFINITION)
+    full = str(tmp_path / "full.csv")
+    write_sweep(DEFINITION, full, "numpy", chunksize=4, batch=True, processes=processes)
+
+    def failing():
+        yield from points[:6]
+        raise RuntimeError("stopped")
+
+    path = str(tmp_path / "resumed.csv")
+    with pytest.raises(RuntimeError):
+        write_sweep(failing(), path, "numpy", chunksize=4, batch=True, processes=processes)
+    assert len(read_results(path)["input_Temp_3"]) == 4
+    writer = write_sweep(DEFINITION, path, "numpy", chunksize=4, resume=True, batch=True, processes=processes)
+    assert writer.rows == len(points)
+    expected, resumed = read_results(full), read_results(path)
+    for name in expected:
+        np.testing.assert_array_equal(expected[name], resumed[name])
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from modules.cycle_solver import CycleInputs, solve_cycle
+from modules.saturation_envelope import EnvelopeBackend
+from modules.x_7_solver import solve_x_7
+
+# The envelopes are scipy splines
+pytest.importorskip("scipy")
+
+
+@pytest.fixture(scope="module")
+def envelope_backend(numpy_backend):
+    return EnvelopeBackend.for_cycle(CycleInputs(), numpy_backend)
+
+
+@pytest.mark.parametrize("Temp_3", [368.15, 373.15, 385.0, 400.0])
+def test_saturation_composition_matches_solve_x_7(envelope_backend, numpy_backend, Temp_3):
+    P_7 = numpy_backend.flash("TQ", CycleInputs().Temp_4, 0.0, 1.0).P
+    x_7 = envelope_backend.saturation_composition(P_7, 0.0, Temp_3)
+    exact = solve_x_7(numpy_backend, P_7, Temp_3, 0.0, 0.43)
+    assert exact.iterations > 0 and x_7 == pytest.approx(exact.x_7, abs=1e-6)
+    # Direct lookup: one flash and no iterations
+    direct = solve_x_7(envelope_backend, P_7, Temp_3, 0.0, 0.43)
+    assert (direct.iterations, direct.flashes) == (0, 1) and direct.x_7 == x_7
+
+
+def test_lookups_and_fallback(envelope_backend, numpy_backend):
+    P_6 = envelope_backend.envelope.pressures[1]
+    x = np.array([0.05, 0.3337, 0.71, 0.999])
+    for pair, value_1, value_2, x_ in (("PQ", P_6, 0.0, x), ("PQ", P_6, 1.0, x), ("TQ", np.array([250.0, 300.5]), 0.3, 1.0)):
+        result, exact = envelope_backend.flash_many(pair, value_1, value_2, x_), numpy_backend.flash_many(pair, value_1, value_2, x_)
+        np.testing.assert_allclose(result.T, exact.T, atol=0.02) # spline error, largest on the dew curve near x = 1
+        np.testing.assert_allclose(result.h, exact.h, rtol=1e-4, atol=50.0)
+    # Outside the envelope (another pressure): the wrapped backend
+    assert envelope_backend.flash("PQ", 5.0e5, 0.0, 0.4) == numpy_backend.flash("PQ", 5.0e5, 0.0, 0.4)
+
+
+def test_cycle_with_the_envelope(envelope_backend, numpy_backend):
+    result, exact = solve_cycle(CycleInputs(), backend=envelope_backend), solve_cycle(CycleInputs(), backend=numpy_backend)
+    assert result.x_7_solution.iterations == 0
+    assert result.x_7 == pytest.approx(exact.x_7, abs=1e-6)
+    assert result.Q_gen == pytest.approx(exact.Q_gen, rel=1e-4)
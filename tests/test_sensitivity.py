@@ -0,0 +1,38 @@
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+from modules.cycle_solver import CycleInputs, solve_cycle
+from modules.sensitivity import OUTPUT_NAMES, sensitivity
+
+
+BASE = CycleInputs()
+
+
+def outputs(inputs, backend):
+    result = solve_cycle(inputs, backend=backend)
+    return np.array([result.points[i].m_ponto for i in range(1, 9)]
+                    + [result.Q_gen, result.Q_con, result.Q_abs, inputs.Q_eva / result.Q_gen, result.x_7])
+
+
+def test_outputs_of_the_base_point(numpy_backend):
+    result = sensitivity(BASE, numpy_backend)
+    assert result.feasible[0]
+    np.testing.assert_allclose(result.outputs[0], outputs(BASE, numpy_backend), rtol=1e-6)
+
+
+@pytest.mark.parametrize("name, step", [("Temp_3", 0.05), ("Temp_6", 0.05), ("x_1", 5e-4), ("Q_eva", 10.0)])
+def test_jacobian_against_finite_differences(numpy_backend, name, step):
+    result = sensitivity(BASE, numpy_backend)
+    value = getattr(BASE, name)
+    expected = (outputs(replace(BASE, **{name: value + step}), numpy_backend)
+                - outputs(replace(BASE, **{name: value - step}), numpy_backend)) / (2 * step)
+    for k, output in enumerate(OUTPUT_NAMES):
+        assert result.derivative(output, name) == pytest.approx(expected[k], rel=2e-3, abs=1e-9 * max(abs(expected).max(), 1.0))
+
+
+def test_inputs_without_effect(numpy_backend):
+    result = sensitivity([BASE, CycleInputs(Temp_3=380.0)], numpy_backend)
+    assert result.jacobian.shape == (2, len(OUTPUT_NAMES), len(result.input_names))
+    assert np.all(result.jacobian[:, :, result.input_names.index("eff_p")] == 0.0)
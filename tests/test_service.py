@@ -0,0 +1,76 @@
+import asyncio
+import json
+
+import pytest
+
+import modules.service as service_module
+from modules.service import SolveService, handle_connection
+
+
+async def _exchange(requests):
+    # Sends the raw requests on one connection; returns [(status, body)] of the responses until the server closes it
+    service = SolveService("numpy")
+    service.start()
+    server = await asyncio.start_server(lambda reader, writer: handle_connection(service, reader, writer), "127.0.0.1", 0)
+    try:
+        reader, writer = await asyncio.open_connection(*server.sockets[0].getsockname()[:2])
+        for request in requests:
+            writer.write(request)
+        await writer.drain()
+        writer.write_eof()
+        responses = []
+        while True:
+            status_line = await reader.readline()
+            if not status_line:
+                break
+            headers = {}
+            while True:
+                line = (await reader.readline()).decode().strip()
+                if not line:
+                    break
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+            body = await reader.readexactly(int(headers["content-length"]))
+            responses.append((int(status_line.split()[1]), json.loads(body)))
+        writer.close()
+        return responses
+    finally:
+        server.close()
+        await server.wait_closed()
+        service.close()
+
+
+def _post(data):
+    body = json.dumps(data).encode() if not isinstance(data, bytes) else data
+    return b"POST /solve HTTP/1.1\r\nContent-Length: " + str(len(body)).encode() + b"\r\n\r\n" + body
+
+
+def test_feasible_and_infeasible_points():
+    [(status, results)] = asyncio.run(_exchange([_post([{"Temp_3": 373.15}, {"Temp_3": 320.0}])]))
+    assert status == 200
+    feasible, infeasible = results
+    assert feasible["feasible"] and feasible["Q_gen"] > 0 and feasible["points"]["7"]["x"] > 0
+    assert infeasible["feasible"] is False
+    assert infeasible["Q_gen"] is None and infeasible["COP"] is None and infeasible["x_7"] is None
+    assert all(value is None for point in infeasible["points"].values() for value in point.values())
+
+
+@pytest.mark.parametrize("request_line", [b"GARBAGE\r\n\r\n", b"POST /solve HTTP/1.1\r\nContent-Length: abc\r\n\r\n",
+                                          b"POST /solve HTTP/1.1\r\nno header separator\r\n\r\n"])
+def test_malformed_request_is_400_and_closes(request_line):
+    responses = asyncio.run(_exchange([request_line, _post({})]))
+    assert len(responses) == 1 and responses[0][0] == 400
+
+
+def test_bad_inputs_are_400():
+    responses = asyncio.run(_exchange([_post(b"{not json"), _post({"Temp_9": 1}), _post({"Temp_3": "hot"}), _post(5)]))
+    assert [status for status, _ in responses] == [400] * 4
+
+
+def test_solver_errors_are_500(monkeypatch):
+    def fail(points):
+        raise RuntimeError("backend crashed")
+
+    monkeypatch.setattr(service_module, "_solve_points", fail)
+    [(status, body)] = asyncio.run(_exchange([_post({})]))
+    assert status == 500 and "backend crashed" in body["error"]
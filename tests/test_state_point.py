@@ -0,0 +1,15 @@
+import numpy as np
+
+from modules.state_point import (PHASE_NAMES, SATURATED_LIQUID, SUBCOOLED, SUPERHEATED, TWO_PHASE, UNKNOWN,
+                                 UNKNOWN_PHASE, phase_code_array, phase_code_from_quality, phase_from_quality)
+
+
+QUALITIES = [-998.0, 0.0, 0.5, 998.0, np.nan, np.inf, -np.inf]
+CODES = [SUBCOOLED, SATURATED_LIQUID, TWO_PHASE, SUPERHEATED, UNKNOWN, UNKNOWN, UNKNOWN]
+
+
+def test_non_finite_quality_is_unknown():
+    assert [phase_code_from_quality(Q) for Q in QUALITIES] == CODES
+    assert list(phase_code_array(QUALITIES)) == CODES
+    assert phase_from_quality(np.nan) == UNKNOWN_PHASE and UNKNOWN_PHASE not in PHASE_NAMES
+
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from modules.sensitivity import OUTPUT_NAMES
+from modules.surrogate import Surrogate, generate_data, outputs_from_states, train_surrogate
+
+
+BOUNDS = {"Temp_3": (370.0, 385.0), "Temp_4": (308.15, 313.15), "Temp_6": (260.15, 265.15), "x_1": (0.42, 0.45),
+          "Q_eva": (4000.0, 6000.0)}
+
+
+def test_generate_data_in_a_kept_pool():
+    from modules.sweep import SweepPool
+
+    X, Z, feasible = generate_data(BOUNDS, 40, "numpy")
+    with SweepPool("numpy", 2) as pool:
+        for _ in range(2):
+            X_pool, Z_pool, feasible_pool = generate_data(BOUNDS, 40, "numpy", processes=2, pool=pool)
+            np.testing.assert_array_equal(X_pool, X)
+            np.testing.assert_array_equal(feasible_pool, feasible)
+            np.testing.assert_allclose(Z_pool[feasible], Z[feasible], rtol=1e-9)
+
+
+def test_unavailable_default_backend_fails_at_once(monkeypatch):
+    # The default backend (refprop) is not installed here: the parallel data generation raises instead of hanging
+    from modules.property_backend import get_backend
+
+    monkeypatch.delenv("ARS_PROPERTY_BACKEND", raising=False)
+    try:
+        get_backend(None).load()
+    except Exception as error:
+        with pytest.raises(type(error)):
+            generate_data(BOUNDS, 10, processes=2)
+    else:
+        pytest.skip("the default backend is available")
+
+
+@pytest.fixture(scope="module")
+def surrogate():
+    return train_surrogate(BOUNDS, samples=1500, backend="numpy", degree=3)
+
+
+def test_save_load_round_trip(tmp_path, surrogate):
+    path = str(tmp_path / "surrogate.npz")
+    surrogate.save(path)
+    loaded = Surrogate.load(path)
+    assert (loaded.bounds, loaded.degree, loaded.base, loaded.errors, loaded.coverage) == \
+        (surrogate.bounds, surrogate.degree, surrogate.base, surrogate.errors, surrogate.coverage)
+    X = generate_data(BOUNDS, 50, "numpy", seed=1)[0]
+    np.testing.assert_array_equal(loaded.predict_array(X), surrogate.predict_array(X))
+
+
+def test_predictions_inside_the_domain_and_exact_outside(surrogate):
+    X, Z, feasible = generate_data(BOUNDS, 200, "numpy", seed=2)
+    outside = np.array([[350.0, 310.0, 262.0, 0.43, 5000.0]]) # Temp_3 below the box (and infeasible)
+    values, exact = surrogate.evaluate(np.concatenate([X[feasible], outside]), backend="numpy")
+    assert exact[-1] and np.isnan(values["COP"][-1]) and exact[:-1].mean() < 0.5
+    expected = outputs_from_states(Z[feasible], X[feasible])
+    COP = OUTPUT_NAMES.index("COP")
+    used = ~exact[:-1]
+    assert np.abs(values["COP"][:-1][used] - expected[used, COP]).max() <= 5 * surrogate.errors["COP"]["max"]
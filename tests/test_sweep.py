@@ -0,0 +1,61 @@
+import os
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+import modules.sweep as sweep
+from modules.cycle_solver import CycleInputs
+from modules.property_backend import PropertyError
+from modules.sweep import SweepPool, expand_sweep, run_batch_sweep, run_sweep
+
+
+POINTS = [CycleInputs(Temp_3=Temp_3) for Temp_3 in (373.15, 320.0, 380.0, 375.0)] # the second one is infeasible
+
+
+def _worker_state(_):
+    return os.getpid(), id(sweep._WORKER_BACKEND)
+
+
+def test_expand_sweep_order():
+    points = expand_sweep({"Temp_3": [360.0, 380.0], "Temp_6": {"start": 258.15, "stop": 263.15, "num": 3}, "x_1": 0.4})
+    assert [(p.Temp_3, p.Temp_6, p.x_1) for p in points[:4]] == [(360.0, 258.15, 0.4), (360.0, 260.65, 0.4),
+                                                                 (360.0, 263.15, 0.4), (380.0, 258.15, 0.4)]
+    assert len(points) == 6
+    with pytest.raises(ValueError):
+        expand_sweep({"Temp_9": 1})
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_input_order_and_point_errors(processes):
+    result = run_sweep(POINTS, "numpy", processes, chunksize=1)
+    assert [r.inputs if r is not None else None for r in result.results] == [POINTS[0], None, POINTS[2], POINTS[3]]
+    assert result.errors[1] is not None and "InfeasibleCycleError" in result.errors[1]
+    assert result.n_failed == 1
+    batch = run_batch_sweep(POINTS, "numpy", processes, chunksize=2)
+    assert list(batch.feasible) == [True, False, True, True]
+    assert batch.x_7[0] == pytest.approx(result.results[0].x_7, rel=1e-6)
+
+
+@pytest.mark.parametrize("runner", [run_sweep, run_batch_sweep])
+def test_bad_backend_fails_at_once(runner):
+    with pytest.raises(PropertyError):
+        runner(POINTS, "no_such_backend", processes=2)
+
+
+def test_failed_worker_raises(monkeypatch):
+    def fail(backend, cache_size):
+        raise RuntimeError("no property library")
+
+    monkeypatch.setattr(sweep, "_init_worker", fail)
+    with pytest.raises(BrokenProcessPool):
+        run_sweep(POINTS, "numpy", processes=2)
+
+
+def test_pool_keeps_its_workers():
+    # Two workers, each with one backend, for all the sweeps run in the pool
+    with SweepPool("numpy", 2) as pool:
+        states = set(pool.map(_worker_state, range(8)))
+        run_batch_sweep(POINTS, chunksize=1, pool=pool)
+        run_sweep(POINTS, chunksize=1, pool=pool)
+        states |= set(pool.map(_worker_state, range(8)))
+    assert len(states) <= 2
@@ -0,0 +1,40 @@
+import json
+
+import pytest
+
+from modules.cycle_solver import CycleInputs, solve_cycle
+from modules.property_cache import CachedBackend
+from modules.trace import JsonLinesTrace, SolveTrace, summarize
+
+
+def test_steps_add_up_to_the_flash_counts(numpy_backend):
+    trace = SolveTrace()
+    result = solve_cycle(CycleInputs(), backend=numpy_backend, trace=trace)
+    steps = [record["step"] for record in trace.steps]
+    assert steps[:4] == [2, 3, 4, 4.1] and steps == sorted(steps)
+    assert trace.as_dict()["flashes"] == dict(result.flash_counts)
+    step_5 = next(record for record in trace.steps if record["step"] == 5)
+    assert step_5["flashes"] == {"PQ": result.x_7_solution.flashes}
+    assert trace.x_7["converged"] and trace.total_time >= sum(record["time"] for record in trace.steps) * (1 - 1e-9)
+
+
+def test_cache_use_per_step(numpy_backend):
+    backend = CachedBackend(numpy_backend)
+    solve_cycle(CycleInputs(), backend=backend)
+    trace = SolveTrace()
+    solve_cycle(CycleInputs(), backend=backend, trace=trace)
+    assert sum(record["cache_misses"] for record in trace.steps) == 0
+    assert sum(record["cache_hits"] for record in trace.steps) == sum(trace.as_dict()["flashes"].values())
+
+
+def test_json_lines_and_summary(tmp_path, numpy_backend):
+    path = str(tmp_path / "trace.jsonl")
+    with JsonLinesTrace(path) as sink:
+        for Temp_3 in (373.15, 380.0):
+            solve_cycle(CycleInputs(Temp_3=Temp_3), backend=numpy_backend, trace=sink.new())
+    with open(path) as file:
+        traces = [json.loads(line) for line in file]
+    assert len(traces) == 2
+    summary = summarize(traces)
+    assert summary[2]["calls"] == 2 and summary[2]["flashes"] == {"TQ": 4}
+    assert sum(step["time"] for step in summary.values()) == pytest.approx(sum(sum(r["time"] for r in t["steps"]) for t in traces))
@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+
+import modules.sweep as sweep
+from modules.uncertainty import RunningStats, propagate
+
+
+def test_running_stats_match_numpy():
+    rng = np.random.default_rng(0)
+    values = rng.normal(3.0, 2.0, 5000)
+    stats = RunningStats()
+    for chunk in np.array_split(values, 7):
+        stats.update(chunk)
+    assert stats.count == len(values)
+    assert stats.mean == pytest.approx(values.mean())
+    assert (stats.min, stats.max) == (values.min(), values.max())
+
+
+def test_parallel_propagation_keeps_one_cached_pool(monkeypatch):
+    pools = []
+
+    class RecordedPool(sweep.SweepPool):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            pools.append(self)
+
+    monkeypatch.setattr(sweep, "SweepPool", RecordedPool)
+    serial = propagate(samples=300, backend="numpy", chunksize=100)
+    parallel = propagate(samples=300, backend="numpy", chunksize=100, processes=2, cache_size=5000)
+    assert len(pools) == 1 and pools[0].cache_size == 5000
+    assert (parallel.samples, parallel.infeasible) == (serial.samples, serial.infeasible) == (300, 0)
+    for name, stats in serial.stats.items():
+        assert parallel.stats[name].count == stats.count
+        assert parallel.stats[name].mean == pytest.approx(stats.mean, rel=1e-9)
@@ -0,0 +1,56 @@
+import pytest
+
+from modules.cycle_solver import CycleInputs, solve_cycle
+from modules.property_backend import BACKEND_FACTORIES, PropertyError
+from modules.x_7_solver import InfeasibleCycleError, solve_x_7
+
+
+@pytest.fixture(params=list(BACKEND_FACTORIES) + ["table"])
+def backend_name(request, table_file):
+    if request.param == "refprop":
+        pytest.importorskip("ctREFPROP")
+    return "table:" + table_file if request.param == "table" else request.param
+
+
+def test_default_point_on_every_backend(backend_name):
+    result = solve_cycle(CycleInputs(), backend=backend_name)
+    assert 0 < result.x_7 < CycleInputs().x_1
+
+
+def test_bracket_inside_x_range_of_backend(table_file):
+    from modules.property_backend import get_backend
+
+    backend = get_backend("table:" + table_file)
+    x_min, x_max = backend.x_range
+    tried = []
+
+    class Recorder:
+        x_range = backend.x_range
+
+        def flash(self, pair, value_1, value_2, x):
+            tried.append(x)
+            return backend.flash(pair, value_1, value_2, x)
+
+    line_6 = backend.flash("TQ", CycleInputs().Temp_4, 0, 1.0)
+    solve_x_7(Recorder(), line_6.P, CycleInputs().Temp_3, x_1=CycleInputs().x_1)
+    assert min(tried) >= x_min and max(tried) <= x_max
+
+
+def test_failed_bracket_flash_is_infeasible(numpy_backend):
+    class NoWater:
+        # Backend that cannot flash compositions below 0.1 but does not say so in x_range
+        def flash(self, pair, value_1, value_2, x):
+            if x < 0.1:
+                raise PropertyError("x = " + str(x) + " out of range")
+            return numpy_backend.flash(pair, value_1, value_2, x)
+
+    P_7 = numpy_backend.flash("TQ", CycleInputs().Temp_4, 0, 1.0).P
+    with pytest.raises(InfeasibleCycleError):
+        solve_x_7(NoWater(), P_7, CycleInputs().Temp_3, x_1=CycleInputs().x_1)
+
+
+def test_warm_skips_infeasible_points(tmp_path):
+    from modules.disk_cache import warm
+
+    solved, failed = warm({"Temp_3": [320.0, 373.15]}, str(tmp_path / "cache.sqlite"), "numpy")
+    assert (solved, failed) == (1, 1)